@@ -6,9 +6,13 @@ Replaces MySQL with local pandas CSV storage. Single-file app.
 Features (same as requested):
 - Main window with background image and a large styled button (exact UI specs preserved).
 - Category chooser and category menu pages for VEGETARIAN, EGG-ETARIAN, NONVEGETARIAN.
-- Recipes persisted in local CSV files: recipes.csv, recipe_images.csv, step_images.csv.
+- Recipes persisted in local CSV files: recipes.csv, recipe_images.csv, step_images.csv,
+  or in a SQLite database (set STORAGE_BACKEND = "sqlite"; migrate existing CSVs once with
+  `python code.py --migrate-sqlite`).
 - Each recipe can have multiple recipe-images, per-step images, and an optional video file. Media files are copied into `media/` for persistence.
 - Search bar, add recipe form, view details, delete user-added recipes (default recipes are protected).
+- Default recipes ship in default_recipes.json.gz next to this script; edit them with
+  `--export-defaults recipes.json` and rebuild with `--build-defaults recipes.json`.
 
 SETUP
 1) Install dependencies:
@@ -17,18 +21,57 @@ SETUP
 2) Edit the IMAGE_PATH_* variables below to point to images on your computer. Prefer PNG for compatibility.
 
 3) Run:
-   python simple_kitchen_pandas.py
+   python code.py
 
 The script will create a `media/` folder and CSV files next to the script if they don't exist.
 """
 
+import time
+_STARTED = time.perf_counter()
+
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, simpledialog
-import pandas as pd
 import os
+import re
+import bisect
+import csv
+import gzip
+import hashlib
+import importlib
+import io
+import json
 import shutil
+import sqlite3
+import sys
+import threading
 import uuid
-from PIL import Image, ImageTk
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+
+class _LazyModule:
+    # Stands in for a heavy module and imports it on first attribute access,
+    # so the home window can appear before pandas/PIL are loaded; warm_up()
+    # loads them on a worker thread right after.
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            module = self.__dict__['_module'] = importlib.import_module(self._name)
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+
+pd = _LazyModule('pandas')
+np = _LazyModule('numpy')
+Image = _LazyModule('PIL.Image')
+ImageTk = _LazyModule('PIL.ImageTk')
 
 # ---------------------- USER CONFIG ----------------------
 IMAGE_PATH_MAIN_BG = r"path/to/your/main_background.png"
@@ -38,765 +81,2613 @@ MEDIA_FOLDER = "media"
 RECIPES_CSV = "recipes.csv"
 RECIPE_IMAGES_CSV = "recipe_images.csv"
 STEP_IMAGES_CSV = "step_images.csv"
+STORAGE_BACKEND = "csv"  # "csv" or "sqlite"
+SQLITE_DB = "simple_kitchen.db"
+DEFAULT_RECIPES_ASSET = os.path.join(os.path.dirname(os.path.abspath(__file__)), "default_recipes.json.gz")
+COLUMNAR_CACHE = True  # keep a memory-mappable Arrow/Feather copy next to each CSV (needs pyarrow)
+UPDATE_LOG_MAX_BYTES = 64 << 10  # fold a CSV's `.updates` log back into the table past this size
+SEARCH_DEBOUNCE_MS = 200
+THUMBNAIL_FOLDER = os.path.join(MEDIA_FOLDER, ".thumbs")
+THUMBNAIL_CACHE_SIZE = 64  # PhotoImages kept in memory
+THUMBNAIL_DISK_BYTES = 32 << 20  # pre-scaled PNGs kept under THUMBNAIL_FOLDER; least recently used go first
+PREVIEW_SIZE = (300, 200)
+STEP_THUMB_SIZE = (120, 80)  # step images shown inline under their step
+PANTRY_STAPLES = ("salt", "water", "oil")  # assumed on hand by the "what can I cook" matcher
+SIMILAR_TOP_K = 5  # neighbours kept per recipe for the "similar dishes" strip
+PREFETCH_RADIUS = 2  # list entries warmed up on each side of the selection
+BACKGROUND_RESIZE_MS = 120  # coalesce <Configure> storms before rescaling backgrounds
+MEDIA_GC_DELAY_SECONDS = 5  # let startup finish before the first media sweep
+ORPHAN_GRACE_SECONDS = 24 * 3600  # unreferenced media younger than this is left alone
+STARTUP_TARGET_MS = 400  # home window on screen within this; check with `python code.py --startup-time`
+MEDIA_COPY_WORKERS = 3  # files copied in parallel when saving a recipe
+PREFETCH_WORKERS = 1  # threads decoding neighbour previews, apart from the search/delete pool
+MEDIA_COPY_CHUNK = 8 << 20  # bytes per copy step; cancellation and progress are checked between steps
 # --------------------------------------------------------
 
-DEFAULT_RECIPES = [{"id":1,"name":"Pani Puri","category": "VEGETARIAN",
-    "ingredients":"4 servings:\nFOR PURI:\n1 cup semolina (sooji)\n2 tbsp all-purpose flour\nSalt to taste\nWater as needed\nOil for frying\n\nFOR PANI:\n1 cup mint leaves\n1/2 cup coriander leaves\n1 green chilli\n1-inch ginger\n1 tbsp tamarind pulp\n1 tsp cumin powder\nSalt to taste\n4 cups cold water\n\nFOR FILLING:\n2 boiled potatoes, mashed\n1/2 cup boiled chickpeas\nChaat masala, to taste",
-    "steps":"•Mix semolina, flour, salt, and water to form a stiff dough. Rest 20 minutes.\n•Roll small puris and fry till crisp and puffed.\n•Blend mint, coriander, chilli, ginger, tamarind, cumin, and salt with water to make spiced pani.\n•Mix potatoes, chickpeas, and chaat masala for filling.\n•Crack puris, fill with stuffing, and pour pani before serving.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":2,"name":"Channa Masala","category": "VEGETARIAN",
-    "ingredients":"4 servings:\n1 cup chickpeas (soaked overnight)\n2 onions, chopped\n2 tomatoes, chopped\n1 tbsp ginger-garlic paste\n1 tsp cumin\n1 tsp coriander powder\n1/2 tsp turmeric\n1 tsp garam masala\n1/2 tsp chilli powder\n2 tbsp oil\nSalt to taste\nFresh coriander for garnish",
-    "steps":"•Pressure cook soaked chickpeas until soft.\n•Heat oil in a pan, add cumin and sauté onions till golden.\n•Add ginger-garlic paste and cook for a minute.\n•Add tomatoes and all spices, cook till oil separates.\n•Add cooked chickpeas and simmer for 10 minutes.\n•Garnish with coriander and serve with rice or roti.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":3,"name":"Bisi Bele Bath","category": "VEGETARIAN",
-    "ingredients":"4 servings:\n1 cup rice\n1/2 cup toor dal\n1/2 cup mixed vegetables\n2 tbsp bisi bele bath powder\nTamarind pulp (small lemon size)\n2 tbsp ghee\nSalt to taste\nCurry leaves, mustard seeds, cashews for tempering",
-    "steps":"•Cook rice and dal separately until soft.\n•Boil vegetables with tamarind pulp and salt.\n•Add cooked rice and dal, mix well.\n•Stir in bisi bele bath powder and simmer for 5 minutes.\n•In a small pan, heat ghee and add mustard seeds, curry leaves, and cashews.\n•Pour tempering over the rice mixture and serve hot.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":4,"name":"Papdi Chaat","category": "VEGETARIAN",
-    "ingredients":"4 servings:\n12 papdis (crispy wafers)\n1/2 cup boiled potatoes, cubed\n1/2 cup boiled chickpeas\n1/2 cup yogurt, whisked\n2 tbsp tamarind chutney\n2 tbsp green chutney\nChaat masala, red chilli powder, and salt to taste\nCoriander leaves for garnish",
-    "steps":"•Arrange papdis on a plate.\n•Top each with potatoes and chickpeas.\n•Drizzle yogurt, green chutney, and tamarind chutney.\n•Sprinkle chaat masala, chilli powder, and salt.\n•Garnish with coriander leaves and serve immediately.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":5,"name":"Masala Dosa","category": "VEGETARIAN",
-    "ingredients":"4 servings:\n2 cups dosa batter\n2 boiled potatoes, mashed\n1 onion, sliced\n1 green chilli, chopped\n1/2 tsp mustard seeds\n1/4 tsp turmeric\nSalt to taste\nOil for cooking",
-    "steps":"•Heat oil in a pan and add mustard seeds.\n•Add onions, green chilli, turmeric, and sauté till soft.\n•Add mashed potatoes and salt; mix well.\n•Spread dosa batter on a hot tawa.\n•Drizzle oil around edges, cook till crisp.\n•Place filling in the center, fold, and serve hot with chutney and sambar.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":6,"name":"Dal Makhni","category": "VEGETARIAN",
-    "ingredients":"4 servings:\n1 cup whole black lentils (urad dal)\n1/4 cup kidney beans (rajma)\n2 onions, chopped\n2 tomatoes, pureed\n1 tbsp ginger-garlic paste\n1 tsp cumin\n1/2 tsp garam masala\n1/2 tsp chilli powder\n2 tbsp butter\n1/4 cup cream\nSalt to taste",
-    "steps":"•Soak dal and rajma overnight, pressure cook until soft.\n•In a pan, heat butter and sauté cumin, onions, and ginger-garlic paste.\n•Add tomato puree, spices, and cook until oil separates.\n•Add cooked lentils, mash slightly, and simmer for 30 minutes.\n•Stir in cream, garnish with butter, and serve.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":7,"name":"Pav Bhaji","category": "VEGETARIAN",
-    "ingredients":"4 servings:\n2 tbsp butter\n1 onion, chopped\n1 tomato, chopped\n1/2 cup boiled peas\n2 boiled potatoes, mashed\n1/2 cup capsicum, chopped\n1 tsp pav bhaji masala\n1/2 tsp chilli powder\nSalt to taste\nPav buns\nLemon wedges and coriander for garnish",
-    "steps":"•Heat butter in a pan, sauté onion till translucent.\n•Add tomato and cook till soft.\n•Add capsicum, peas, and mashed potatoes.\n•Add pav bhaji masala, chilli powder, and salt.\n•Mash with a masher and simmer for 5 minutes.\n•Toast pav buns with butter.\n•Serve bhaji hot with buns, lemon, and coriander.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":8,"name":"Paneer Butter Masala","category": "VEGETARIAN",
-    "ingredients":"4 servings:\n200g paneer, cubed\n2 onions, chopped\n2 tomatoes, pureed\n1 tbsp ginger-garlic paste\n1/2 tsp garam masala\n1/2 tsp chilli powder\n1/4 cup cream\n1 tbsp butter\n1 tbsp oil\nSalt to taste\n1 tsp kasuri methi",
-    "steps":"•Heat butter and oil in a pan.\n•Sauté onions until golden, add ginger-garlic paste.\n•Add tomato puree and cook till oil separates.\n•Stir in chilli powder, garam masala, and salt.\n•Add paneer cubes and simmer 5 minutes.\n•Add cream and kasuri methi, mix gently.\n•Serve hot with naan or rice.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":9,"name":"Tomato Chutney","category": "VEGETARIAN",
-    "ingredients":"1 cup:\n3 ripe tomatoes, chopped\n2 dried red chillies\n1 tsp mustard seeds\n2 garlic cloves\n1 tbsp oil\nSalt to taste\nFew curry leaves",
-    "steps":"•Heat oil in a pan, add mustard seeds and curry leaves.\n•Add chillies, garlic, and tomatoes.\n•Cook until tomatoes turn mushy.\n•Cool and blend into a smooth paste.\n•Serve with idli, dosa, or vada.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":10,"name":"Veg Hakka Noodles","category": "VEGETARIAN",
-    "ingredients":"2 servings:\n150g noodles\n1 tbsp oil\n1 clove garlic, minced\n1 onion, sliced\n1/2 cup carrot, capsicum, and cabbage, julienned\n1 tbsp soy sauce\n1 tsp vinegar\n1/2 tsp pepper\nSalt to taste\nSpring onions for garnish",
-    "steps":"•Boil noodles, drain, and toss with oil.\n•Heat oil in a wok, sauté garlic and onion.\n•Add vegetables and stir-fry on high flame.\n•Add soy sauce, vinegar, salt, and pepper.\n•Add noodles and toss well.\n•Garnish with spring onions and serve.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":11,"name":"Malai Kofta","category": "VEGETARIAN",
-    "ingredients":"4 servings:\nFOR KOFTA:\n2 boiled potatoes\n1/2 cup grated paneer\n2 tbsp corn flour\nSalt to taste\nOil for frying\n\nFOR GRAVY:\n2 onions, chopped\n2 tomatoes, pureed\n1 tbsp ginger-garlic paste\n1/2 tsp garam masala\n1/4 cup cream\n1 tbsp butter\n1 tsp chilli powder\nSalt to taste",
-    "steps":"•Mix potatoes, paneer, corn flour, and salt; shape into balls and deep fry till golden.\n•Heat butter, sauté onions and ginger-garlic paste.\n•Add tomato puree, spices, and salt; cook till oil separates.\n•Add cream and mix well.\n•Add koftas just before serving and garnish with cream.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":12,"name":"Khichdi","category": "VEGETARIAN",
-    "ingredients":"4 servings:\n1/2 cup rice\n1/4 cup moong dal\n1 onion, chopped\n1 tomato, chopped\n1/2 tsp cumin\n1/4 tsp turmeric\nSalt to taste\n1 tbsp ghee\n3 cups water",
-    "steps":"•Wash rice and dal, soak for 15 minutes.\n•Heat ghee in a pressure cooker, add cumin, onions, and sauté.\n•Add tomatoes, turmeric, and salt.\n•Add rice, dal, and water.\n•Pressure cook for 3 whistles.\n•Serve with ghee and papad.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":13,"name":"Veg Fried Rice","category": "VEGETARIAN",
-    "ingredients":"2 servings:\n2 cups cooked rice\n1 tbsp oil\n1 garlic clove, minced\n1/2 cup chopped vegetables (carrot, beans, peas, capsicum)\n1 tbsp soy sauce\n1/2 tsp pepper\nSalt to taste\nSpring onions for garnish",
-    "steps":"•Heat oil in a wok and sauté garlic.\n•Add vegetables and stir-fry 2–3 minutes.\n•Add soy sauce, salt, and pepper.\n•Add cooked rice and toss on high flame.\n•Garnish with spring onions and serve.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":14,"name":"Aloo Chaat","category": "VEGETARIAN",
-    "ingredients":"2 servings:\n2 boiled potatoes, cubed\n1 tbsp oil\n1/2 tsp chaat masala\n1/4 tsp chilli powder\nSalt to taste\n1 tbsp lemon juice\nChopped coriander for garnish",
-    "steps":"•Heat oil in a pan and shallow-fry potatoes until crisp.\n•Add chaat masala, chilli powder, and salt.\n•Mix well and drizzle with lemon juice.\n•Garnish with coriander and serve hot.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":15,"name":"Pulihora","category": "VEGETARIAN",
-    "ingredients":"4 servings:\n2 cups cooked rice\n2 tbsp tamarind pulp\n1 tbsp sesame oil\n1/2 tsp mustard seeds\n1 dried red chilli\nFew curry leaves\n1 tbsp peanuts\nSalt to taste",
-    "steps":"•Heat oil in a pan, add mustard seeds, red chilli, curry leaves, and peanuts.\n•Add tamarind pulp and cook until thickened.\n•Add salt and mix with cooked rice.\n•Toss well and serve.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":16,"name":"Mirchi Bajjii","category": "VEGETARIAN",
-    "ingredients":"4 servings:\n6 large green chillies\n1 cup gram flour\n1/4 tsp turmeric\n1/2 tsp chilli powder\nSalt to taste\nWater as needed\nOil for frying",
-    "steps":"•Slit chillies and remove seeds if desired.\n•Mix gram flour, spices, and water into a smooth batter.\n•Dip each chilli into the batter and deep fry until golden.\n•Serve with chutney.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":17,"name":"Pesarattu","category": "VEGETARIAN",
-    "ingredients":"4 servings:\n1 cup green gram (moong dal)\n1-inch ginger\n2 green chillies\nSalt to taste\nOil for cooking",
-    "steps":"•Soak green gram overnight and grind with ginger, chillies, and salt into a smooth batter.\n•Pour batter on a hot tawa and spread thinly.\n•Drizzle oil around edges and cook till crisp.\n•Fold and serve with upma or chutney.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":18,"name":"Khandvi","category": "VEGETARIAN",
-    "ingredients":"4 servings:\n1 cup gram flour\n1 cup yogurt\n2 cups water\n1/2 tsp turmeric\nSalt to taste\n1 tsp mustard seeds\nCurry leaves\nGrated coconut for garnish",
-    "steps":"•Whisk gram flour, yogurt, water, turmeric, and salt until smooth.\n•Cook on low flame, stirring till thick.\n•Spread thin layer on a greased surface and roll when cool.\n•Heat oil, add mustard seeds and curry leaves; pour over rolls.\n•Garnish with coconut.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":19,"name":"Garlic Cheese Toast","category": "VEGETARIAN",
-    "ingredients":"2 servings:\n4 bread slices\n2 tbsp butter\n2 garlic cloves, minced\n1/2 cup grated cheese\n1 tsp parsley",
-    "steps":"•Mix butter and garlic, spread on bread slices.\n•Sprinkle cheese and parsley.\n•Toast in oven or pan till golden and cheese melts.\n•Serve hot.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":20,"name":"Veg Momos","category": "VEGETARIAN",
-    "ingredients":"4 servings:\n1 cup all-purpose flour\n1/2 cup chopped vegetables (cabbage, carrot, capsicum)\n1 tsp soy sauce\n1 tsp oil\nSalt to taste\nWater for dough",
-    "steps":"•Knead flour and water into soft dough.\n•Sauté vegetables with soy sauce and salt.\n•Roll small dough circles, fill with mixture, and shape momos.\n•Steam for 10 minutes and serve with chutney.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":21,"name":"Paneer 65","category": "VEGETARIAN",
-    "ingredients":"4 servings:\n200g paneer, cubed\n2 tbsp corn flour\n1 tbsp rice flour\n1 tsp chilli powder\n1/4 tsp turmeric\nSalt to taste\nOil for frying\nCurry leaves and green chillies for garnish",
-    "steps":"•Mix flours, spices, and salt with water to make batter.\n•Coat paneer cubes and deep fry till crisp.\n•Toss with fried curry leaves and chillies.\n•Serve hot as snack.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":22,"name":"Honey Chilli Potato","category": "VEGETARIAN",
-    "ingredients":"2 servings:\n2 potatoes, cut into fingers\n2 tbsp corn flour\n1 tbsp soy sauce\n1 tbsp tomato ketchup\n1 tbsp honey\n1/2 tsp chilli flakes\n1 tbsp oil\nSesame seeds for garnish",
-    "steps":"•Coat potato fingers with corn flour and deep fry till golden.\n•In a wok, heat oil, add soy sauce, ketchup, honey, and chilli flakes.\n•Add fried potatoes and toss well.\n•Garnish with sesame seeds and serve.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":23,"name":"Veg Taco Skillet","category": "VEGETARIAN",
-    "ingredients":"2 servings:\n1 tbsp oil\n1 onion, chopped\n1 bell pepper, chopped\n1 cup cooked beans\n1/2 cup corn\n1 tbsp taco seasoning\n1/2 cup cheese\nTortilla chips for serving",
-    "steps":"•Heat oil in a pan and sauté onions and bell pepper.\n•Add beans, corn, and taco seasoning.\n•Simmer for 5 minutes.\n•Top with cheese and cover till melted.\n•Serve with tortilla chips.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":24,"name":"Creamy Tomato Spaghetti","category": "VEGETARIAN",
-    "ingredients":"2 servings:\n150g spaghetti\n1 tbsp olive oil\n2 garlic cloves\n2 tomatoes, pureed\n1/4 cup cream\nSalt and pepper to taste\nBasil leaves for garnish",
-    "steps":"•Cook spaghetti as per packet instructions.\n•Heat oil, sauté garlic, and add tomato puree.\n•Simmer 5 minutes, add cream, salt, and pepper.\n•Toss in spaghetti and garnish with basil.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":25,"name":"Mushroom and Spinach Pasta","category": "VEGETARIAN",
-    "ingredients":"2 servings:\n150g pasta\n1 tbsp olive oil\n1 cup mushrooms, sliced\n1 cup spinach\n1/2 cup cream\nSalt and pepper to taste\nGrated cheese for garnish",
-    "steps":"•Cook pasta until al dente.\n•Heat oil and sauté mushrooms till brown.\n•Add spinach and cook till wilted.\n•Add cream, salt, and pepper.\n•Mix in pasta, toss well, and garnish with cheese.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":26,"name":"Vegetarian Miso Noodle Soup with Mushrooms","category": "VEGETARIAN",
-    "ingredients":"2 servings:\n4 cups vegetable broth\n1 tbsp miso paste\n1 cup mushrooms\n100g noodles\n1 tbsp soy sauce\n1 tsp sesame oil\nSpring onions for garnish",
-    "steps":"•Heat broth in a pot, add miso paste and stir until dissolved.\n•Add mushrooms and soy sauce, simmer 5 minutes.\n•Add noodles and cook till soft.\n•Drizzle sesame oil and garnish with spring onions.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":27,"name":"Mediterranean Lentil Salad with Feta","category": "VEGETARIAN",
-    "ingredients":"2 servings:\n1 cup cooked lentils\n1/2 cup cherry tomatoes\n1/4 cup cucumber, diced\n1/4 cup red onion, chopped\n2 tbsp olive oil\n1 tbsp lemon juice\n1/4 cup feta cheese\nSalt and pepper to taste",
-    "steps":"•Combine lentils, tomatoes, cucumber, and onion in a bowl.\n•Whisk olive oil, lemon juice, salt, and pepper.\n•Toss dressing with salad and top with feta.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":28,"name":"Black Bean Burritos","category": "VEGETARIAN",
-    "ingredients":"2 servings:\n4 tortillas\n1 cup cooked black beans\n1/2 cup cooked rice\n1/2 cup corn\n1/2 cup salsa\n1/4 cup cheese\nLettuce and sour cream to serve",
-    "steps":"•Warm tortillas slightly.\n•Mix beans, rice, corn, salsa, and cheese.\n•Place mixture in center of tortilla, roll tightly.\n•Serve with lettuce and sour cream.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":29,"name":"Egg Curry","category":"EGG-ETARIAN",
-    "ingredients":"4 servings:\n6 boiled eggs\n2 onions, finely chopped\n2 tomatoes, pureed\n1 tbsp ginger-garlic paste\n1 tsp cumin seeds\n1/2 tsp turmeric\n1 tsp coriander powder\n1/2 tsp chilli powder\n1/2 tsp garam masala\n2 tbsp oil\nSalt to taste\nFresh coriander for garnish",
-    "steps":"•Heat oil in a pan and add cumin seeds.\n•Add onions and sauté until golden brown.\n•Stir in ginger-garlic paste and cook for a minute.\n•Add tomato puree, turmeric, coriander powder, and chilli powder.\n•Cook until oil separates.\n•Add 1/2 cup water and bring to a boil.\n•Add boiled eggs (halved) and simmer for 5 minutes.\n•Sprinkle garam masala, garnish with coriander, and serve hot.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":30,"name":"Vegetable Egg Fried Rice","category":"EGG-ETARIAN",
-    "ingredients":"2 servings:\n2 cups cooked rice\n2 eggs, lightly beaten\n1 tbsp oil\n1 garlic clove, minced\n1/2 cup mixed vegetables (carrot, beans, peas, corn)\n1 tbsp soy sauce\n1 tsp vinegar\nSalt and pepper to taste\nSpring onions for garnish",
-    "steps":"•Heat oil in a wok and add garlic.\n•Add beaten eggs, scramble lightly, and cook until soft.\n•Add vegetables and stir-fry 2–3 minutes.\n•Add rice, soy sauce, vinegar, salt, and pepper.\n•Toss everything on high heat.\n•Garnish with spring onions and serve.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":31,"name":"Spinach and Mushroom Omelette","category":"EGG-ETARIAN",
-    "ingredients":"1 serving:\n2 eggs\n1/2 cup spinach, chopped\n1/4 cup mushrooms, sliced\n1 tbsp milk\n1 tbsp butter\nSalt and pepper to taste\nGrated cheese (optional)",
-    "steps":"•Beat eggs with milk, salt, and pepper.\n•Heat butter in a non-stick pan and sauté mushrooms and spinach for 2 minutes.\n•Pour egg mixture and cook on medium heat.\n•Add cheese if desired.\n•Fold and serve hot.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":32,"name":"Egg Bhurji","category":"EGG-ETARIAN",
-    "ingredients":"2 servings:\n3 eggs\n1 onion, chopped\n1 tomato, chopped\n1 green chilli, chopped\n1/4 tsp turmeric\n1/2 tsp chilli powder\nSalt to taste\n1 tbsp oil\nCoriander leaves for garnish",
-    "steps":"•Heat oil in a pan and add onions and green chilli.\n•Sauté till onions soften.\n•Add tomatoes, turmeric, and chilli powder.\n•Cook till tomatoes turn mushy.\n•Add beaten eggs and cook while stirring continuously.\n•Garnish with coriander and serve with bread or roti.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":33,"name":"Egg Sandwich","category":"EGG-ETARIAN",
-    "ingredients":"2 servings:\n4 slices of bread\n2 boiled eggs, chopped\n2 tbsp mayonnaise\n1 tsp mustard\nSalt and pepper to taste\nButter for toasting",
-    "steps":"•Mix chopped eggs, mayonnaise, mustard, salt, and pepper in a bowl.\n•Spread mixture between two bread slices.\n•Butter outer sides and toast on a pan until golden brown.\n•Serve warm or cold.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":34,"name":"Shakshuka","category":"EGG-ETARIAN",
-    "ingredients":"2 servings:\n2 tbsp olive oil\n1 onion, chopped\n2 cloves garlic, minced\n1 red bell pepper, diced\n4 tomatoes, chopped (or 1 can crushed tomatoes)\n1 tsp cumin\n1/2 tsp paprika\n1/2 tsp chilli powder\n4 eggs\nSalt and pepper to taste\nFresh parsley for garnish",
-    "steps":"•Heat olive oil in a pan and sauté onion and garlic until fragrant.\n•Add bell pepper and cook until soft.\n•Add tomatoes and spices, simmer until thickened.\n•Make small wells and crack eggs into them.\n•Cover and cook until eggs are set to your liking.\n•Garnish with parsley and serve with bread.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":35,"name":"Egg Dosa","category":"EGG-ETARIAN",
-    "ingredients":"2 servings:\n1 cup dosa batter\n2 eggs\n1 onion, finely chopped\n1 green chilli, chopped\nSalt and pepper to taste\nOil for cooking",
-    "steps":"•Heat tawa and spread dosa batter thinly.\n•Break one egg on top, spread evenly, and sprinkle onion, chilli, salt, and pepper.\n•Drizzle oil around edges and cook until golden.\n•Fold and serve with chutney or sambar.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":36,"name":"Egg Paratha","category":"EGG-ETARIAN",
-    "ingredients":"2 servings:\n2 cups wheat flour\n2 eggs\n1 onion, chopped\n1 green chilli, chopped\nSalt and pepper to taste\nOil or ghee for roasting",
-    "steps":"•Knead flour with water to form dough, rest for 15 minutes.\n•Roll into a circle and cook lightly on a tawa.\n•Crack an egg on top, spread with spoon, sprinkle onion, chilli, salt, and pepper.\n•Flip and cook both sides with oil until golden.\n•Serve hot with yogurt or pickle.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":37,"name":"Egg Fried Noodles","category":"EGG-ETARIAN",
-    "ingredients":"2 servings:\n150g noodles\n2 eggs\n1 tbsp oil\n1 garlic clove, minced\n1/2 cup mixed vegetables (capsicum, carrot, beans)\n1 tbsp soy sauce\n1/2 tsp pepper\nSalt to taste\nSpring onions for garnish",
-    "steps":"•Cook noodles and drain.\n•Heat oil, add garlic and vegetables, stir-fry for 2 minutes.\n•Push to one side, scramble eggs on the other.\n•Add noodles, soy sauce, salt, and pepper.\n•Toss well, garnish with spring onions.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":38,"name":"Egg Biryani","category":"EGG-ETARIAN",
-    "ingredients":"4 servings:\n4 boiled eggs\n1 1/2 cups basmati rice\n2 onions, sliced\n1 tomato, chopped\n1 tbsp ginger-garlic paste\n1 tsp garam masala\n1/2 tsp turmeric\n1/2 tsp chilli powder\n2 tbsp oil\n1 tbsp ghee\nFresh coriander and mint\nSalt to taste",
-    "steps":"•Cook rice until 90% done, drain and keep aside.\n•Heat oil, sauté onions until golden.\n•Add ginger-garlic paste, tomato, and spices.\n•Add boiled eggs and mix gently.\n•Layer rice over masala, sprinkle mint and coriander.\n•Cover and steam for 10 minutes.\n•Serve hot with raita.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":39,"name":"Spanish Omelette","category":"EGG-ETARIAN",
-    "ingredients":"2 servings:\n3 eggs\n1 potato, thinly sliced\n1 onion, sliced\n2 tbsp olive oil\nSalt and pepper to taste",
-    "steps":"•Heat olive oil in a pan and cook potato slices till soft.\n•Add onions and cook until translucent.\n•Beat eggs with salt and pepper, pour over potatoes.\n•Cook on low flame until set.\n•Flip carefully and cook the other side.\n•Serve warm.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":40,"name":"Egg Pasta Carbonara (Vegetarian)","category":"EGG-ETARIAN",
-    "ingredients":"2 servings:\n150g spaghetti\n2 eggs\n1/4 cup grated parmesan or vegetarian cheese\n1 tbsp olive oil\n2 cloves garlic, minced\nSalt and pepper to taste\nParsley for garnish",
-    "steps":"•Cook spaghetti al dente, reserve 1/4 cup pasta water.\n•Beat eggs with cheese, salt, and pepper.\n•Heat oil, sauté garlic, add cooked pasta.\n•Turn off heat, quickly stir in egg mixture with a splash of hot pasta water.\n•Toss well till creamy.\n•Garnish with parsley.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":41,"name":"Egg Curry Rice Bowl","category":"EGG-ETARIAN",
-    "ingredients":"2 servings:\n2 boiled eggs\n1 cup cooked rice\n1/2 cup curry sauce (any mild curry)\n1 tbsp oil\nSalt to taste\nCoriander for garnish",
-    "instrustepsctions":"•Heat curry sauce in a pan.\n•Add boiled eggs and simmer for 5 minutes.\n•Serve hot over steamed rice.\n•Garnish with coriander.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":42,"name":"Masala Egg Toast","category":"EGG-ETARIAN",
-    "ingredients":"2 servings:\n4 slices bread\n2 eggs\n1 small onion, chopped\n1 green chilli, chopped\n1 tbsp milk\nSalt and pepper to taste\nButter or oil for toasting",
-    "steps":"•Beat eggs with onion, chilli, milk, salt, and pepper.\n•Heat butter on a pan, dip each bread slice in the mixture.\n•Cook both sides till golden.\n•Serve hot with ketchup or chutney.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":43,"name":"Egg Manchurian","category":"EGG-ETARIAN",
-    "ingredients":"2 servings:\n4 boiled eggs (halved)\n1/4 cup corn flour\n2 tbsp soy sauce\n1 tbsp tomato ketchup\n1 tsp vinegar\n1 onion, chopped\n1 capsicum, chopped\n1 tbsp oil\nSalt and pepper to taste",
-    "steps":"•Coat egg halves in corn flour, shallow fry till golden.\n•In the same pan, sauté onion and capsicum.\n•Add sauces, vinegar, and pepper.\n•Add eggs, toss gently.\n•Serve as snack or with fried rice.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":44,"name":"Vegetable Egg Wrap","category":"EGG-ETARIAN",
-    "ingredients":"2 servings:\n2 eggs\n2 chapatis or tortillas\n1/2 cup grated carrot\n1/4 cup sliced cucumber\n1/4 cup lettuce\n1 tbsp mayonnaise or yogurt sauce\nSalt and pepper to taste",
-    "steps":"•Beat eggs and cook into thin omelettes.\n•Place omelette over chapati.\n•Add vegetables and sauce, sprinkle salt and pepper.\n•Roll tightly and serve.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":45,"name":"Egg Pakora","category":"EGG-ETARIAN",
-    "ingredients":"4 servings:\n4 boiled eggs, halved\n1 cup gram flour\n1/2 tsp turmeric\n1/2 tsp chilli powder\nSalt to taste\nWater as needed\nOil for frying",
-    "steps":"•Mix gram flour, spices, salt, and water into thick batter.\n•Dip egg halves into batter and deep fry till golden.\n•Serve hot with chutney.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":46,"name":"Egg Kathi Roll","category":"EGG-ETARIAN",
-    "ingredients":"2 servings:\n2 parathas\n2 eggs\n1 onion, sliced\n1/4 cup capsicum\n1 tbsp tomato sauce\nSalt and pepper to taste\nOil for cooking",
-    "steps":"•Cook parathas and keep aside.\n•Beat eggs with salt and pepper.\n•Pour egg on tawa, place paratha on top to stick.\n•Flip, cook other side.\n•Add sautéed onion, capsicum, and sauce.\n•Roll and serve.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":47,"name":"Baked Egg Muffins","category":"EGG-ETARIAN",
-    "ingredients":"6 muffins:\n4 eggs\n1/2 cup spinach, chopped\n1/4 cup cheese\n1/4 cup diced bell pepper\nSalt and pepper to taste",
-    "steps":"•Preheat oven to 180°C.\n•Beat eggs with salt and pepper.\n•Mix in spinach, cheese, and bell pepper.\n•Pour into greased muffin cups.\n•Bake 15–20 minutes till set.\n•Cool slightly and serve.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":48,"name":"Egg Rice","category":"EGG-ETARIAN",
-    "ingredients":"2 servings:\n2 cups cooked rice\n2 eggs\n1 onion, chopped\n1 green chilli, chopped\n1/4 tsp turmeric\n1/2 tsp pepper\n1 tbsp oil\nSalt to taste",
-    "steps":"•Heat oil in a pan, sauté onions and chilli.\n•Add turmeric and salt.\n•Push aside, scramble eggs.\n•Add rice, mix well, sprinkle pepper.\n•Serve hot.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":49,"name":"Egg Masala Sandwich","category":"EGG-ETARIAN",
-    "ingredients":"2 servings:\n4 slices bread\n2 boiled eggs\n1/2 onion, chopped\n1/2 tomato, chopped\n1/2 tsp garam masala\nSalt to taste\nButter for toasting",
-    "steps":"•Mash boiled eggs, mix with onion, tomato, spices, and salt.\n•Spread on bread slices.\n•Butter outer sides and toast till golden.\n•Serve hot.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":50,"name":"Egg Salad Bowl","category":"EGG-ETARIAN",
-    "ingredients":"2 servings:\n2 boiled eggs, sliced\n1 cup lettuce\n1/4 cup cherry tomatoes\n1/4 cucumber, sliced\n1 tbsp olive oil\n1 tbsp lemon juice\nSalt and pepper to taste",
-    "steps":"•Arrange lettuce, tomato, and cucumber in a bowl.\n•Add sliced eggs on top.\n•Drizzle olive oil and lemon juice.\n•Season with salt and pepper.\n•Serve fresh.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":51,"name":"Egg Curry with Coconut Milk","category":"EGG-ETARIAN",
-    "ingredients":"4 servings:\n6 boiled eggs\n1 onion, chopped\n2 tomatoes, pureed\n1 tbsp ginger-garlic paste\n1/2 cup coconut milk\n1 tsp curry powder\n1/2 tsp turmeric\n1 tbsp oil\nSalt to taste",
-    "steps":"•Heat oil, sauté onions and ginger-garlic paste.\n•Add tomato puree and spices, cook until oil separates.\n•Add coconut milk and simmer.\n•Add eggs and cook 5 minutes.\n•Serve with rice or appam.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":52,"name":"Egg Bhuna Masala","category":"EGG-ETARIAN",
-    "ingredients":"4 servings:\n4 boiled eggs\n2 onions, sliced\n2 tomatoes, pureed\n1 tbsp ginger-garlic paste\n1 tsp garam masala\n1/2 tsp chilli powder\nSalt to taste\n2 tbsp oil",
-    "steps":"•Heat oil and sauté onions till golden.\n•Add ginger-garlic paste, tomato puree, and spices.\n•Cook till thick masala forms.\n•Add eggs, coat gently.\n•Serve hot with paratha.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":53,"name":"Eggplant and Egg Stir-Fry","category":"EGG-ETARIAN",
-    "ingredients":"2 servings:\n1 cup eggplant, diced\n2 eggs\n1 onion, sliced\n1 tbsp soy sauce\n1 tbsp oil\nSalt and pepper to taste",
-    "steps":"•Heat oil in a pan and sauté onions and eggplant till soft.\n•Push aside and scramble eggs.\n•Add soy sauce, salt, and pepper.\n•Mix well and serve.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":54,"name":"Egg Pulao","category":"EGG-ETARIAN",
-    "ingredients":"2 servings:\n1 cup basmati rice\n2 boiled eggs\n1 onion, sliced\n1 tomato, chopped\n1 tsp cumin\n1/2 tsp garam masala\n1 tbsp ghee\nSalt to taste",
-    "steps":"•Cook rice separately.\n•Heat ghee, add cumin, onion, and tomato.\n•Add spices and salt.\n•Add rice and mix.\n•Top with boiled eggs cut in halves and serve.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":55,"name":"Cheese Omelette","category":"EGG-ETARIAN",
-    "ingredients":"1 serving:\n2 eggs\n2 tbsp milk\n1/4 cup grated cheese\nSalt and pepper to taste\n1 tsp butter",
-    "steps":"•Beat eggs with milk, salt, and pepper.\n•Heat butter in a pan and pour egg mixture.\n•Sprinkle cheese, fold and cook till set.\n•Serve hot.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":56,"name":"Curried Egg Sandwich","category":"EGG-ETARIAN",
-    "ingredients":"2 servings:\n4 slices bread\n2 boiled eggs, mashed\n1 tbsp mayonnaise\n1/2 tsp curry powder\nSalt and pepper to taste",
-    "steps":"•Mix eggs with mayo, curry powder, salt, and pepper.\n•Spread between bread slices.\n•Serve fresh or toasted.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":57,"name":"Vegetable Egg Pizza","category":"EGG-ETARIAN",
-    "ingredients":"2 servings:\n1 pizza base\n2 eggs\n1/4 cup tomato sauce\n1/2 cup vegetables (bell pepper, onion, tomato)\n1/4 cup cheese\nSalt and oregano to taste",
-    "steps":"•Spread sauce on pizza base.\n•Add vegetables and crack eggs on top.\n•Sprinkle cheese and seasoning.\n•Bake at 200°C for 10–12 minutes.\n•Serve hot.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":58,"name":"Egg Idli","category":"EGG-ETARIAN",
-    "ingredients":"4 servings:\n1 cup idli batter\n2 boiled eggs, chopped\n1 onion, chopped\n1 green chilli, chopped\nSalt to taste",
-    "steps":"•Mix idli batter with onion, chilli, eggs, and salt.\n•Pour into greased idli moulds.\n•Steam 10–12 minutes.\n•Serve with chutney.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":59,"name":"Eggplant Parmesan with Egg Coating","category":"EGG-ETARIAN",
-    "ingredients":"2 servings:\n1 small eggplant, sliced\n1 egg, beaten\n1/4 cup breadcrumbs\n1/4 cup tomato sauce\n1/4 cup cheese\nSalt and pepper to taste",
-    "steps":"•Dip eggplant slices in beaten egg, coat with breadcrumbs.\n•Pan-fry till golden.\n•Layer with tomato sauce and cheese.\n•Bake at 180°C for 10 minutes.\n•Serve warm.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":60,"name":"Egg Paneer Bhurji","category":"EGG-ETARIAN",
-    "ingredients":"2 servings:\n2 eggs\n100g paneer, crumbled\n1 onion, chopped\n1 tomato, chopped\n1/2 tsp turmeric\n1/2 tsp chilli powder\nSalt to taste\n1 tbsp oil",
-    "steps":"•Heat oil, sauté onion and tomato.\n•Add spices, then paneer and eggs.\n•Stir continuously till eggs set.\n•Serve hot with roti.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":61,"name":"Eggplant Stir-Fry with Scrambled Egg","category":"EGG-ETARIAN",
-    "ingredients":"2 servings:\n1 cup chopped eggplant\n2 eggs\n1 onion, sliced\n1 tbsp soy sauce\n1 tbsp oil\nSalt and pepper to taste",
-    "steps":"•Sauté onion and eggplant till tender.\n•Push aside, scramble eggs.\n•Add soy sauce, mix everything.\n•Serve hot.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":62,"name":"Egg Poha","category":"EGG-ETARIAN",
-    "ingredients":"2 servings:\n1 cup poha (flattened rice)\n2 eggs\n1 onion, chopped\n1 green chilli, chopped\n1/4 tsp turmeric\nSalt to taste\n1 tbsp oil",
-    "steps":"•Rinse poha and drain.\n•Heat oil, sauté onions and chilli.\n•Add turmeric, salt, and eggs; scramble.\n•Add poha, mix well.\n•Serve with lemon.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":63,"name":"Egg Spinach Sandwich","category":"EGG-ETARIAN",
-    "ingredients":"2 servings:\n4 slices bread\n2 eggs\n1/2 cup spinach, chopped\n1 tbsp mayonnaise\nSalt and pepper to taste\nButter for toasting",
-    "steps":"•Scramble eggs with spinach, salt, and pepper.\n•Spread mayo on bread, add filling.\n•Toast lightly with butter.\n•Serve warm.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":64,"name":"Egg Tacos","category":"EGG-ETARIAN",
-    "ingredients":"2 servings:\n4 small tortillas\n2 eggs\n1/4 cup chopped bell peppers\n1/4 cup onion\n1/4 cup cheese\nSalt and pepper to taste",
-    "steps":"•Scramble eggs with onion and peppers.\n•Warm tortillas, fill with eggs and cheese.\n•Fold and serve.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":65,"name":"Egg Fried Cauliflower Rice","category":"EGG-ETARIAN",
-    "ingredients":"2 servings:\n2 cups grated cauliflower\n2 eggs\n1/2 cup mixed vegetables\n1 tbsp soy sauce\n1 tsp oil\nSalt and pepper to taste",
-    "steps":"•Heat oil, add vegetables and cauliflower, stir-fry 5 minutes.\n•Push aside, scramble eggs.\n•Add soy sauce, salt, and pepper.\n•Mix well and serve.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":66,"name":"Egg Veggie Pancakes","category":"EGG-ETARIAN",
-    "ingredients":"4 small pancakes:\n2 eggs\n1/4 cup grated carrot\n1/4 cup chopped spinach\n2 tbsp flour\nSalt and pepper to taste\nOil for cooking",
-    "steps":"•Whisk eggs, add veggies, flour, salt, and pepper.\n•Pour batter onto hot pan.\n•Cook both sides till golden.\n•Serve with ketchup.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":67,"name":"Egg Ramen Bowl","category":"EGG-ETARIAN",
-    "ingredients":"2 servings:\n100g ramen noodles\n2 eggs\n2 cups vegetable broth\n1 tbsp soy sauce\n1 tsp sesame oil\n1/2 cup mushrooms\nSpring onions for garnish",
-    "steps":"•Cook noodles in broth with soy sauce and mushrooms.\n•Boil eggs separately, peel and halve.\n•Serve noodles in bowl with broth.\n•Top with eggs, drizzle sesame oil, and garnish.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":68,"name":"Stuffed Bell Peppers with Egg","category":"EGG-ETARIAN",
-    "ingredients":"2 servings:\n2 bell peppers, halved\n2 eggs\n1/4 cup onion, chopped\n1/4 cup spinach, chopped\nSalt and pepper to taste\n1 tbsp olive oil",
-    "steps":"•Sauté onion and spinach lightly.\n•Place bell pepper halves on baking tray, add filling, crack egg on top.\n•Season with salt and pepper.\n•Bake at 180°C for 15 minutes.\n•Serve warm.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":69,"name":"Butter Chicken","category":"NON-VEGETARIAN",
-    "ingredients":"4 servings:\n500g boneless chicken\n1 cup yogurt\n1 tbsp ginger garlic paste\n1 tsp chilli powder\n1/2 tsp turmeric\n1 tbsp lemon juice\n2 tbsp butter\n1 onion, chopped\n2 tomatoes, pureed\n1/2 cup cream\n1 tsp garam masala\nSalt to taste",
-    "steps":"•Marinate chicken with yogurt, spices, lemon juice for 1 hour.\n•Cook chicken in pan until sealed.\n•In another pan, melt butter, add onion and tomato puree.\n•Add cream and garam masala.\n•Mix in cooked chicken and simmer for 10 minutes.\n•Serve with naan or rice.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":70,"name":"Chicken Biryani","category":"NON-VEGETARIAN",
-    "ingredients":"4 servings:\n500g chicken\n2 cups basmati rice\n2 onions, sliced\n1 tomato, chopped\n1 tbsp ginger garlic paste\n1 tsp garam masala\n1/2 tsp turmeric\n2 tbsp ghee\n1/4 cup curd\nMint and coriander\nSalt to taste",
-    "steps":"•Marinate chicken with curd and spices.\n•Fry onions till golden, add tomato and chicken.\n•Cook till tender.\n•Layer with parboiled rice, mint, coriander.\n•Cover and cook 15 minutes on low flame.\n•Serve hot with raita.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":71,"name":"Fish Curry","category":"NON-VEGETARIAN",
-    "ingredients":"3 servings:\n400g fish pieces\n1 onion, chopped\n1 tomato, chopped\n1 tbsp ginger garlic paste\n1 cup coconut milk\n1 tsp turmeric\n1 tsp chilli powder\n1 tbsp oil\nSalt to taste",
-    "steps":"•Marinate fish with salt and turmeric.\n•Sauté onion and ginger-garlic paste.\n•Add tomato and spices, cook till oil separates.\n•Pour coconut milk and simmer.\n•Add fish, cook gently for 10 minutes.\n•Serve with rice.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":72,"name":"Chicken 65","category":"NON-VEGETARIAN",
-    "ingredients":"4 servings:\n400g boneless chicken\n1/2 cup curd\n1 tbsp ginger garlic paste\n1 tsp red chilli powder\n1/2 tsp turmeric\n2 tbsp cornflour\n1 tbsp rice flour\nOil for frying\nCurry leaves\nSalt to taste",
-    "steps":"•Marinate chicken with all ingredients for 1 hour.\n•Deep fry till crisp.\n•Toss in fried curry leaves before serving.\n•Serve hot with lemon wedges.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":73,"name":"Mutton Curry","category":"NON-VEGETARIAN",
-    "ingredients":"4 servings:\n500g mutton\n2 onions, sliced\n1 tomato, chopped\n1 tbsp ginger garlic paste\n1 tsp coriander powder\n1/2 tsp turmeric\n1 tsp garam masala\n1 cup water\nSalt and oil to taste",
-    "steps":"•Pressure cook mutton with salt and turmeric for 3 whistles.\n•Sauté onions and paste till golden.\n•Add tomatoes, spices, and cooked mutton.\n•Simmer until gravy thickens.\n•Serve hot with roti or rice.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":74,"name":"Prawn Masala","category":"NON-VEGETARIAN",
-    "ingredients":"3 servings:\n300g prawns, cleaned\n1 onion, chopped\n1 tomato, pureed\n1 tbsp ginger garlic paste\n1 tsp cumin\n1/2 tsp turmeric\n1/2 tsp chilli powder\n2 tbsp oil\nSalt to taste",
-    "steps":"•Marinate prawns with turmeric and salt.\n•Sauté onion and paste till brown.\n•Add tomato puree and spices.\n•Add prawns, cook for 5–7 minutes.\n•Serve with lemon and rice.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":75,"name":"Egg Chicken Curry","category":"NON-VEGETARIAN",
-    "ingredients":"4 servings:\n300g chicken\n2 boiled eggs\n1 onion, chopped\n1 tomato, chopped\n1 tbsp ginger garlic paste\n1 tsp curry powder\nSalt and oil to taste",
-    "steps":"•Cook chicken with spices till soft.\n•Add boiled eggs and simmer in curry sauce.\n•Serve warm with chapati or rice.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":76,"name":"Tandoori Chicken","category":"NON-VEGETARIAN",
-    "ingredients":"4 servings:\n500g chicken legs\n1 cup yogurt\n1 tbsp tandoori masala\n1 tbsp lemon juice\n1 tsp chilli powder\n1 tbsp oil\nSalt to taste",
-    "steps":"•Marinate chicken in yogurt, lemon juice, and spices for 4 hours.\n•Bake at 220°C for 25 minutes.\n•Brush with oil halfway.\n•Serve hot with salad and mint chutney.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":77,"name":"Fish Fry","category":"NON-VEGETARIAN",
-    "ingredients":"3 servings:\n300g fish fillets\n1 tbsp ginger garlic paste\n1 tsp chilli powder\n1/2 tsp turmeric\n1 tbsp lemon juice\nRice flour for coating\nOil for frying\nSalt to taste",
-    "steps":"•Marinate fish with spices and lemon.\n•Coat in rice flour.\n•Shallow fry till crisp.\n•Serve with onion rings."},
-
-    {"id":78,"name":"Chicken Keema","category":"NON-VEGETARIAN",
-    "ingredients":"3 servings:\n400g minced chicken\n1 onion, chopped\n1 tomato, chopped\n1 tbsp ginger garlic paste\n1/2 tsp turmeric\n1 tsp garam masala\n1 tbsp oil\nSalt to taste",
-    "steps":"•Heat oil, sauté onion and paste.\n•Add tomato, spices, and chicken mince.\n•Cook until dry and aromatic.\n•Serve with pav or paratha.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":79,"name":"Mutton Biryani","category":"NON-VEGETARIAN",
-    "ingredients":"4 servings:\n500g mutton\n2 cups basmati rice\n2 onions\n1 cup yogurt\n1 tbsp ginger garlic paste\nWhole spices\nSalt, ghee, and herbs to taste",
-    "steps":"•Cook mutton with spices till tender.\n•Layer with half-cooked rice, ghee, and herbs.\n•Steam 20 minutes.\n•Serve with onion raita.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":80,"name":"Fish Tikka","category":"NON-VEGETARIAN",
-    "ingredients":"3 servings:\n300g fish cubes\n1/2 cup curd\n1 tbsp ginger garlic paste\n1 tsp garam masala\n1 tsp lemon juice\nSalt to taste",
-    "steps":"•Marinate fish with curd and spices.\n•Skewer and grill 10–12 minutes.\n•Brush with butter and serve hot.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":81,"name":"Chicken Fried Rice","category":"NON-VEGETARIAN",
-    "ingredients":"2 servings:\n1 cup cooked rice\n1/2 cup shredded chicken\n1 egg\n1/2 cup mixed veggies\n1 tbsp soy sauce\nSalt and pepper\nOil for frying",
-    "steps":"•Scramble egg and set aside.\n•Stir-fry vegetables and chicken.\n•Add rice, soy sauce, and egg.\n•Toss well and serve.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":82,"name":"Prawn Fried Rice","category":"NON-VEGETARIAN",
-    "ingredients":"2 servings:\n1 cup rice\n100g prawns\n1/2 cup veggies\n1 tbsp soy sauce\n1 egg\nSalt and oil",
-    "steps":"•Cook prawns till pink.\n•Add rice, veggies, soy sauce, and scrambled egg.\n•Toss well.\n•Serve hot.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":83,"name":"Chicken Lollipop","category":"NON-VEGETARIAN",
-    "ingredients":"4 servings:\n8 chicken lollipops\n1/4 cup cornflour\n1 tbsp ginger garlic paste\n1 tbsp soy sauce\nSalt to taste\nOil for frying",
-    "steps":"•Marinate lollipops with all ingredients.\n•Deep fry till golden.\n•Serve with schezwan sauce.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":84,"name":"Fish Moilee","category":"NON-VEGETARIAN",
-    "ingredients":"3 servings:\n400g fish\n1 onion\n1 tomato\n1 cup coconut milk\n1 tsp mustard seeds\n1 tsp turmeric\nCurry leaves\nSalt and oil",
-    "steps":"•Fry mustard seeds and curry leaves.\n•Add onion, tomato, and spices.\n•Pour coconut milk, add fish, simmer 10 minutes.\n•Serve with rice.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":85,"name":"Chicken Curry","category":"NON-VEGETARIAN",
-    "ingredients":"4 servings:\n500g chicken\n2 onions\n2 tomatoes\n1 tbsp ginger garlic paste\n1 tsp garam masala\n1/2 tsp chilli powder\nOil and salt",
-    "steps":"•Sauté onions and paste.\n•Add tomatoes and spices.\n•Add chicken, cook till done.\n•Serve hot.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":86,"name":"Shrimp Coconut Curry","category":"NON-VEGETARIAN",
-    "ingredients":"3 servings:\n300g shrimp\n1 onion\n1 tomato\n1/2 cup coconut milk\n1 tsp curry powder\nSalt and oil",
-    "steps":"•Sauté onion and tomato.\n•Add spices, coconut milk, and shrimp.\n•Simmer 8 minutes.\n•Serve with rice.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":87,"name":"Egg Chicken Roll","category":"NON-VEGETARIAN",
-    "ingredients":"2 servings:\n2 parathas\n2 eggs\n1/2 cup cooked chicken pieces\nOnion, sauce, and spices\nOil for cooking",
-    "steps":"•Make egg paratha.\n•Add cooked chicken and fillings.\n•Roll and serve.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":88,"name":"Fish Cutlet","category":"NON-VEGETARIAN",
-    "ingredients":"4 servings:\n200g boiled fish\n1 boiled potato\n1 onion, chopped\n1 green chilli\n1 egg\nBreadcrumbs\nSalt and oil",
-    "steps":"•Mash fish and potato with spices.\n•Shape cutlets, coat with egg and crumbs.\n•Fry till golden.\n•Serve with chutney.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":89,"name":"Chicken Pakora","category":"NON-VEGETARIAN",
-    "ingredients":"3 servings:\n300g chicken\n1 cup gram flour\n1 tsp chilli powder\nSalt\nWater and oil for frying",
-    "steps":"•Mix all ingredients into batter.\n•Deep fry chicken pieces till crisp.\n•Serve hot with sauce.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":90,"name":"Mutton Keema Pav","category":"NON-VEGETARIAN",
-    "ingredients":"3 servings:\n400g minced mutton\n1 onion\n1 tomato\n1 tsp garam masala\nSalt\nOil for cooking",
-    "steps":"•Cook keema with spices till dry.\n•Serve with buttered pav and lemon.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":91,"name":"Chicken Momos","category":"NON-VEGETARIAN",
-    "ingredients":"4 servings:\n200g minced chicken\n1 onion\n1 carrot, grated\n1 tsp soy sauce\nDough for wrapper\nSalt and oil",
-    "steps":"•Fill dumplings with chicken mixture.\n•Steam for 10 minutes.\n•Serve with spicy chutney.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":92,"name":"Fish Curry with Tamarind","category":"NON-VEGETARIAN",
-    "ingredients":"3 servings:\n300g fish\n1 onion\n1 tomato\n1 tbsp tamarind pulp\n1 tsp chilli powder\nSalt and oil",
-    "steps":"•Sauté onion, add tomato and tamarind.\n•Add fish and cook till done.\n•Serve with rice.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":93,"name":"Chicken Shawarma","category":"NON-VEGETARIAN",
-    "ingredients":"2 servings:\n200g chicken strips\n1 tsp garlic paste\n1 tsp lemon juice\n1 pita bread\nLettuce and sauce",
-    "steps":"•Grill marinated chicken.\n•Stuff pita with chicken and veggies.\n•Wrap and serve.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":94,"name":"Fish Biryani","category":"NON-VEGETARIAN",
-    "ingredients":"4 servings:\n400g fish\n2 cups basmati rice\n1 onion\n1 tomato\nSpices and ghee\nSalt to taste",
-    "steps":"•Cook fish curry.\n•Layer with rice and ghee.\n•Steam 10 minutes.\n•Serve with raita.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":95,"name":"Chicken Korma","category":"NON-VEGETARIAN",
-    "ingredients":"4 servings:\n500g chicken\n1/4 cup yogurt\n1 onion\n1 tbsp ginger garlic paste\n1/2 cup cashew paste\nSpices and ghee",
-    "steps":"•Fry onion, add paste and yogurt.\n•Add chicken and cook till creamy.\n•Serve hot.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":96,"name":"Mutton Rogan Josh","category":"NON-VEGETARIAN",
-    "ingredients":"4 servings:\n500g mutton\n1 onion\n1 tomato\n1 tbsp yogurt\n1 tsp garam masala\nSalt and oil",
-    "steps":"•Cook mutton with yogurt and spices.\n•Simmer till tender.\n•Serve with naan.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":97,"name":"Prawn Biryani","category":"NON-VEGETARIAN",
-    "ingredients":"4 servings:\n300g prawns\n2 cups rice\nOnions, tomato, and spices\nOil and salt",
-    "steps":"•Cook prawns masala.\n•Layer with half-cooked rice.\n•Steam for 10 minutes.\n•Serve hot.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":98,"name":"Chicken Nuggets","category":"NON-VEGETARIAN",
-    "ingredients":"4 servings:\n300g chicken mince\n1 egg\nBreadcrumbs\nSalt and pepper\nOil for frying",
-    "steps":"•Shape mixture into nuggets.\n•Coat with egg and crumbs.\n•Fry till golden.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":99,"name":"Fish Sandwich","category":"NON-VEGETARIAN",
-    "ingredients":"2 servings:\n2 fish fillets\nBread slices\nLettuce, tomato\nMayonnaise, salt, pepper",
-    "steps":"•Cook fish fillets.\n•Assemble sandwich with veggies and mayo.\n•Serve fresh.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":100,"name":"Garlic Butter Shrimp","category":"NON-VEGETARIAN",
-    "ingredients":"2 servings:\n200g shrimp\n2 tbsp butter\n4 garlic cloves\n1 tbsp lemon juice\nSalt and pepper",
-    "steps":"•Melt butter, sauté garlic.\n•Add shrimp and cook 3–4 minutes.\n•Add lemon juice and serve.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":101,"name":"Chicken Burger","category":"NON-VEGETARIAN",
-    "ingredients":"2 servings:\n200g chicken patty\n2 burger buns\nLettuce, tomato, cheese\nMayonnaise and ketchup",
-    "steps":"•Cook patty on grill.\n•Assemble burger with toppings.\n•Serve hot.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":102,"name":"Fish Tacos","category":"NON-VEGETARIAN",
-    "ingredients":"2 servings:\n2 tortillas\n200g fish\n1/4 cup cabbage\n1 tbsp mayo\nLime juice and salt",
-    "steps":"•Grill fish.\n•Assemble tacos with veggies and sauce.\n•Serve with lime wedges.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":103,"name":"Chicken Pulao","category":"NON-VEGETARIAN",
-    "ingredients":"4 servings:\n400g chicken\n2 cups basmati rice\n1 onion\nWhole spices\nSalt, oil, and herbs",
-    "steps":"•Sauté onion and spices.\n•Add chicken and rice.\n•Add water and cook till done.\n•Serve hot.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":104,"name":"Fish Curry Kerala Style","category":"NON-VEGETARIAN",
-    "ingredients":"4 servings:\n400g fish\n1 onion\n1 tomato\n1 cup coconut milk\nCurry leaves and tamarind\nSpices and oil",
-    "steps":"•Sauté onion and tomato.\n•Add coconut milk and spices.\n•Add fish, cook till done.\n•Serve with steamed rice.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":105,"name":"Chicken Vindaloo","category":"NON-VEGETARIAN",
-    "ingredients":"4 servings:\n400g chicken\n2 onions\n2 tomatoes\nVinegar, garlic, and spices\nOil and salt",
-    "steps":"•Marinate chicken in vinegar and spices.\n•Cook with onions and tomato.\n•Simmer till tender.\n•Serve spicy and hot.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":106,"name":"Fish Finger","category":"NON-VEGETARIAN",
-    "ingredients":"4 servings:\n300g fish strips\n1 egg\nBreadcrumbs\nSalt, pepper\nOil for frying",
-    "steps":"•Coat fish in egg and crumbs.\n•Deep fry till crisp.\n•Serve with tartar sauce.",
-    "video_path":"",
-    "is_default":1},
-
-    {"id":107,"name":"Butter Garlic Chicken","category":"NON-VEGETARIAN",
-    "ingredients":"4 servings:\n400g chicken\n2 tbsp butter\n4 garlic cloves\n1 tsp chilli flakes\nSalt and pepper",
-    "steps":"•Melt butter, add garlic and chilli.\n•Cook chicken pieces till golden.\n•Serve with rice or noodles.",
-    "video_path":"",
-    "is_default":1}
+# ---------------------- SEARCH INDEX ----------------------
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# score weights per matched term: (name, ingredients)
+_SCORE_TOKEN = (6, 3)
+_SCORE_PREFIX = (4, 2)
+_SCORE_SUBSTRING = (2, 1)
+_SCORE_FUZZY = (2, 1)  # minus the edit distance; fuzzy hits always rank after exact ones
+
+
+def fuzzy_radius(term):
+    # typos tolerated per term: none for short words, 1 up to 7 letters, then 2
+    if len(term) < 4:
+        return 0
+    return 1 if len(term) < 8 else 2
+
+
+def tokenize(text):
+    if not isinstance(text, str):
+        return []
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _edit_distance(a, b, limit, transpositions):
+    # Bit-parallel edit distance (Myers; Hyyrö's extension for adjacent
+    # swaps): one column of the DP table per letter of `b`, with the letters
+    # of `a` as bits. With a limit, anything certainly further away (by
+    # length alone) returns limit + 1 without the scan.
+    if a == b:
+        return 0
+    if limit is not None and abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if not a:
+        return len(b)
+    peq = {}
+    for i, c in enumerate(a):
+        peq[c] = peq.get(c, 0) | (1 << i)
+    mask = (1 << len(a)) - 1
+    high = 1 << (len(a) - 1)
+    vp, vn, d0, pm_prev, score = mask, 0, 0, 0, len(a)
+    for c in b:
+        pm = peq.get(c, 0)
+        transposed = ((~d0 & pm) << 1) & pm_prev if transpositions else 0
+        d0 = ((((pm & vp) + vp) & mask) ^ vp) | pm | vn | transposed
+        hp = vn | (~(d0 | vp) & mask)
+        hn = d0 & vp
+        if hp & high:
+            score += 1
+        elif hn & high:
+            score -= 1
+        hp = ((hp << 1) | 1) & mask
+        hn = (hn << 1) & mask
+        vp = hn | (~(d0 | hp) & mask)
+        vn = hp & d0
+        pm_prev = pm
+    return score
+
+
+def levenshtein(a, b, limit=None):
+    return _edit_distance(a, b, limit, False)
+
+
+def osa_distance(a, b, limit=None):
+    # Levenshtein distance that also counts swapping two adjacent letters as
+    # one edit (optimal string alignment): "manchurain" -> "manchurian" is 1.
+    # Not a metric (ca-ac-abc breaks the triangle inequality), so it only
+    # ranks; BKTree needs levenshtein().
+    return _edit_distance(a, b, limit, True)
+
+
+def _swaps(term):
+    # the term with each pair of adjacent letters swapped
+    return {term[:i] + term[i + 1] + term[i] + term[i + 2:] for i in range(len(term) - 1)} - {term}
+
+
+class BKTree:
+    # Burkhard-Keller tree over a vocabulary: children are keyed by their
+    # distance to the parent, so a query only measures the subtrees whose key
+    # lies within `radius` of the distance to the node. That pruning relies on
+    # the triangle inequality, so `distance` must be a true metric.
+    def __init__(self, distance=levenshtein):
+        self._distance = distance
+        self._root = None
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, word):
+        if self._root is None:
+            self._root = (word, {})
+            self._size = 1
+            return
+        node = self._root
+        while True:
+            d = self._distance(word, node[0])
+            if d == 0:
+                return
+            child = node[1].get(d)
+            if child is None:
+                node[1][d] = (word, {})
+                self._size += 1
+                return
+            node = child
+
+    def query(self, term, radius):
+        # [(distance, word)] within radius, closest first
+        found = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            word, children = stack.pop()
+            # past radius + the largest child key neither the node nor any
+            # child can match, so the exact distance is not needed
+            d = self._distance(term, word, radius + max(children, default=0))
+            if d <= radius:
+                found.append((d, word))
+            for key, child in children.items():
+                if d - radius <= key <= d + radius:
+                    stack.append(child)
+        found.sort()
+        return found
+
+
+class SearchIndex:
+    # Token + prefix inverted index over recipe names and ingredients, with a
+    # trigram index as fallback so plain substring queries keep matching, and
+    # a BK-tree over the vocabulary for terms that match nothing (typos).
+    def __init__(self):
+        self._docs = {}        # id -> (name, ingredients, category), lowercased
+        self._postings = {}    # token -> {id: field bits (1 = name, 2 = ingredients)}
+        self._vocab = []       # sorted tokens, for prefix ranges
+        self._grams = {}       # trigram -> set of ids
+        self._tree = None      # BKTree of alphabetic tokens, built on the first fuzzy query
+        self._tree_words = set()  # tokens in the tree; removed ones linger until a rebuild
+
+    def __len__(self):
+        return len(self._docs)
+
+    @classmethod
+    def from_df(cls, df):
+        index = cls()
+        for rid, name, ingredients, category in zip(df['id'], df['name'], df['ingredients'], df['category']):
+            index.add(int(rid), name, ingredients, category)
+        return index
+
+    def add(self, recipe_id, name, ingredients, category=None):
+        if recipe_id in self._docs:
+            self.remove(recipe_id)
+        name = name.lower() if isinstance(name, str) else ''
+        ingredients = ingredients.lower() if isinstance(ingredients, str) else ''
+        self._docs[recipe_id] = (name, ingredients, category)
+        for bit, text in ((1, name), (2, ingredients)):
+            for tok in set(tokenize(text)):
+                posting = self._postings.get(tok)
+                if posting is None:
+                    posting = self._postings[tok] = {}
+                    bisect.insort(self._vocab, tok)
+                    if self._tree is not None and tok.isalpha() and tok not in self._tree_words:
+                        self._tree.add(tok)
+                        self._tree_words.add(tok)
+                posting[recipe_id] = posting.get(recipe_id, 0) | bit
+        for gram in _trigrams(name) | _trigrams(ingredients):
+            self._grams.setdefault(gram, set()).add(recipe_id)
+
+    def remove(self, recipe_id):
+        doc = self._docs.pop(recipe_id, None)
+        if doc is None:
+            return
+        name, ingredients, _ = doc
+        for tok in set(tokenize(name)) | set(tokenize(ingredients)):
+            posting = self._postings.get(tok)
+            if posting is None:
+                continue
+            posting.pop(recipe_id, None)
+            if not posting:
+                del self._postings[tok]
+                i = bisect.bisect_left(self._vocab, tok)
+                if i < len(self._vocab) and self._vocab[i] == tok:
+                    del self._vocab[i]
+        for gram in _trigrams(name) | _trigrams(ingredients):
+            ids = self._grams.get(gram)
+            if ids is not None:
+                ids.discard(recipe_id)
+                if not ids:
+                    del self._grams[gram]
+
+    def _prefix_tokens(self, prefix):
+        i = bisect.bisect_left(self._vocab, prefix)
+        while i < len(self._vocab) and self._vocab[i].startswith(prefix):
+            yield self._vocab[i]
+            i += 1
+
+    def _substring_ids(self, term):
+        grams = _trigrams(term)
+        if grams:
+            postings = sorted((self._grams.get(g, ()) for g in grams), key=len)
+            candidates = set(postings[0]).intersection(*postings[1:])
+        else:
+            candidates = self._docs.keys()
+        return [rid for rid in candidates if term in self._docs[rid][0] or term in self._docs[rid][1]]
+
+    def _match_term(self, term):
+        scores = {}
+        for rid in self._substring_ids(term):
+            name, _, _ = self._docs[rid]
+            scores[rid] = _SCORE_SUBSTRING[0] if term in name else _SCORE_SUBSTRING[1]
+        for tok in self._prefix_tokens(term):
+            weights = _SCORE_TOKEN if tok == term else _SCORE_PREFIX
+            for rid, bits in self._postings[tok].items():
+                score = weights[0] if bits & 1 else weights[1]
+                if score > scores.get(rid, 0):
+                    scores[rid] = score
+        return scores
+
+    def _fuzzy_tree(self):
+        if self._tree is None or len(self._tree_words) > 2 * len(self._postings):
+            self._tree = BKTree()
+            self._tree_words = {tok for tok in self._vocab if tok.isalpha()}
+            for tok in sorted(self._tree_words, key=lambda t: (len(t), t)):
+                self._tree.add(tok)
+        return self._tree
+
+    def fuzzy_tokens(self, term):
+        # [(osa_distance, token)], closest first: vocabulary tokens within
+        # fuzzy_radius(term) Levenshtein edits, or one adjacent swap away
+        # ("cahsew" -> "cashew", two Levenshtein edits)
+        radius = fuzzy_radius(term)
+        if not radius:
+            return []
+        found = {tok for _, tok in self._fuzzy_tree().query(term, radius)}
+        found.update(_swaps(term))
+        return sorted((osa_distance(term, tok), tok) for tok in found if tok in self._postings and tok.isalpha())
+
+    def _match_fuzzy(self, term):
+        scores = {}
+        for distance, tok in self.fuzzy_tokens(term):
+            for rid, bits in self._postings[tok].items():
+                score = (_SCORE_FUZZY[0] if bits & 1 else _SCORE_FUZZY[1]) - distance / 4
+                if score > scores.get(rid, 0):
+                    scores[rid] = score
+        return scores
+
+    def search(self, query, category=None):
+        # Every whitespace-separated term must match (AND); a term with no
+        # exact, prefix or substring match is matched against the vocabulary
+        # with typos allowed instead. Results are ranked by summed match
+        # quality (a fuzzy hit scores below any exact one), then by name.
+        terms = query.lower().split()
+        if not terms:
+            return []
+        totals = None
+        for term in sorted(set(terms), key=len, reverse=True):
+            scores = self._match_term(term)
+            if not scores:
+                scores = self._match_fuzzy(term)
+            if totals is None:
+                totals = scores
+            else:
+                totals = {rid: totals[rid] + s for rid, s in scores.items() if rid in totals}
+            if not totals:
+                return []
+        phrase = query.lower().strip()
+        ranked = []
+        for rid, score in totals.items():
+            name, _, cat = self._docs[rid]
+            if category and cat != category:
+                continue
+            if name == phrase:
+                score += 10
+            elif name.startswith(phrase):
+                score += 5
+            ranked.append((-score, name, rid))
+        ranked.sort()
+        return [rid for _, _, rid in ranked]
+
+
+# ---------------------- RECIPE PARSING ----------------------
+# Ingredients are stored as free text: a yield line ("4 servings:"), optional
+# section headers ("FOR PURI:") and one ingredient per line ("1 1/2 cups
+# basmati rice", "200g paneer, cubed", "Salt to taste"). Steps are one per
+# line, usually bulleted. parse_recipe() turns both into a ParsedRecipe; the
+# RecipeStore keeps one per recipe plus a catalogue-wide ingredient table.
+
+UNITS = {'tsp': 'tsp', 'teaspoon': 'tsp', 'teaspoons': 'tsp', 'tbsp': 'tbsp', 'tablespoon': 'tbsp',
+         'tablespoons': 'tbsp', 'cup': 'cup', 'cups': 'cup', 'g': 'g', 'gm': 'g', 'gram': 'g', 'grams': 'g',
+         'kg': 'kg', 'ml': 'ml', 'l': 'l', 'litre': 'l', 'litres': 'l', 'liter': 'l', 'liters': 'l',
+         'inch': 'inch', 'pinch': 'pinch', 'slice': 'slice', 'slices': 'slice'}
+
+_FRACTIONS = {'½': '1/2', '¼': '1/4', '¾': '3/4', '⅓': '1/3', '⅔': '2/3'}
+_QUANTITY_RE = re.compile(r"(\d+\s+\d+/\d+|\d+/\d+|\d+(?:\.\d+)?)(?:\s*-\s*(\d+(?:\.\d+)?)(?=\s|$))?([\s-]*)(.*)$")
+_STEP_BULLET_RE = re.compile(r"^(?:[•\-*]|\d+[.)])\s*")
+_LIST_COMMA_RE = re.compile(r",(?![^()]*\))")  # commas outside parentheses
+
+
+def parse_quantity(text):
+    # "1", "1.5", "1/2", "1 1/2" -> float; None for a zero denominator ("1/0")
+    whole, _, frac = text.strip().rpartition(' ')
+    if '/' in frac:
+        num, den = frac.split('/')
+        if not int(den):
+            return None
+        value = int(num) / int(den)
+    else:
+        value = float(frac)
+    return value + (float(whole) if whole else 0.0)
+
+
+_EIGHTHS = {1: '1/8', 2: '1/4', 3: '3/8', 4: '1/2', 5: '5/8', 6: '3/4', 7: '7/8'}
+
+
+def format_quantity(value, unit=None):
+    # kitchen notation: grams/ml whole, kg/litres to two decimals, the rest to the nearest 1/8
+    if unit in ('g', 'ml'):
+        return str(max(1, int(round(value))))
+    if unit in ('kg', 'l'):
+        return f"{value:.2f}".rstrip('0').rstrip('.')
+    eighths = max(1, int(round(value * 8)))
+    whole, frac = divmod(eighths, 8)
+    if not frac:
+        return str(whole)
+    return f"{whole} {_EIGHTHS[frac]}" if whole else _EIGHTHS[frac]
+
+
+class Ingredient:
+    __slots__ = ('section', 'quantity', 'quantity_max', 'unit', 'name', 'note', 'text', 'tail')
+
+    def __init__(self, section, quantity, unit, name, note, text, quantity_max=None, tail=''):
+        self.section = section    # "" outside any "FOR ...:" block
+        self.quantity = quantity  # float, None for "Salt to taste"; ranges keep their lower end
+        self.quantity_max = quantity_max  # upper end of "2-3 chillies"
+        self.unit = unit          # canonical key of UNITS or None
+        self.name = name
+        self.note = note          # text after the first comma or in parentheses
+        self.text = text          # the line as written
+        self.tail = tail          # the line after its quantity, e.g. " cups basmati rice"
+
+    def scaled_text(self, factor):
+        if self.quantity is None or factor == 1:
+            return self.text
+        value = self.quantity * factor
+        amount = format_quantity(value, self.unit)
+        if self.quantity_max is not None:
+            value = self.quantity_max * factor
+            amount += '-' + format_quantity(value, self.unit)
+        tail = self.tail
+        if self.unit in ('cup', 'slice'):
+            tail = re.sub(r"^(\s*%s)s?\b" % self.unit, r"\1s" if value > 1 else r"\1", tail)
+        return amount + tail
+
+
+def parse_ingredient(line, section=''):
+    text = line.strip()
+    for glyph, fraction in _FRACTIONS.items():
+        text = text.replace(glyph, ' ' + fraction)
+    text = text.strip()
+    quantity, quantity_max, unit, rest, tail = None, None, None, text, ''
+    m = _QUANTITY_RE.match(text)
+    if m and parse_quantity(m.group(1)) is None:
+        m = None  # "1/0 cup sugar": kept as an unquantified line
+    if m:
+        quantity, rest, tail = parse_quantity(m.group(1)), m.group(4), m.group(3) + m.group(4)
+        if m.group(2):
+            quantity_max = float(m.group(2))
+        word, _, after = rest.partition(' ')
+        if word.lower().rstrip('.') in UNITS:
+            unit, rest = UNITS[word.lower().rstrip('.')], after
+            if rest.lower().startswith('of '):
+                rest = rest[3:]
+    paren = re.search(r"\(([^)]*)\)", rest)
+    if paren:
+        rest = rest[:paren.start()] + rest[paren.end():]
+    name, _, note = rest.partition(',')
+    notes = [n for n in (paren.group(1).strip() if paren else '', note.strip()) if n]
+    return Ingredient(section, quantity, unit, ' '.join(name.split()), ', '.join(notes), line.strip(),
+                      quantity_max, tail)
+
+
+class ParsedRecipe:
+    def __init__(self, servings, yield_unit, ingredients, steps):
+        self.servings = servings      # yield amount ("4 servings:" -> 4.0), None if not stated
+        self.yield_unit = yield_unit  # "servings", "muffins", ...
+        self.ingredients = ingredients
+        self.steps = steps            # step texts without bullets; step_index is position + 1
+
+    def sections(self):
+        return list(dict.fromkeys(i.section for i in self.ingredients))
+
+
+def parse_steps(text):
+    if not isinstance(text, str):
+        return []
+    return [_STEP_BULLET_RE.sub('', s.strip()) for s in text.splitlines() if s.strip()]
+
+
+def _split_comma_list(line):
+    # "rice, toor dal, turmeric, salt" typed on one line (the add form used to
+    # ask for comma separated ingredients) is one ingredient per piece when no
+    # piece, or every piece, starts with a quantity; "200g paneer, cubed" is
+    # one ingredient with a note.
+    pieces = [p.strip() for p in _LIST_COMMA_RE.split(line) if p.strip()]
+    quantified = [parse_ingredient(p).quantity is not None for p in pieces]
+    if len(pieces) > 1 and (not any(quantified) or all(quantified)):
+        return pieces
+    return [line]
+
+
+def parse_recipe(ingredients, steps):
+    lines = [l for l in ingredients.splitlines() if l.strip()] if isinstance(ingredients, str) else []
+    servings, yield_unit = None, None
+    if lines and lines[0].strip().endswith(':'):
+        m = _QUANTITY_RE.match(lines[0].strip()[:-1])
+        if m and parse_quantity(m.group(1)) is not None:
+            servings, yield_unit = parse_quantity(m.group(1)), m.group(4).strip()
+            lines = lines[1:]
+    if len(lines) == 1 and not lines[0].strip().endswith(':'):
+        lines = _split_comma_list(lines[0])
+    parsed, section = [], ''
+    for line in lines:
+        if line.strip().endswith(':'):
+            section = line.strip()[:-1].strip()
+        else:
+            parsed.append(parse_ingredient(line, section))
+    return ParsedRecipe(servings, yield_unit, parsed, parse_steps(steps))
+
+
+# Canonical ingredient names merge the spellings recipes use for the same
+# thing to buy ("Onions", "chopped onion", "1 small onion"): preparation and
+# size words are dropped, the last word is singularised and CANONICAL_NAMES
+# maps the remaining synonyms. Lines without a quantity ("Salt and pepper to
+# taste") can name several things and are split into each of them.
+
+CANONICAL_NAMES = {'ginger-garlic paste': 'ginger garlic paste', 'cornflour': 'corn flour', 'mayo': 'mayonnaise',
+                   'veggie': 'mixed vegetable', 'mixed veggie': 'mixed vegetable', 'vegetable': 'mixed vegetable',
+                   'garlic clove': 'garlic', 'clove garlic': 'garlic', 'cloves garlic': 'garlic', 'curd': 'yogurt', 'bread slice': 'bread',
+                   'capsicum': 'bell pepper', 'shrimp': 'prawn', 'chicken mince': 'chicken',
+                   'red chilli powder': 'chilli powder', 'coriander': 'coriander leaf',
+                   'fish fillet': 'fish', 'fish piece': 'fish', 'fish cube': 'fish', 'fish strip': 'fish',
+                   'chicken piece': 'chicken', 'chicken strip': 'chicken', 'boneless chicken': 'chicken',
+                   'cumin': 'cumin seed', 'mutton mince': 'mutton', 'all-purpose flour': 'flour',
+                   'parmesan': 'cheese', 'mint': 'mint leaf', 'tamarind': 'tamarind pulp',
+                   'tomato ketchup': 'ketchup', 'cold water': 'water'}
+_NAME_MODIFIERS = {'chopped', 'grated', 'sliced', 'diced', 'shredded', 'minced', 'boiled', 'cooked', 'fresh',
+                   'small', 'large', 'medium', 'ripe', 'few', 'finely', 'roughly'}
+_NAME_SUFFIX_RE = re.compile(r"\s+(?:to taste|to serve|as needed|as required|for\b.*)$")
+_NAME_SPLIT_RE = re.compile(r"\s*(?:,|\band\b|&)\s*")
+_SINGULAR_KEEP = ('ss', 'us')
+_WORD_FORMS = {'chillies': 'chilli', 'chilies': 'chilli', 'chillie': 'chilli', 'leaves': 'leaf', 'veggies': 'veggie'}
+
+
+def _singular(word):
+    if word in _WORD_FORMS:
+        return _WORD_FORMS[word]
+    if word.endswith('oes'):
+        return word[:-2]
+    if word.endswith('s') and not word.endswith(_SINGULAR_KEEP) and len(word) > 3:
+        return word[:-1]
+    return word
+
+
+def canonical_name(name):
+    name = _NAME_SUFFIX_RE.sub('', name.lower().strip()).split(' or ')[0]
+    words = [w for w in name.split() if w not in _NAME_MODIFIERS]
+    if not words:
+        return ''
+    words[-1] = _singular(words[-1])
+    name = ' '.join(words)
+    return CANONICAL_NAMES.get(name, name)
+
+
+def canonical_names(name, quantified=True):
+    # what a line asks to buy; a line without a quantity may list several items
+    if quantified:
+        parts = [name]
+    else:
+        parts = _NAME_SPLIT_RE.split(_NAME_SUFFIX_RE.sub('', name.lower().strip()))
+    names = [canonical_name(p) for p in parts]
+    return list(dict.fromkeys(n for n in names if n))
+
+
+INGREDIENT_COLUMNS = ['recipe_id', 'line', 'section', 'quantity', 'unit', 'name', 'note', 'servings', 'canonical']
+
+
+def ingredient_frame(parsed_by_id):
+    # one row per ingredient line of every recipe in {recipe_id: ParsedRecipe};
+    # 'canonical' holds the list of canonical_names() of the line
+    rows = [(rid, line, i.section, i.quantity, i.unit, i.name, i.note, p.servings,
+             canonical_names(i.name, i.quantity is not None))
+            for rid, p in parsed_by_id.items() for line, i in enumerate(p.ingredients)]
+    df = pd.DataFrame(rows, columns=INGREDIENT_COLUMNS)
+    return df.astype({'recipe_id': 'int64', 'line': 'int64', 'quantity': 'float64', 'servings': 'float64'})
+
+
+def _popcount(words):
+    # set bits per uint64 element
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words)
+    table = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+    return table[words.view(np.uint8)].reshape(words.shape + (8,)).sum(axis=-1)
+
+
+class PantryIndex:
+    # One bitset per recipe over the vocabulary of canonical ingredient names
+    # (bits packed into uint64 words), so matching a pantry against every
+    # recipe is an AND and a popcount per word.
+    def __init__(self, frame, staples=()):
+        names = frame[['recipe_id', 'canonical']].explode('canonical').dropna()
+        staples = {canonical_name(s) for s in staples}
+        names = names[~names['canonical'].isin(staples)]
+        self.vocab = sorted(set(names['canonical']))
+        self.codes = {name: i for i, name in enumerate(self.vocab)}
+        self.recipe_ids = np.unique(frame['recipe_id'].to_numpy()).astype(np.int64)
+        words = max(1, (len(self.vocab) + 63) // 64)
+        self.bits = np.zeros((len(self.recipe_ids), words), dtype=np.uint64)
+        rows = np.searchsorted(self.recipe_ids, names['recipe_id'].to_numpy())
+        cols = names['canonical'].map(self.codes).to_numpy(dtype=np.int64)
+        np.bitwise_or.at(self.bits, (rows, cols >> 6), np.left_shift(np.uint64(1), (cols & 63).astype(np.uint64)))
+        self.need = _popcount(self.bits).sum(axis=1)
+
+    def query_bits(self, items):
+        query = np.zeros(self.bits.shape[1], dtype=np.uint64)
+        for item in items:
+            code = self.codes.get(canonical_name(item))
+            if code is not None:
+                query[code >> 6] |= np.uint64(1) << np.uint64(code & 63)
+        return query
+
+    def match(self, items):
+        # (recipe_ids, have, need) with have = ingredients of the recipe covered by `items`
+        have = _popcount(self.bits & self.query_bits(items)).sum(axis=1)
+        return self.recipe_ids, have, self.need
+
+    def missing(self, recipe_id, items):
+        row = np.searchsorted(self.recipe_ids, recipe_id)
+        lacking = self.bits[row] & ~self.query_bits(items)
+        return [name for code, name in enumerate(self.vocab)
+                if int(lacking[code >> 6]) >> (code & 63) & 1]
+
+
+_STEP_STOPWORDS = frozenset("and the with for till until then into add cook heat serve mix minutes minute "
+                            "hot well over from onto it its each few some".split())
+
+
+def recipe_terms(name, parsed):
+    # weighted features for similarity: canonical ingredients, name words and
+    # (at half weight) the words of the steps
+    terms = Counter()
+    for ingredient in parsed.ingredients:
+        for canonical in canonical_names(ingredient.name, ingredient.quantity is not None):
+            terms['i:' + canonical] += 1.0
+    for token in tokenize(name):
+        terms['n:' + token] += 1.0
+    for step in parsed.steps:
+        for token in tokenize(step):
+            if len(token) > 2 and token not in _STEP_STOPWORDS:
+                terms['s:' + token] += 0.5
+    return terms
+
+
+def recipe_fingerprint(name, ingredients, steps):
+    text = '\x1f'.join(v if isinstance(v, str) else '' for v in (name, ingredients, steps))
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def _ranges(starts, lengths):
+    # concatenation of arange(s, s + n) for each start/length pair
+    lengths = np.asarray(lengths, dtype=np.int64)
+    total = int(lengths.sum())
+    return np.repeat(np.asarray(starts, dtype=np.int64) - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+
+
+class SimilarityIndex:
+    # TF-IDF vectors over recipe_terms() and the top-k most similar recipes of
+    # each (cosine). The vectors are a CSR matrix held in NumPy arrays; products
+    # run a block of rows at a time against its per-term postings, so memory
+    # follows the non-zeros and one block of scores, not recipes x vocabulary.
+    # A full fit leaves out the catalogue's most common terms (salt, oil, ...)
+    # until the all-pairs work is within PAIR_BUDGET per recipe; their IDF
+    # weight is small anyway. After that the index is maintained
+    # incrementally: an added recipe is one product against the catalogue, a
+    # removed one only recomputes the recipes that listed it. IDF weights are
+    # fixed at the last full fit, which sync() redoes once a quarter of the
+    # catalogue changed. Neighbours and per-recipe fingerprints persist as a
+    # JSON snapshot plus an append-only log of changed entries.
+    PAIR_BUDGET = 4000       # posting entries visited per recipe in a full fit
+    BLOCK_CELLS = 1 << 21    # score cells plus posting entries per product block
+
+    def __init__(self, k=SIMILAR_TOP_K):
+        self.k = k
+        self.fingerprints = {}  # id -> recipe_fingerprint() the neighbours were computed from
+        self.neighbours = {}    # id -> [(id, score)], best first
+        self._vocab = None      # term -> column; None until the vectors are built
+        self._idf = None
+        self._ids = np.zeros(0, dtype=np.int64)  # matrix row -> id
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._indices = np.zeros(0, dtype=np.int32)
+        self._data = np.zeros(0, dtype=np.float32)
+        self._postings = None   # (column pointers, rows, values), rebuilt after a change
+        self._dirty = set()     # ids changed since persist(); None after a full fit
+
+    def similar(self, recipe_id):
+        return [rid for rid, _ in self.neighbours.get(int(recipe_id), [])]
+
+    # -- vectors --
+
+    def _fit_vocabulary(self, docs):
+        counts = Counter(t for terms in docs for t in terms)
+        common = sorted(counts, key=lambda t: (-counts[t], t))
+        pairs = sum(c * c for c in counts.values())
+        budget = self.PAIR_BUDGET * max(len(docs), 1)
+        skip = 0
+        while skip < len(common) and pairs > budget:
+            pairs -= counts[common[skip]] ** 2
+            skip += 1
+        kept = sorted(common[skip:])
+        self._vocab = {t: i for i, t in enumerate(kept)}
+        df = np.array([counts[t] for t in kept], dtype=np.float64)
+        self._idf = np.log((1 + len(docs)) / (1 + df)) + 1.0
+
+    def _vectorize(self, terms_by_id):
+        # (ids, indptr, indices, data): L2-normalised CSR rows sorted by id. The
+        # first call fixes the vocabulary and IDF weights.
+        ids = sorted(terms_by_id)
+        if self._vocab is None:
+            self._fit_vocabulary([terms_by_id[rid] for rid in ids])
+        indptr, cols, tfs = [0], [], []
+        for rid in ids:
+            for term, tf in terms_by_id[rid].items():
+                col = self._vocab.get(term)
+                if col is not None:
+                    cols.append(col)
+                    tfs.append(tf)
+            indptr.append(len(cols))
+        indptr = np.asarray(indptr, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int32)
+        tfs = np.asarray(tfs, dtype=np.float64)
+        weights = np.where(tfs >= 1, 1.0 + np.log(np.maximum(tfs, 1.0)), tfs) * self._idf[cols]
+        rows = np.repeat(np.arange(len(ids)), np.diff(indptr))
+        norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=len(ids)))
+        weights = weights / np.where(norms > 0, norms, 1.0)[rows]
+        return np.asarray(ids, dtype=np.int64), indptr, cols, weights.astype(np.float32)
+
+    def _columns(self):
+        if self._postings is None:
+            rows = np.repeat(np.arange(len(self._ids)), np.diff(self._indptr))
+            order = np.argsort(self._indices, kind='stable')
+            colptr = np.zeros(len(self._vocab) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self._indices, minlength=len(self._vocab)), out=colptr[1:])
+            self._postings = (colptr, rows[order], self._data[order])
+        return self._postings
+
+    def _product(self, rows):
+        # dense scores (len(rows) x recipes) of the given rows against every row
+        colptr, post_rows, post_data = self._columns()
+        n = len(self._ids)
+        starts, ends = self._indptr[rows], self._indptr[rows + 1]
+        entries = _ranges(starts, ends - starts)
+        terms = self._indices[entries]
+        first, lengths = colptr[terms], colptr[terms + 1] - colptr[terms]
+        hits = _ranges(first, lengths)
+        owner = np.repeat(np.repeat(np.arange(len(rows)), ends - starts), lengths)
+        cells = owner * n + post_rows[hits]
+        weights = np.repeat(self._data[entries], lengths) * post_data[hits]
+        return np.bincount(cells, weights=weights, minlength=len(rows) * n).reshape(len(rows), n)
+
+    def _blocks(self, rows):
+        # (rows, scores) for `rows`, split so each block's work stays within BLOCK_CELLS
+        n = len(self._ids)
+        if not len(rows) or not n:
+            return
+        colptr = self._columns()[0]
+        per_entry = np.diff(colptr)[self._indices]
+        per_row = np.bincount(np.repeat(np.arange(n), np.diff(self._indptr)), weights=per_entry, minlength=n)
+        cost = per_row[rows] + n
+        start, total = 0, 0
+        for i, c in enumerate(cost):
+            if total and total + c > self.BLOCK_CELLS:
+                yield rows[start:i], self._product(rows[start:i])
+                start, total = i, 0
+            total += c
+        yield rows[start:], self._product(rows[start:])
+
+    def _touch(self, ids):
+        if self._dirty is not None:
+            self._dirty.update(int(rid) for rid in ids)
+
+    def _keep_top(self, block, scores):
+        scores[np.arange(len(block)), block] = -1.0
+        k = min(self.k, scores.shape[1] - 1)
+        self._touch(self._ids[block])
+        if k <= 0:
+            for row in block:
+                self.neighbours[int(self._ids[row])] = []
+            return
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        for i, row in enumerate(block):
+            order = top[i][np.argsort(-scores[i, top[i]], kind='stable')]
+            self.neighbours[int(self._ids[row])] = [(int(self._ids[j]), round(float(scores[i, j]), 4))
+                                                    for j in order if scores[i, j] > 0]
+
+    def _compute(self, rows):
+        for block, scores in self._blocks(np.asarray(rows, dtype=np.int64)):
+            self._keep_top(block, scores)
+
+    # -- maintenance --
+
+    def fit(self, terms_by_id):
+        self._vocab = None
+        self._ids, self._indptr, self._indices, self._data = self._vectorize(terms_by_id)
+        self._postings = None
+        self.neighbours = {}
+        self._dirty = None
+        self._compute(np.arange(len(self._ids)))
+
+    def add(self, terms_by_id):
+        if not terms_by_id:
+            return
+        ids, indptr, indices, data = self._vectorize(terms_by_id)
+        first = len(self._ids)
+        self._ids = np.concatenate([self._ids, ids])
+        self._indptr = np.concatenate([self._indptr, indptr[1:] + self._indptr[-1]])
+        self._indices = np.concatenate([self._indices, indices])
+        self._data = np.concatenate([self._data, data])
+        self._postings = None
+        # existing recipes take a new one in when it beats their k-th neighbour
+        floor = np.array([found[-1][1] if len(found) >= self.k else 0.0
+                          for found in (self.neighbours.get(int(rid), ()) for rid in self._ids[:first])])
+        for block, scores in self._blocks(np.arange(first, len(self._ids))):
+            self._keep_top(block, scores)
+            for i, row in enumerate(block):
+                rid = int(self._ids[row])
+                for j in np.nonzero(scores[i, :first] > floor)[0]:
+                    other, score = int(self._ids[j]), round(float(scores[i, j]), 4)
+                    current = self.neighbours.setdefault(other, [])
+                    current.append((rid, score))
+                    current.sort(key=lambda n: -n[1])
+                    del current[self.k:]
+                    floor[j] = current[-1][1] if len(current) >= self.k else 0.0
+                    self._touch([other])
+
+    def remove(self, recipe_ids):
+        gone = {int(rid) for rid in recipe_ids}
+        if not gone:
+            return
+        keep = ~np.isin(self._ids, list(gone))
+        lengths = np.diff(self._indptr)
+        entries = np.repeat(keep, lengths)
+        self._ids = self._ids[keep]
+        self._indices = self._indices[entries]
+        self._data = self._data[entries]
+        self._indptr = np.concatenate([[0], np.cumsum(lengths[keep])])
+        self._postings = None
+        for rid in gone:
+            self.neighbours.pop(rid, None)
+        self._touch(gone)
+        position = {int(rid): row for row, rid in enumerate(self._ids)}
+        stale = [position[rid] for rid, found in self.neighbours.items()
+                 if rid in position and any(n in gone for n, _ in found)]
+        self._compute(stale)
+
+    def sync(self, fingerprints, terms_for):
+        # Bring the index in line with {id: fingerprint}; terms_for(id) gives
+        # recipe_terms(). Returns True when anything changed.
+        removed = [rid for rid, fp in self.fingerprints.items() if fingerprints.get(rid) != fp]
+        added = [rid for rid, fp in fingerprints.items() if self.fingerprints.get(rid) != fp]
+        if not removed and not added:
+            return False
+        if len(removed) + len(added) > max(8, len(fingerprints) // 4):
+            self.fit({rid: terms_for(rid) for rid in fingerprints})
+        else:
+            if self._vocab is None:
+                # neighbours came from disk: rebuild the vectors of the unchanged recipes
+                self._ids, self._indptr, self._indices, self._data = self._vectorize(
+                    {rid: terms_for(rid) for rid in self.fingerprints if rid not in removed})
+                self._postings = None
+            self.remove(removed)
+            self.add({rid: terms_for(rid) for rid in added})
+        self.fingerprints = dict(fingerprints)
+        return True
+
+    # -- persistence --
+
+    def persist(self, path):
+        # Appends the entries changed since the last call to `<path>.log`; the
+        # snapshot is rewritten after a full fit or once the log outgrows
+        # UPDATE_LOG_MAX_BYTES. The log goes first, so a crash in between
+        # leaves stale fingerprints (recomputed by the next sync), never stale
+        # entries replayed over a newer snapshot.
+        dirty, self._dirty = self._dirty, set()
+        log_path = path + '.log'
+        try:
+            if dirty is None or (os.path.exists(log_path) and os.path.getsize(log_path) > UPDATE_LOG_MAX_BYTES):
+                if os.path.exists(log_path):
+                    os.remove(log_path)
+                data = {'k': self.k, 'fingerprints': {str(r): fp for r, fp in self.fingerprints.items()},
+                        'neighbours': {str(r): [[n, s] for n, s in found] for r, found in self.neighbours.items()}}
+                with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                    f.write(json.dumps(data, separators=(',', ':')))
+                os.replace(path + '.tmp', path)
+            elif dirty:
+                entry = {str(r): [self.fingerprints.get(r), [[n, s] for n, s in self.neighbours.get(r, [])]]
+                         for r in sorted(dirty)}
+                with open(log_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        except OSError as e:
+            print("Could not save similar recipes:", e)
+
+    @classmethod
+    def load(cls, path, k=SIMILAR_TOP_K):
+        index = cls(k)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('k') != k:
+                return index
+            index.fingerprints = {int(r): fp for r, fp in data['fingerprints'].items()}
+            index.neighbours = {int(r): [(int(n), s) for n, s in found] for r, found in data['neighbours'].items()}
+        except (OSError, ValueError, KeyError, TypeError):
+            return cls(k)
+        try:
+            with open(path + '.log', 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line
+                    for r, (fp, found) in entry.items():
+                        if fp is None:
+                            index.fingerprints.pop(int(r), None)
+                            index.neighbours.pop(int(r), None)
+                        else:
+                            index.fingerprints[int(r)] = fp
+                            index.neighbours[int(r)] = [(int(n), s) for n, s in found]
+        except OSError:
+            pass
+        return index
+
+
+# ---------------------- STORAGE BACKENDS ----------------------
+
+RECIPES = 'recipes'
+RECIPE_IMAGES = 'recipe_images'
+STEP_IMAGES = 'step_images'
+LIST_COLUMNS = ['id', 'name', 'category', 'is_default']
+TABLE_COLUMNS = {
+    RECIPES: ['id', 'name', 'category', 'ingredients', 'steps', 'video_path', 'is_default'],
+    RECIPE_IMAGES: ['id', 'recipe_id', 'file_path', 'caption'],
+    STEP_IMAGES: ['id', 'recipe_id', 'step_index', 'file_path'],
+}
+CSV_PATHS = {RECIPES: RECIPES_CSV, RECIPE_IMAGES: RECIPE_IMAGES_CSV, STEP_IMAGES: STEP_IMAGES_CSV}
+# order of a recipe's rows in the media tables, see RecipeStore.group()
+GROUP_ORDER = {RECIPE_IMAGES: ['id'], STEP_IMAGES: ['step_index', 'id']}
+# columns holding paths into MEDIA_FOLDER, see RecipeStore.media_refs()
+MEDIA_COLUMNS = {RECIPES: 'video_path', RECIPE_IMAGES: 'file_path', STEP_IMAGES: 'file_path'}
+
+
+def _set_row_fields(df, mask, fields):
+    # in-place df.loc[mask, column] = value that widens a column (e.g. an empty,
+    # float-typed video_path) instead of refusing a value of another type
+    for column, value in fields.items():
+        if column not in df.columns:
+            df[column] = None
+        try:
+            df.loc[mask, column] = value
+        except (TypeError, ValueError):
+            df[column] = df[column].astype(object)
+            df.loc[mask, column] = value
+
+
+def _csv_header(path):
+    # column names without importing pandas (ensure() runs before the home window)
+    with open(path, newline='', encoding='utf-8') as f:
+        return next(csv.reader(f), [])
+
+
+def _read_update_log(path):
+    # {row id: {column: value}} from an update log, later lines winning; a torn
+    # last line (crash mid-append) is ignored
+    updates = {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                updates.setdefault(entry['id'], {}).update(entry['fields'])
+    except OSError:
+        pass
+    return updates
+
+
+def _apply_updates(df, updates, columns=None):
+    if not updates or df.empty:
+        return df
+    df = df.copy()
+    ids = df['id']
+    for row_id, fields in updates.items():
+        if columns is not None:
+            fields = {c: v for c, v in fields.items() if c in columns}
+        if fields:
+            _set_row_fields(df, ids == row_id, fields)
+    return df
+
+
+class Storage:
+    # Interface between the RecipeStore and a persistence backend. Tables are
+    # addressed by name (RECIPES, RECIPE_IMAGES, STEP_IMAGES) and exchanged as
+    # DataFrames. Mutations receive the signature the caller last saw and
+    # return False when the table had changed underneath it; the write still
+    # happens, but the caller must reload instead of patching its copy.
+    def ensure(self):
+        # create missing tables, empty; seeding is seed_default_recipes()'s job
+        raise NotImplementedError
+
+    def defaults_version(self):
+        # version of the default-recipe asset last merged in, None if never recorded
+        raise NotImplementedError
+
+    def set_defaults_version(self, version):
+        raise NotImplementedError
+
+    def signature(self, table):
+        raise NotImplementedError
+
+    def load(self, table, columns=None):
+        raise NotImplementedError
+
+    def append(self, table, rows, expected):
+        raise NotImplementedError
+
+    def delete(self, table, column, values, remaining, expected):
+        raise NotImplementedError
+
+    def update(self, table, row_id, fields, updated, expected):
+        raise NotImplementedError
+
+    def reserve_ids(self, table, count, floor):
+        raise NotImplementedError
+
+    @contextmanager
+    def transaction(self):
+        yield
+
+    def search(self, query, category=None):
+        # ranked ids, or None when the backend has no native full-text search
+        return None
+
+    def sidecar(self, name):
+        # path for derived data kept next to the tables, None to keep it in memory only
+        return None
+
+    def close(self):
+        pass
+
+
+class CsvStorage(Storage):
+    def __init__(self, paths=None):
+        self.paths = dict(paths or CSV_PATHS)
+        self.journal_path = self.paths[RECIPES] + '.journal'
+        self._sequences = {}
+        self._txn = None
+        self._depth = 0
+
+    def ensure(self):
+        self.recover()
+        path = self.paths[RECIPES]
+        if os.path.exists(path) and 'id' not in _csv_header(path):
+            df = pd.read_csv(path)
+            df['id'] = range(1, len(df) + 1)
+            df.to_csv(path, index=False)
+        for table in (RECIPES, RECIPE_IMAGES, STEP_IMAGES):
+            if not os.path.exists(self.paths[table]):
+                with open(self.paths[table], 'w', newline='', encoding='utf-8') as f:
+                    f.write(','.join(TABLE_COLUMNS[table]) + '\n')
+
+    def sidecar(self, name):
+        return f"{self.paths[RECIPES]}.{name}"
+
+    def defaults_version(self):
+        try:
+            with open(self.paths[RECIPES] + '.defaults', 'r', encoding='utf-8') as f:
+                return int(f.read().strip())
+        except (OSError, ValueError):
+            return None
+
+    def set_defaults_version(self, version):
+        path = self.paths[RECIPES] + '.defaults'
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            f.write(f"{version}\n")
+        os.replace(path + '.tmp', path)
+
+    # -- transactions --
+    # Whole-table rewrites inside a transaction are staged as `<csv>.txn` files.
+    # On commit a journal listing them is written and fsynced (the commit
+    # point) before they are renamed over the tables, so after a crash
+    # recover() either finishes the renames or throws the staged files away.
+    # Appends record the table's original size in the journal first, so an
+    # uncommitted append can be truncated off again. A transaction holds the
+    # folder-wide `<journal>.lock` throughout, and recover() takes it too, so
+    # one instance starting up never mistakes another's live transaction for
+    # a crashed one.
+    # Single-row updates don't rewrite the table: they are appended to a
+    # `<csv>.updates` log that load() replays, and the log is folded back in
+    # (and removed) by the next whole-table rewrite. Replaying a log onto a
+    # table that already contains it is harmless, so the log is only removed
+    # after the rewrite is in place.
+
+    @contextmanager
+    def transaction(self):
+        if self._depth:
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+            return
+        with _locked_file(self.journal_path + '.lock'):
+            self._txn = {'replace': {}, 'appends': {}}
+            self._depth = 1
+            try:
+                yield
+            except BaseException:
+                self._undo(self._journal_data('pending'))
+                raise
+            else:
+                self._commit()
+            finally:
+                self._depth = 0
+                self._txn = None
+
+    def _journal_data(self, state):
+        return {'state': state,
+                'replace': [[tmp, self.paths[t]] for t, tmp in self._txn['replace'].items()],
+                'appends': [[path, size] for path, size in self._txn['appends'].items()]}
+
+    def _write_journal(self, data):
+        tmp = self.journal_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.journal_path)
+
+    def _commit(self):
+        if self._txn['replace']:
+            data = self._journal_data('committed')
+            self._write_journal(data)
+            self._redo(data)
+        elif os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+
+    def _redo(self, data):
+        for tmp, target in data['replace']:
+            with _locked_file(target + '.lock'):
+                if os.path.exists(tmp):
+                    os.replace(tmp, target)
+                self._drop_update_log(target)
+        os.remove(self.journal_path)
+
+    def _undo(self, data):
+        for path, size in data['appends']:
+            if os.path.exists(path) and os.path.getsize(path) > size:
+                with open(path, 'r+b') as f:
+                    f.truncate(size)
+        for tmp, _ in data['replace']:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+
+    def recover(self):
+        # finish or roll back a transaction interrupted by a crash; with the
+        # journal lock held, whatever journal or staged files remain are leftovers
+        with _locked_file(self.journal_path + '.lock'):
+            if os.path.exists(self.journal_path):
+                try:
+                    with open(self.journal_path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                except ValueError:
+                    data = {'state': 'pending', 'replace': [], 'appends': []}
+                if data.get('state') == 'committed':
+                    self._redo(data)
+                else:
+                    self._undo(data)
+            for path in self.paths.values():
+                if os.path.exists(path + '.txn'):
+                    os.remove(path + '.txn')
+
+    def _write_table(self, table, df):
+        # whole-table rewrite: staged until commit inside a transaction, else
+        # written to a temp file and renamed into place
+        path = self.paths[table]
+        tmp = path + ('.txn' if self._txn is not None else '.tmp')
+        with open(tmp, 'w', newline='', encoding='utf-8') as f:
+            df.to_csv(f, index=False)
+            f.flush()
+            os.fsync(f.fileno())
+        if self._txn is not None:
+            self._txn['replace'][table] = tmp
+        else:
+            os.replace(tmp, path)
+            self._drop_update_log(path)
+
+    def _drop_update_log(self, path):
+        if os.path.exists(path + '.updates'):
+            os.remove(path + '.updates')
+
+    def _track_append(self, path):
+        # remember the file's size before the transaction's first append to it
+        if self._txn is not None and path not in self._txn['appends']:
+            self._txn['appends'][path] = os.path.getsize(path) if os.path.exists(path) else 0
+            self._write_journal(self._journal_data('pending'))
+
+    def _current_source(self, table):
+        # where the table's latest content lives (a staged rewrite wins)
+        if self._txn is not None and table in self._txn['replace']:
+            return self._txn['replace'][table]
+        return self.paths[table]
+
+    def _read_current(self, table):
+        # the table with pending updates applied; a staged rewrite already has them
+        source = self._current_source(table)
+        df = pd.read_csv(source)
+        if source == self.paths[table]:
+            df = _apply_updates(df, _read_update_log(source + '.updates'))
+        return df
+
+    # -- storage interface --
+
+    def signature(self, table):
+        path = self.paths[table]
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        try:
+            log = os.stat(path + '.updates')
+        except OSError:
+            return (st.st_mtime_ns, st.st_size)
+        return (st.st_mtime_ns, st.st_size, log.st_mtime_ns, log.st_size)
+
+    def load(self, table, columns=None):
+        # The bytes are hashed before parsing so the columnar cache written from
+        # this frame is tied to exactly the content it was built from.
+        path = self.paths[table]
+        updates = _read_update_log(path + '.updates')
+        if updates and columns is not None and 'id' not in columns:
+            return self.load(table, ['id'] + list(columns))[list(columns)]
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        df = _read_columnar_cache(path, digest, columns)
+        if df is None:
+            if columns is not None and (not COLUMNAR_CACHE or _pyarrow() is None):
+                df = pd.read_csv(io.BytesIO(data), usecols=columns)
+            else:
+                df = pd.read_csv(io.BytesIO(data))
+                _write_columnar_cache(path, digest, df)
+                if columns is not None:
+                    df = df[columns]
+        return _apply_updates(df, updates, columns)
+
+    def append(self, table, rows, expected):
+        path = self.paths[table]
+        with _locked_file(path + '.lock'):
+            in_sync = self.signature(table) == expected
+            self._track_append(path)
+            with open(path, 'ab') as f:
+                if f.tell() == 0:
+                    f.write((','.join(rows.columns) + '\n').encode('utf-8'))
+                elif not _ends_with_newline(path):
+                    f.write(b'\n')
+                f.write(rows.to_csv(header=False, index=False, lineterminator='\n').encode('utf-8'))
+                f.flush()
+                os.fsync(f.fileno())
+        return in_sync
+
+    def delete(self, table, column, values, remaining, expected):
+        path = self.paths[table]
+        with _locked_file(path + '.lock'):
+            in_sync = self.signature(table) == expected
+            if not in_sync:
+                df = self._read_current(table)
+                remaining = df[~df[column].isin(values)]
+            self._write_table(table, remaining)
+        return in_sync
+
+    def update(self, table, row_id, fields, updated, expected):
+        path = self.paths[table]
+        with _locked_file(path + '.lock'):
+            in_sync = self.signature(table) == expected
+            if self._txn is not None and table in self._txn['replace']:
+                # the table is already being rewritten in this transaction
+                if not in_sync:
+                    updated = self._read_current(table)
+                    _set_row_fields(updated, updated['id'] == row_id, fields)
+                self._write_table(table, updated)
+                return in_sync
+            log_path = path + '.updates'
+            self._track_append(log_path)
+            line = json.dumps({'id': int(row_id), 'fields': fields}) + '\n'
+            with open(log_path, 'ab') as f:
+                f.write(line.encode('utf-8'))
+                f.flush()
+                os.fsync(f.fileno())
+            if self._txn is None and os.path.getsize(log_path) > UPDATE_LOG_MAX_BYTES:
+                self.compact(table)
+        return in_sync
+
+    def compact(self, table):
+        # fold the update log into the CSV; callers hold the table's lock
+        if os.path.exists(self.paths[table] + '.updates'):
+            self._write_table(table, self._read_current(table))
+
+    def reserve_ids(self, table, count, floor):
+        seq = self._sequences.get(table)
+        if seq is None:
+            seq = self._sequences[table] = IdSequence(self.paths[table])
+        return seq.reserve(count, floor=floor)
+
+
+_pyarrow_modules = None
+
+
+def _pyarrow():
+    # pyarrow is optional; imported on first use so startup doesn't pay for it
+    global _pyarrow_modules
+    if _pyarrow_modules is None:
+        try:
+            import pyarrow
+            import pyarrow.feather
+            import pyarrow.ipc
+            _pyarrow_modules = pyarrow
+        except ImportError:
+            _pyarrow_modules = False
+    return _pyarrow_modules or None
+
+
+def _read_columnar_cache(csv_path, digest, columns=None):
+    pa = _pyarrow() if COLUMNAR_CACHE else None
+    cache_path = csv_path + '.feather'
+    if pa is None or not os.path.exists(cache_path):
+        return None
+    try:
+        with pa.memory_map(cache_path, 'r') as source:
+            reader = pa.ipc.open_file(source)
+            if (reader.schema.metadata or {}).get(b'csv_hash') != digest.encode():
+                return None
+            table = reader.read_all()
+            if columns is not None:
+                table = table.select(list(columns))
+            return table.to_pandas()
+    except Exception as e:
+        print("Ignoring columnar cache:", e)
+        return None
+
+
+def _write_columnar_cache(csv_path, digest, df):
+    pa = _pyarrow() if COLUMNAR_CACHE else None
+    if pa is None:
+        return
+    cache_path = csv_path + '.feather'
+    tmp = cache_path + '.tmp'
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata(dict(table.schema.metadata or {}, csv_hash=digest))
+        # uncompressed so readers can memory-map it without decoding
+        pa.feather.write_feather(table, tmp, compression='uncompressed')
+        os.replace(tmp, cache_path)
+    except Exception as e:
+        print("Could not write columnar cache:", e)
+
+
+_SQLITE_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS recipes (id INTEGER PRIMARY KEY, name TEXT, category TEXT, ingredients TEXT, "
+    "steps TEXT, video_path TEXT, is_default INTEGER)",
+    "CREATE INDEX IF NOT EXISTS idx_recipes_category ON recipes(category)",
+    "CREATE INDEX IF NOT EXISTS idx_recipes_name ON recipes(name)",
+    "CREATE TABLE IF NOT EXISTS recipe_images (id INTEGER PRIMARY KEY, recipe_id INTEGER, file_path TEXT, caption TEXT)",
+    "CREATE INDEX IF NOT EXISTS idx_recipe_images_recipe_id ON recipe_images(recipe_id)",
+    "CREATE TABLE IF NOT EXISTS step_images (id INTEGER PRIMARY KEY, recipe_id INTEGER, step_index INTEGER, file_path TEXT)",
+    "CREATE INDEX IF NOT EXISTS idx_step_images_recipe_id ON step_images(recipe_id, step_index)",
+    "CREATE TABLE IF NOT EXISTS sequences (name TEXT PRIMARY KEY, next_id INTEGER NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+]
+
+# trigram tokenizer keeps the case-insensitive substring semantics of the CSV search
+_SQLITE_FTS_SCHEMA = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS recipes_fts USING fts5(name, ingredients, content='recipes', "
+    "content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS recipes_fts_ai AFTER INSERT ON recipes BEGIN "
+    "INSERT INTO recipes_fts(rowid, name, ingredients) VALUES (new.id, new.name, new.ingredients); END",
+    "CREATE TRIGGER IF NOT EXISTS recipes_fts_ad AFTER DELETE ON recipes BEGIN "
+    "INSERT INTO recipes_fts(recipes_fts, rowid, name, ingredients) VALUES ('delete', old.id, old.name, old.ingredients); END",
+    "CREATE TRIGGER IF NOT EXISTS recipes_fts_au AFTER UPDATE ON recipes BEGIN "
+    "INSERT INTO recipes_fts(recipes_fts, rowid, name, ingredients) VALUES ('delete', old.id, old.name, old.ingredients); "
+    "INSERT INTO recipes_fts(rowid, name, ingredients) VALUES (new.id, new.name, new.ingredients); END",
 ]
 
-os.makedirs(MEDIA_FOLDER, exist_ok=True)
-df = pd.read_csv('recipes.csv')
-if 'id' not in df.columns:
-    df['id'] = range(1, len(df) + 1)
-    df.to_csv('recipes.csv', index=False)
 
+def _sql_rows(df):
+    # NaN -> NULL and numpy scalars -> plain Python values for sqlite3
+    return df.astype(object).where(df.notna(), None).values.tolist()
+
+
+class SqliteStorage(Storage):
+    def __init__(self, db_path=None):
+        self.db_path = db_path or SQLITE_DB
+        self._conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._depth = 0
+        self._fts = False
+
+    @contextmanager
+    def transaction(self):
+        if self._depth == 0:
+            self._conn.execute("BEGIN IMMEDIATE")
+        self._depth += 1
+        try:
+            yield
+        except BaseException:
+            self._depth -= 1
+            if self._depth == 0:
+                self._conn.execute("ROLLBACK")
+            raise
+        self._depth -= 1
+        if self._depth == 0:
+            self._conn.execute("COMMIT")
+
+    def ensure(self):
+        with self.transaction():
+            for stmt in _SQLITE_SCHEMA:
+                self._conn.execute(stmt)
+            try:
+                for stmt in _SQLITE_FTS_SCHEMA:
+                    self._conn.execute(stmt)
+            except sqlite3.OperationalError:
+                pass  # SQLite built without FTS5/trigram: search falls back to the in-memory index
+        self._fts = self._conn.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE name = 'recipes_fts'").fetchone()[0] == 1
+
+    def sidecar(self, name):
+        return f"{self.db_path}.{name}"
+
+    def defaults_version(self):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'defaults_version'").fetchone()
+        return int(row[0]) if row else None
+
+    def set_defaults_version(self, version):
+        with self.transaction():
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('defaults_version', ?)", (str(version),))
+
+    def signature(self, table):
+        # changes whenever another connection commits; our own writes keep it
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def load(self, table, columns=None):
+        columns = columns or TABLE_COLUMNS[table]
+        return pd.read_sql_query(f"SELECT {', '.join(columns)} FROM {table} ORDER BY id", self._conn)
+
+    def _insert(self, table, rows):
+        columns = [c for c in rows.columns if c in TABLE_COLUMNS[table]]
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        self._conn.executemany(sql, _sql_rows(rows[columns]))
+
+    def append(self, table, rows, expected):
+        with self.transaction():
+            in_sync = self.signature(table) == expected
+            self._insert(table, rows)
+        return in_sync
+
+    def delete(self, table, column, values, remaining, expected):
+        with self.transaction():
+            in_sync = self.signature(table) == expected
+            self._conn.executemany(f"DELETE FROM {table} WHERE {column} = ?", [(int(v),) for v in values])
+        return in_sync
+
+    def update(self, table, row_id, fields, updated, expected):
+        columns = list(fields)
+        with self.transaction():
+            in_sync = self.signature(table) == expected
+            self._conn.execute(f"UPDATE {table} SET {', '.join(c + ' = ?' for c in columns)} WHERE id = ?",
+                               [fields[c] for c in columns] + [int(row_id)])
+        return in_sync
+
+    def reserve_ids(self, table, count, floor):
+        with self.transaction():
+            row = self._conn.execute("SELECT next_id FROM sequences WHERE name = ?", (table,)).fetchone()
+            top = self._conn.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}").fetchone()[0]
+            start = max(row[0] if row else 1, top, floor)
+            self._conn.execute("INSERT OR REPLACE INTO sequences (name, next_id) VALUES (?, ?)", (table, start + count))
+        return range(start, start + count)
+
+    def search(self, query, category=None):
+        terms = query.lower().split()
+        if not self._fts or not terms or min(len(t) for t in terms) < 3:
+            return None
+        match = ' AND '.join('"%s"' % t.replace('"', '""') for t in terms)
+        sql = "SELECT r.id FROM recipes_fts JOIN recipes r ON r.id = recipes_fts.rowid WHERE recipes_fts MATCH ?"
+        params = [match]
+        if category:
+            sql += " AND r.category = ?"
+            params.append(category)
+        # the exact name, then names starting with the query, lead as in SearchIndex
+        phrase = query.lower().strip()
+        sql += " ORDER BY lower(r.name) = ? DESC, substr(lower(r.name), 1, ?) = ? DESC, bm25(recipes_fts, 10.0, 1.0), r.name"
+        params += [phrase, len(phrase), phrase]
+        return [row[0] for row in self._conn.execute(sql, params)]
+
+    def close(self):
+        self._conn.close()
+
+
+def make_storage(backend=None):
+    backend = backend or STORAGE_BACKEND
+    if backend == 'sqlite':
+        return SqliteStorage()
+    if backend == 'csv':
+        return CsvStorage()
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+def migrate_csv_to_sqlite(db_path=None, csv_paths=None):
+    # One-shot copy of the CSV tables (and their id sequences) into a new
+    # SQLite database. Refuses to run against a database that already has recipes.
+    source = CsvStorage(csv_paths)
+    target = SqliteStorage(db_path)
+    try:
+        target.ensure()
+        with target.transaction():
+            if target.load(RECIPES).shape[0]:
+                return False, f"{target.db_path} already contains recipes."
+            for table in TABLE_COLUMNS:
+                df = source.load(table).reindex(columns=TABLE_COLUMNS[table])
+                target._insert(table, df)
+                floor = source.reserve_ids(table, 0, 1).start
+                target.reserve_ids(table, 0, floor)
+            if source.defaults_version() is not None:
+                target.set_defaults_version(source.defaults_version())
+        return True, f"Migrated to {target.db_path}"
+    finally:
+        target.close()
+
+
+# ---------------------- RECIPE STORE ----------------------
+
+def _group_key(values):
+    return tuple(int(v) if pd.notna(v) else 0 for v in values)
+
+
+class RecipeStore:
+    # Process-wide cache of the storage tables. Reads are served from memory; a
+    # table is reloaded only when the backend reports it changed underneath us
+    # (file mtime/size for CSV, data_version for SQLite). Row labels are stable:
+    # appends get fresh labels and deletes keep the rest, so the id and
+    # recipe_id indexes below can be patched instead of rebuilt.
+    def __init__(self, storage):
+        self.storage = storage
+        self._lock = threading.RLock()
+        self._tables = {}
+        self._signatures = {}
+        self._index = None
+        self._index_source = None
+        self._max_ids = {}
+        self._labels = {}
+        self._groups = {}
+        self._projections = {}
+        self._txn_depth = 0
+        self._touched = set()
+        self._media_refs = None
+        self._media_sources = {}
+        self._parsed = {}
+        self._parsed_source = None
+        self._ingredients = None
+        self._pantry = None
+        self._similar = None
+        self._similar_source = None   # table the index (plus _similar_changes) reflects
+        self._similar_changes = {}    # id -> fingerprint, None when deleted
+        self._similar_lock = threading.Lock()  # taken before _lock, never inside it
+        self._index_lock = threading.Lock()    # likewise
+        self._ingredients_lock = threading.Lock()  # likewise
+
+    def table(self, table, columns=None):
+        # `columns` reads just those columns when the full table isn't cached yet
+        with self._lock:
+            sig = self.storage.signature(table)
+            if columns is not None and self._signatures.get(table) != sig:
+                key = (table, tuple(columns))
+                cached = self._projections.get(key)
+                if cached is None or cached[0] != sig:
+                    cached = self._projections[key] = (sig, self.storage.load(table, columns=list(columns)))
+                return cached[1]
+            if table not in self._tables or self._signatures.get(table) != sig:
+                self._tables[table] = self.storage.load(table)
+                self._signatures[table] = sig
+                self._projections = {k: v for k, v in self._projections.items() if k[0] != table}
+            df = self._tables[table]
+            return df if columns is None else df[list(columns)]
+
+    def max_id(self, table):
+        with self._lock:
+            df = self.table(table)
+            cached = self._max_ids.get(table)
+            if cached is None or cached[0] is not df:
+                cached = (df, 0 if df.empty else int(df['id'].max()))
+                self._max_ids[table] = cached
+            return cached[1]
+
+    def _id_labels(self, table, df):
+        cached = self._labels.get(table)
+        if cached is None or cached[0] is not df:
+            cached = (df, {int(rid): label for rid, label in zip(df['id'], df.index)})
+            self._labels[table] = cached
+        return cached[1]
+
+    def _recipe_groups(self, table, df):
+        cached = self._groups.get(table)
+        if cached is None or cached[0] is not df:
+            groups = {}
+            order = GROUP_ORDER[table]
+            for label, rid, *keys in zip(df.index, df['recipe_id'], *(df[c] for c in order)):
+                groups.setdefault(int(rid), []).append((_group_key(keys), label))
+            for entries in groups.values():
+                entries.sort()
+            cached = (df, groups)
+            self._groups[table] = cached
+        return cached[1]
+
+    def row(self, table, row_id):
+        # O(1) primary-key lookup
+        with self._lock:
+            df = self.table(table)
+            label = self._id_labels(table, df).get(int(row_id))
+            return None if label is None else df.loc[label]
+
+    def group(self, table, recipe_id):
+        # rows of a media table that belong to one recipe, in GROUP_ORDER
+        with self._lock:
+            df = self.table(table)
+            entries = self._recipe_groups(table, df).get(int(recipe_id))
+            return df.loc[[label for _, label in entries]] if entries else df.iloc[0:0]
+
+    def media_refs(self):
+        # Counter of media file -> number of rows (images or videos) using it
+        with self._lock:
+            frames = {t: self.table(t) for t in MEDIA_COLUMNS}
+            if self._media_refs is None or any(self._media_sources.get(t) is not df for t, df in frames.items()):
+                refs = Counter()
+                for t, df in frames.items():
+                    refs.update(_media_key(p) for p in df[MEDIA_COLUMNS[t]] if isinstance(p, str) and p)
+                self._media_refs = refs
+                self._media_sources = frames
+            return self._media_refs
+
+    def reserve_ids(self, table, count=1):
+        with self._lock:
+            return self.storage.reserve_ids(table, count, floor=self.max_id(table) + 1)
+
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            self._txn_depth += 1
+            try:
+                with self.storage.transaction():
+                    yield
+            except Exception:
+                self.invalidate()
+                raise
+            finally:
+                self._txn_depth -= 1
+            if not self._txn_depth:
+                # staged rewrites land on commit; our caches already match them
+                for table in self._touched:
+                    if table in self._tables:
+                        self._signatures[table] = self.storage.signature(table)
+                self._touched.clear()
+
+    def _replace_table(self, table, df, added=None, removed=None):
+        # `added` (new or rewritten rows) and `removed` rows, both carrying their
+        # labels, let the indexes follow the change incrementally.
+        old = self._tables.get(table)
+        added = df.iloc[0:0] if added is None else added
+        removed = df.iloc[0:0] if removed is None else removed
+        cached = self._max_ids.get(table)
+        if cached is not None and cached[0] is old and removed.empty:
+            self._max_ids[table] = (df, max([cached[1]] + [int(i) for i in added['id']]))
+        cached = self._labels.get(table)
+        if cached is not None and cached[0] is old:
+            labels = cached[1]
+            for rid in removed['id']:
+                labels.pop(int(rid), None)
+            for rid, label in zip(added['id'], added.index):
+                labels[int(rid)] = label
+            self._labels[table] = (df, labels)
+        cached = self._groups.get(table)
+        if cached is not None and cached[0] is old:
+            groups = cached[1]
+            for rid, label in zip(removed['recipe_id'], removed.index):
+                entries = [e for e in groups.get(int(rid), ()) if e[1] != label]
+                if entries:
+                    groups[int(rid)] = entries
+                else:
+                    groups.pop(int(rid), None)
+            order = GROUP_ORDER[table]
+            for label, rid, *keys in zip(added.index, added['recipe_id'], *(added[c] for c in order)):
+                bisect.insort(groups.setdefault(int(rid), []), (_group_key(keys), label))
+            self._groups[table] = (df, groups)
+        column = MEDIA_COLUMNS.get(table)
+        if column and self._media_refs is not None and self._media_sources.get(table) is old:
+            refs = self._media_refs
+            for p in removed[column]:
+                if isinstance(p, str) and p:
+                    key = _media_key(p)
+                    refs[key] -= 1
+                    if refs[key] <= 0:
+                        del refs[key]
+            refs.update(_media_key(p) for p in added[column] if isinstance(p, str) and p)
+            self._media_sources[table] = df
+        if table == RECIPES and self._parsed_source is old:
+            for rid in removed['id']:
+                self._parsed.pop(int(rid), None)
+            self._parsed_source = df
+        if table == RECIPES and self._ingredients is not None and self._ingredients[0] is old:
+            frame = self._ingredients[1]
+            frame = frame[~frame['recipe_id'].isin([int(r) for r in removed['id']])]
+            new = ingredient_frame({int(rid): parse_recipe(ingredients, steps)
+                                    for rid, ingredients, steps in zip(added['id'], added['ingredients'], added['steps'])})
+            self._ingredients = (df, pd.concat([frame, new], ignore_index=True) if len(new) else frame)
+        if table == RECIPES and self._similar_source is not None and self._similar_source is old:
+            # only noted here; similar_index() applies them off the store lock
+            for rid in removed['id']:
+                self._similar_changes[int(rid)] = None
+            for rid, name, ingredients, steps in zip(added['id'], added['name'], added['ingredients'], added['steps']):
+                self._similar_changes[int(rid)] = recipe_fingerprint(name, ingredients, steps)
+            self._similar_source = df
+        if table == RECIPES and self._index is not None and self._index_source is old:
+            for rid in removed['id']:
+                self._index.remove(int(rid))
+            for rid, name, ingredients, category in zip(added['id'], added['name'], added['ingredients'], added['category']):
+                self._index.add(int(rid), name, ingredients, category)
+            self._index_source = df
+        self._tables[table] = df
+        self._signatures[table] = self.storage.signature(table)
+        if self._txn_depth:
+            self._touched.add(table)
+
+    def append(self, table, rows):
+        # Only the new rows are written, in the table's own column order.
+        rows = list(rows)
+        if not rows:
+            return
+        with self._lock:
+            df = self.table(table)
+            new = pd.DataFrame(rows).reindex(columns=list(df.columns))
+            if self.storage.append(table, new, self._signatures.get(table)):
+                start = int(df.index.max()) + 1 if len(df) else 0
+                new.index = range(start, start + len(new))
+                merged = new if df.empty else pd.concat([df, new])
+                self._replace_table(table, merged, added=new)
+            else:
+                self.invalidate(table)
+
+    def delete(self, table, column, values):
+        values = list(values)
+        with self._lock:
+            df = self.table(table)
+            mask = df[column].isin(values)
+            remaining = df[~mask]
+            if self.storage.delete(table, column, values, remaining, self._signatures.get(table)):
+                self._replace_table(table, remaining, removed=df[mask])
+            else:
+                self.invalidate(table)
+
+    def update(self, table, row_id, fields):
+        with self._lock:
+            old = self.table(table)
+            df = old.copy()
+            mask = df['id'] == row_id
+            _set_row_fields(df, mask, fields)
+            if self.storage.update(table, row_id, fields, df, self._signatures.get(table)):
+                self._replace_table(table, df, added=df[mask], removed=old[mask])
+            else:
+                self.invalidate(table)
+
+    def search_index(self):
+        # Built from a snapshot of the table off the store lock and swapped in
+        # only if the table is still that snapshot; once in, _replace_table
+        # keeps it current. Query it under the store lock (see search()).
+        with self._index_lock:
+            while True:
+                with self._lock:
+                    df = self.table(RECIPES)
+                    if self._index is not None and self._index_source is df:
+                        return self._index
+                index = SearchIndex.from_df(df)
+                with self._lock:
+                    if self.table(RECIPES) is df:
+                        self._index, self._index_source = index, df
+                        return index
+
+    def parsed(self, recipe_id):
+        # ParsedRecipe of one recipe, parsed on first use and kept until the row changes
+        with self._lock:
+            df = self.table(RECIPES)
+            if self._parsed_source is not df:
+                self._parsed, self._parsed_source = {}, df
+            recipe_id = int(recipe_id)
+            parsed = self._parsed.get(recipe_id)
+            if parsed is None:
+                row = self.row(RECIPES, recipe_id)
+                if row is None:
+                    return None
+                parsed = self._parsed[recipe_id] = parse_recipe(row['ingredients'], row['steps'])
+            return parsed
+
+    def ingredient_table(self):
+        # ingredient_frame() of the whole catalogue, patched as recipes change.
+        # Like search_index(), it is built from a snapshot off the store lock
+        # and kept only if the table is still that snapshot.
+        with self._ingredients_lock:
+            while True:
+                with self._lock:
+                    df = self.table(RECIPES)
+                    if self._ingredients is not None and self._ingredients[0] is df:
+                        return self._ingredients[1]
+                    cache = dict(self._parsed) if self._parsed_source is df else {}
+                parsed = {int(rid): cache.get(int(rid)) or parse_recipe(ingredients, steps)
+                          for rid, ingredients, steps in zip(df['id'], df['ingredients'], df['steps'])}
+                frame = ingredient_frame(parsed)
+                with self._lock:
+                    if self.table(RECIPES) is df:
+                        self._ingredients = (df, frame)
+                        if self._parsed_source is not df:
+                            self._parsed, self._parsed_source = {}, df
+                        for rid, recipe in parsed.items():
+                            self._parsed.setdefault(rid, recipe)
+                        return frame
+
+    def pantry_index(self):
+        # rebuilt (vectorized) whenever the ingredient table changes, also off
+        # the store lock
+        frame = self.ingredient_table()
+        with self._lock:
+            if self._pantry is not None and self._pantry[0] is frame:
+                return self._pantry[1]
+        pantry = PantryIndex(frame, PANTRY_STAPLES)
+        with self._lock:
+            if self._ingredients is not None and self._ingredients[1] is frame:
+                self._pantry = (frame, pantry)
+        return pantry
+
+    def similar_index(self):
+        # Loaded from its sidecar and synced with the table. The store lock is
+        # held only to snapshot the table and the changes _replace_table noted,
+        # so a (re)build never blocks reads on the Tk thread.
+        with self._similar_lock:
+            with self._lock:
+                df = self.table(RECIPES)
+                known = self._similar is not None and self._similar_source is df
+                changes, self._similar_changes = self._similar_changes, {}
+                self._similar_source = df
+                cache = self._parsed if self._parsed_source is df else {}
+            if known and not changes:
+                return self._similar
+            path = self.storage.sidecar('similar.json')
+            if self._similar is None:
+                self._similar = SimilarityIndex.load(path) if path else SimilarityIndex()
+            if known:
+                fingerprints = dict(self._similar.fingerprints)
+                for rid, fp in changes.items():
+                    if fp is None:
+                        fingerprints.pop(rid, None)
+                    else:
+                        fingerprints[rid] = fp
+            else:
+                fingerprints = {int(rid): recipe_fingerprint(name, ingredients, steps) for rid, name, ingredients, steps
+                                in zip(df['id'], df['name'], df['ingredients'], df['steps'])}
+            rows = {int(rid): (name, ingredients, steps) for rid, name, ingredients, steps
+                    in zip(df['id'], df['name'], df['ingredients'], df['steps'])}
+
+            def terms_for(rid):
+                name, ingredients, steps = rows[rid]
+                return recipe_terms(name, cache.get(rid) or parse_recipe(ingredients, steps))
+
+            if self._similar.sync(fingerprints, terms_for) and path:
+                self._similar.persist(path)
+            return self._similar
+
+    def search(self, query, category=None):
+        with self._lock:
+            ranked = self.storage.search(query, category=category)
+        if ranked:
+            return ranked
+        # no native search, or nothing matched exactly: the index also
+        # tolerates typos
+        index = self.search_index()
+        with self._lock:
+            return index.search(query, category=category)
+
+    def invalidate(self, table=None):
+        with self._lock:
+            if table is None:
+                self._tables.clear()
+                self._signatures.clear()
+                self._projections.clear()
+            else:
+                self._tables.pop(table, None)
+                self._signatures.pop(table, None)
+                self._projections = {k: v for k, v in self._projections.items() if k[0] != table}
+
+
+@contextmanager
+def _locked_file(lock_path):
+    # Exclusive inter-process lock on a sidecar file, so several app instances
+    # can share one data folder.
+    with open(lock_path, 'a+b') as f:
+        if os.name == 'nt':
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class IdSequence:
+    # Persisted "next id" counter for one table, kept in `<csv>.seq` and only
+    # advanced while holding `<csv>.lock`.
+    def __init__(self, csv_path):
+        self.seq_path = csv_path + '.seq'
+        self.lock_path = csv_path + '.lock'
+
+    def _read(self):
+        try:
+            with open(self.seq_path, 'r', encoding='utf-8') as f:
+                return int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def _write(self, value):
+        tmp = self.seq_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(str(value))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.seq_path)
+
+    def reserve(self, count=1, floor=1):
+        # `floor` is max(id)+1 of the table as we know it, which covers a
+        # missing or stale sidecar.
+        with _locked_file(self.lock_path):
+            start = max(self._read(), floor)
+            self._write(start + count)
+        return range(start, start + count)
+
+
+def _ends_with_newline(path):
+    with open(path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b'\n'
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = RecipeStore(make_storage())
+    return _store
+
+
+# ---------------------- DATA LAYER ----------------------
+
+# The bundled recipes live in DEFAULT_RECIPES_ASSET, gzipped JSON of the form
+# {"version": N, "recipes": [...]}. Each recipe records the asset version that
+# added or last changed it, so an existing store only needs what is newer than
+# the version it was seeded with. Edit them with --export-defaults, then
+# rebuild the asset with --build-defaults, which validates every recipe.
+# build_default_recipes() writes "version" first, so startup can read it from
+# the first decompressed bytes and skip decoding the recipes when the store is
+# already up to date.
+
+CATEGORIES = ["VEGETARIAN", "EGG-ETARIAN", "NON-VEGETARIAN"]
+
+_default_recipes = None
+_DEFAULTS_HEADER_RE = re.compile(rb'\{"version":(\d+),')
+
+
+def load_default_recipes(path=None):
+    # (version, recipes) of the bundled asset, read once per process
+    global _default_recipes
+    if path is not None:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+        return data['version'], data['recipes']
+    if _default_recipes is None:
+        _default_recipes = load_default_recipes(DEFAULT_RECIPES_ASSET)
+    return _default_recipes
+
+
+def default_recipes_version(path=None):
+    # version of the asset without decoding its recipes
+    with gzip.open(path or DEFAULT_RECIPES_ASSET, 'rb') as f:
+        match = _DEFAULTS_HEADER_RE.match(f.read(32))
+    if match is None:
+        return load_default_recipes(path)[0]
+    return int(match.group(1))
+
+
+def validate_default_recipes(recipes):
+    # one message per problem that would put a malformed row into recipes.csv
+    problems = []
+    fields = set(TABLE_COLUMNS[RECIPES]) | {'version'}
+    seen = set()
+    for i, recipe in enumerate(recipes):
+        label = f"recipe #{i + 1} (id {recipe.get('id')!r})"
+        missing, unknown = fields - set(recipe), set(recipe) - fields
+        if missing:
+            problems.append(f"{label}: missing {', '.join(sorted(missing))}")
+        if unknown:
+            problems.append(f"{label}: unknown field {', '.join(sorted(unknown))}")
+        rid = recipe.get('id')
+        if not isinstance(rid, int) or rid < 1:
+            problems.append(f"{label}: id must be a positive integer")
+        elif rid in seen:
+            problems.append(f"{label}: duplicate id")
+        seen.add(rid)
+        for field in ('name', 'ingredients', 'steps'):
+            if field in recipe and not (isinstance(recipe[field], str) and recipe[field].strip()):
+                problems.append(f"{label}: {field} must be non-empty text")
+        if 'category' in recipe and recipe['category'] not in CATEGORIES:
+            problems.append(f"{label}: unknown category {recipe['category']!r}")
+        if 'video_path' in recipe and not isinstance(recipe['video_path'], str):
+            problems.append(f"{label}: video_path must be text")
+        if 'is_default' in recipe and recipe['is_default'] != 1:
+            problems.append(f"{label}: is_default must be 1")
+        if 'version' in recipe and not (isinstance(recipe['version'], int) and recipe['version'] >= 1):
+            problems.append(f"{label}: version must be a positive integer")
+    return problems
+
+
+def build_default_recipes(recipes, path=None):
+    # Writes the asset from `recipes` (dicts with the recipes columns). Recipes
+    # that are new or differ from the current asset are stamped with the next
+    # version; raises ValueError listing every schema problem.
+    path = path or DEFAULT_RECIPES_ASSET
+    version, previous = 0, {}
+    if os.path.exists(path):
+        version, old = load_default_recipes(path)
+        previous = {r['id']: r for r in old}
+    stamped = []
+    for recipe in recipes:
+        recipe = dict(recipe)
+        old = previous.get(recipe.get('id'))
+        unchanged = old is not None and {k: v for k, v in old.items() if k != 'version'} == \
+            {k: v for k, v in recipe.items() if k != 'version'}
+        recipe['version'] = old['version'] if unchanged else None
+        stamped.append(recipe)
+    if any(r['version'] is None for r in stamped):
+        version += 1
+        for recipe in stamped:
+            if recipe['version'] is None:
+                recipe['version'] = version
+    problems = validate_default_recipes(stamped)
+    if problems:
+        raise ValueError("Invalid default recipes:\n" + "\n".join(problems))
+    stamped.sort(key=lambda r: r['id'])
+    data = json.dumps({'version': version, 'recipes': stamped}, ensure_ascii=False, separators=(',', ':'))
+    with open(path + '.tmp', 'wb') as f:
+        f.write(gzip.compress(data.encode('utf-8'), mtime=0))
+    os.replace(path + '.tmp', path)
+    return version
+
+
+def _same_value(current, value):
+    if pd.isna(current):
+        return value == ''
+    return current == value
+
+
+def seed_default_recipes():
+    # Brings the store up to the bundled asset: a new store gets every default
+    # recipe, an existing one only those added or changed since it was seeded.
+    # Rows of user recipes are never touched; a new default whose id a user
+    # recipe already has gets a fresh id instead.
+    store = get_store()
+    seeded = store.storage.defaults_version()
+    if seeded is not None and seeded >= default_recipes_version():
+        return
+    version, recipes = load_default_recipes()
+    if seeded is None:
+        # stores created before the asset existed hold its first version
+        seeded = 1 if len(store.table(RECIPES, ['id'])) else 0
+    new_rows, updates = [], []
+    for recipe in recipes:
+        if recipe['version'] <= seeded:
+            continue
+        row = {c: recipe[c] for c in TABLE_COLUMNS[RECIPES]}
+        current = store.row(RECIPES, row['id'])
+        if current is None:
+            new_rows.append(row)
+        elif current.get('is_default') != 0:
+            changed = {c: v for c, v in row.items() if c != 'id' and not _same_value(current.get(c), v)}
+            if changed:
+                updates.append((row['id'], changed))
+        else:
+            new_rows.append(dict(row, id=None))
+    with store.transaction():
+        clashing = [r for r in new_rows if r['id'] is None]
+        for row, new_id in zip(clashing, store.reserve_ids(RECIPES, len(clashing))):
+            row['id'] = new_id
+        if new_rows:
+            store.append(RECIPES, new_rows)
+            store.reserve_ids(RECIPES, 0)  # move the id sequence past the seeded ids
+        for row_id, fields in updates:
+            store.update(RECIPES, row_id, fields)
+    store.storage.set_defaults_version(version)
 
-# ---------------------- DATA LAYER (pandas CSV) ----------------------
 
 def ensure_csv_files():
-    # recipes
-    if not os.path.exists(RECIPES_CSV):
-        df = pd.DataFrame(DEFAULT_RECIPES)
-        df.to_csv(RECIPES_CSV, index=False)
-    # recipe images
-    if not os.path.exists(RECIPE_IMAGES_CSV):
-        df = pd.DataFrame(columns=['id','recipe_id','file_path','caption'])
-        df.to_csv(RECIPE_IMAGES_CSV, index=False)
-    # step images
-    if not os.path.exists(STEP_IMAGES_CSV):
-        df = pd.DataFrame(columns=['id','recipe_id','step_index','file_path'])
-        df.to_csv(STEP_IMAGES_CSV, index=False)
-
-
-def load_recipes_df(category=None, search_term=None):
-    df = pd.read_csv(RECIPES_CSV)
+    # creates the tables of the configured backend and seeds the default recipes
+    os.makedirs(MEDIA_FOLDER, exist_ok=True)
+    get_store().storage.ensure()
+    seed_default_recipes()
+
+
+def load_recipes_df(category=None, search_term=None, columns=None):
+    # `columns` limits a plain category listing to the columns it needs
+    store = get_store()
+    if columns is not None and not search_term:
+        df = store.table(RECIPES, columns=list(dict.fromkeys(['id', 'name', 'category'] + list(columns))))
+        if category:
+            df = df[df['category'] == category]
+        return df.sort_values('name')
+    df = store.table(RECIPES)
+    if search_term:
+        ranked = store.search(search_term, category=category)
+        order = pd.Series(range(len(ranked)), index=ranked, dtype='int64')
+        df = df[df['id'].isin(order.index)]
+        return df.iloc[order.loc[df['id']].argsort()]
     if category:
         df = df[df['category'] == category]
-    if search_term:
-        mask = df['name'].str.contains(search_term, case=False, na=False) | df['ingredients'].str.contains(search_term, case=False, na=False)
-        df = df[mask]
     df = df.sort_values('name')
     return df
 
 
+def load_recipe(recipe_id):
+    return get_store().row(RECIPES, recipe_id)
+
+
+def load_parsed_recipe(recipe_id):
+    # structured ingredients/steps of one recipe, parsed once and cached by the store
+    return get_store().parsed(recipe_id)
+
+
+def scale_factors(servings, target):
+    # target / servings elementwise; recipes without a stated yield, and NaN
+    # targets ("as written"), keep factor 1
+    servings = np.asarray(servings, dtype=float)
+    target = np.broadcast_to(np.asarray(target, dtype=float), servings.shape)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where((servings > 0) & (target > 0), target / servings, 1.0)
+
+
+def scale_ingredients(targets, frame=None):
+    # Ingredient rows rescaled to a serving count: `targets` is {recipe_id:
+    # servings} for a selection, or one number for every recipe in `frame`
+    # (default: the whole catalogue). Adds 'factor' and 'scaled' columns;
+    # lines without a quantity keep NaN.
+    frame = get_store().ingredient_table() if frame is None else frame
+    if isinstance(targets, dict):
+        wanted = pd.Series(targets, dtype=float)
+        frame = frame[frame['recipe_id'].isin(wanted.index)]
+        target = wanted.reindex(frame['recipe_id']).to_numpy()
+    else:
+        target = float(targets)
+    factor = scale_factors(frame['servings'].to_numpy(), target)
+    return frame.assign(factor=factor, scaled=frame['quantity'].to_numpy() * factor)
+
+
+# unit -> (dimension, size in the dimension's base unit: tsp, g or the unit itself)
+UNIT_DIMENSIONS = {'tsp': ('volume', 1.0), 'tbsp': ('volume', 3.0), 'cup': ('volume', 48.0),
+                   'ml': ('volume', 1 / 4.929), 'l': ('volume', 1000 / 4.929),
+                   'g': ('mass', 1.0), 'kg': ('mass', 1000.0),
+                   'inch': ('inch', 1.0), 'pinch': ('pinch', 1.0), 'slice': ('slice', 1.0)}
+SHOPPING_COLUMNS = ['ingredient', 'quantity', 'unit', 'as_needed', 'recipes']
+PLURAL_UNITS = {'cup': 'cups', 'slice': 'slices', 'pinch': 'pinches', 'inch': 'inches'}
+
+
+def build_shopping_list(selection):
+    # Consolidated shopping list for {recipe_id: servings}: the selected
+    # recipes' ingredient rows are scaled, converted to a base unit per
+    # dimension (tsp, g, count, ...), summed per canonical ingredient in one
+    # group-by and shown in the largest sensible unit. Lines without a
+    # quantity ("Salt to taste") set 'as_needed'.
+    frame = scale_ingredients(selection)
+    frame = frame[frame['canonical'].str.len() > 0].explode('canonical')
+    if frame.empty:
+        return pd.DataFrame(columns=SHOPPING_COLUMNS)
+    units = frame['unit']
+    dimension = units.map({u: d for u, (d, _) in UNIT_DIMENSIONS.items()}).fillna('count')
+    size = units.map({u: s for u, (_, s) in UNIT_DIMENSIONS.items()}).fillna(1.0).astype(float)
+    frame = frame.assign(dimension=dimension, base=frame['scaled'] * size, as_needed=frame['scaled'].isna())
+    grouped = frame.groupby(['canonical', 'dimension'], sort=True).agg(
+        base=('base', 'sum'), counted=('base', 'count'), as_needed=('as_needed', 'any'),
+        recipes=('recipe_id', 'nunique')).reset_index()
+    # an unquantified "as needed" group folds into a quantified one of the same ingredient
+    by_name = grouped.groupby('canonical')
+    quantified = by_name['counted'].transform('sum').to_numpy() > 0
+    as_needed = by_name['as_needed'].transform('any')
+    recipes = by_name['recipes'].transform('max')
+    keep = (grouped['counted'].to_numpy() > 0) | ~quantified
+    base = np.where(grouped['counted'].to_numpy() > 0, grouped['base'].to_numpy(), np.nan)
+    dim = grouped['dimension'].to_numpy()
+    conditions = [(dim == 'volume') & (base >= 12), (dim == 'volume') & (base >= 3), dim == 'volume',
+                  (dim == 'mass') & (base >= 1000), dim == 'mass']
+    unit = np.select(conditions, ['cup', 'tbsp', 'tsp', 'kg', 'g'], default=dim).astype(object)
+    unit[dim == 'count'] = None
+    divisor = np.select(conditions, [48.0, 3.0, 1.0, 1000.0, 1.0], default=1.0)
+    result = pd.DataFrame({'ingredient': grouped['canonical'], 'quantity': base / divisor, 'unit': unit,
+                           'as_needed': as_needed, 'recipes': recipes})
+    return result[keep].reset_index(drop=True)[SHOPPING_COLUMNS]
+
+
+def format_shopping_list(df):
+    lines = []
+    for ingredient, quantity, unit, as_needed in zip(df['ingredient'], df['quantity'], df['unit'], df['as_needed']):
+        parts = []
+        if pd.notna(quantity):
+            amount = format_quantity(quantity, unit)
+            if isinstance(unit, str):
+                amount += " " + (PLURAL_UNITS.get(unit, unit) if quantity > 1 else unit)
+            parts.append(amount)
+        if as_needed:
+            parts.append("as needed")
+        lines.append(f"{ingredient}: {' + '.join(parts)}")
+    return "\n".join(lines)
+
+
+def match_pantry(items, max_missing=2, category=None):
+    # "What can I cook": recipes ranked by how much of them `items` covers,
+    # fully makeable first, then those missing up to `max_missing`
+    # ingredients. PANTRY_STAPLES are assumed on hand. Returns LIST_COLUMNS
+    # plus have/need/missing counts and the names of the missing ingredients.
+    store = get_store()
+    items = [i.strip() for i in items if i and i.strip()]
+    index = store.pantry_index()
+    ids, have, need = index.match(items)
+    missing = need - have
+    keep = (missing <= max_missing) & (have > 0)
+    found = pd.DataFrame({'id': ids[keep], 'have': have[keep], 'need': need[keep], 'missing': missing[keep]})
+    recipes = store.table(RECIPES, LIST_COLUMNS)
+    if category:
+        recipes = recipes[recipes['category'] == category]
+    found = recipes.merge(found, on='id')
+    found['coverage'] = found['have'] / found['need']
+    found = found.sort_values(['missing', 'coverage', 'name'], ascending=[True, False, True], kind='stable')
+    found['missing_items'] = [index.missing(rid, items) if n else [] for rid, n in zip(found['id'], found['missing'])]
+    return found.reset_index(drop=True)
+
+
+def load_similar_recipes(recipe_id):
+    # precomputed neighbours of one recipe as (id, name) pairs, most similar first
+    store = get_store()
+    found = []
+    for rid in store.similar_index().similar(recipe_id):
+        row = store.row(RECIPES, rid)
+        if row is not None:
+            found.append((rid, row['name']))
+    return found
+
+
 def load_recipe_images(recipe_id):
-    df = pd.read_csv(RECIPE_IMAGES_CSV)
-    return df[df['recipe_id'] == recipe_id]
+    return get_store().group(RECIPE_IMAGES, recipe_id)
 
 
 def load_step_images(recipe_id):
-    df = pd.read_csv(STEP_IMAGES_CSV)
-    return df[df['recipe_id'] == recipe_id]
+    # ordered by step_index
+    return get_store().group(STEP_IMAGES, recipe_id)
 
 
 def save_recipe(recipe):
-    df = pd.read_csv(RECIPES_CSV)
-    df = pd.concat([df, pd.DataFrame([recipe])], ignore_index=True)
-    df.to_csv(RECIPES_CSV, index=False)
+    get_store().append(RECIPES, [recipe])
 
 
 def save_recipe_image(entry):
-    df = pd.read_csv(RECIPE_IMAGES_CSV)
-    df = pd.concat([df, pd.DataFrame([entry])], ignore_index=True)
-    df.to_csv(RECIPE_IMAGES_CSV, index=False)
+    get_store().append(RECIPE_IMAGES, [entry])
 
 
 def save_step_image(entry):
-    df = pd.read_csv(STEP_IMAGES_CSV)
-    df = pd.concat([df, pd.DataFrame([entry])], ignore_index=True)
-    df.to_csv(STEP_IMAGES_CSV, index=False)
+    get_store().append(STEP_IMAGES, [entry])
+
+
+def save_recipe_bundle(recipe, recipe_images=(), step_images=()):
+    # Commit a recipe and all of its image rows with one append per table.
+    # Image rows without an 'id' get consecutive ids.
+    store = get_store()
+    for table, rows in ((RECIPE_IMAGES, recipe_images), (STEP_IMAGES, step_images)):
+        missing = [r for r in rows if 'id' not in r]
+        for row, new_id in zip(missing, store.reserve_ids(table, len(missing))):
+            row['id'] = new_id
+    with store.transaction():
+        store.append(RECIPES, [recipe])
+        store.append(RECIPE_IMAGES, recipe_images)
+        store.append(STEP_IMAGES, step_images)
+
+
+def update_row(table, row_id, fields):
+    # set some columns of one row; the CSV backend logs this instead of rewriting the table
+    get_store().update(table, row_id, fields)
+
+
+def update_recipe_video(recipe_id, video_path):
+    update_row(RECIPES, recipe_id, {'video_path': video_path})
 
 
 def delete_recipe_by_id(recipe_id):
-    df = pd.read_csv(RECIPES_CSV)
-    row = df[df['id'] == recipe_id]
-    if row.empty:
+    store = get_store()
+    row = store.row(RECIPES, recipe_id)
+    if row is None:
         return False, 'Not found'
-    if int(row.iloc[0]['is_default']) == 1:
+    if int(row['is_default']) == 1:
         return False, 'Default recipes cannot be deleted.'
-    df = df[df['id'] != recipe_id]
-    df.to_csv(RECIPES_CSV, index=False)
-    # remove media entries (and files) for that recipe
-    img_df = pd.read_csv(RECIPE_IMAGES_CSV)
-    rem = img_df[img_df['recipe_id'] == recipe_id]
-    for p in rem['file_path'].tolist():
+    media = (store.group(RECIPE_IMAGES, recipe_id)['file_path'].tolist()
+             + store.group(STEP_IMAGES, recipe_id)['file_path'].tolist())
+    with store.transaction():
+        store.delete(RECIPES, 'id', [recipe_id])
+        store.delete(RECIPE_IMAGES, 'recipe_id', [recipe_id])
+        store.delete(STEP_IMAGES, 'recipe_id', [recipe_id])
+    # media files are removed later, off the UI thread
+    get_media_gc().schedule(media)
+    return True, 'Deleted'
+
+
+# ---------------------- UTILITIES ----------------------
+
+_worker_pool = None
+_worker_pool_lock = threading.Lock()
+
+
+def get_worker_pool():
+    global _worker_pool
+    if _worker_pool is None:
+        with _worker_pool_lock:
+            if _worker_pool is None:
+                _worker_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="kitchen")
+    return _worker_pool
+
+
+def warm_up():
+    # Run on a worker thread once the home window is up: pays for the heavy
+    # imports and the first table load while the user is still on the home page.
+    pd.DataFrame
+    Image.open
+    ImageTk.PhotoImage
+    get_store().table(RECIPES, LIST_COLUMNS)
+    get_store().search_index()
+
+
+def next_id(table):
+    # allocates the id: the table's sequence is advanced past it
+    return get_store().reserve_ids(table, 1)[0]
+
+
+def call_in_background(widget, callback, func, *args, pool=None):
+    # Run func(*args) on the worker pool (or `pool`) and pass (result, error)
+    # to callback on the Tk thread once it finishes.
+    future = (pool or get_worker_pool()).submit(func, *args)
+
+    def poll():
+        if not widget.winfo_exists():
+            return
+        if not future.done():
+            widget.after(15, poll)
+            return
+        error = future.exception()
+        callback(None if error else future.result(), error)
+
+    poll()
+    return future
+
+
+def _media_key(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+class MediaGarbageCollector:
+    # Deletes media files on a background thread. Files of deleted recipes are
+    # queued in MEDIA_FOLDER/.gc_queue so a crash doesn't forget them, and a
+    # sweep reclaims orphans under MEDIA_FOLDER that no table row references.
+    # Only files inside MEDIA_FOLDER that nothing references are ever removed,
+    # and only once they are older than ORPHAN_GRACE_SECONDS: a dedup hit in
+    # store_media_file() refreshes the mtime before the new recipe's rows are
+    # committed, so a young unreferenced file may be about to be used again.
+    def __init__(self, folder=MEDIA_FOLDER):
+        self.folder = folder
+        self.queue_path = os.path.join(folder, '.gc_queue')
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def schedule(self, paths):
+        paths = [p for p in paths if isinstance(p, str) and p]
+        if not paths:
+            return
+        with self._lock:
+            os.makedirs(self.folder, exist_ok=True)
+            with open(self.queue_path, 'a', encoding='utf-8') as f:
+                f.write(''.join(p + '\n' for p in paths))
+                f.flush()
+                os.fsync(f.fileno())
+        self._wake.set()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="media-gc", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        self._wake.wait(MEDIA_GC_DELAY_SECONDS)
+        swept = False
+        while True:
+            self._wake.clear()
+            deferred = 0
+            try:
+                deferred = self.collect()
+                if not swept:
+                    self.sweep_orphans()
+                    swept = True
+            except Exception as e:
+                print("Media cleanup failed:", e)
+            # files still in their grace period are retried once it is over
+            self._wake.wait(ORPHAN_GRACE_SECONDS if deferred else None)
+
+    def referenced(self):
+        return set(get_store().media_refs())
+
+    def _removable(self, path, refs):
+        root = _media_key(self.folder) + os.sep
+        key = _media_key(path)
+        return key.startswith(root) and key not in refs
+
+    def _young(self, path, cutoff):
         try:
-            if os.path.exists(p):
-                os.remove(p)
-        except Exception:
-            pass
-    img_df = img_df[img_df['recipe_id'] != recipe_id]
-    img_df.to_csv(RECIPE_IMAGES_CSV, index=False)
-    step_df = pd.read_csv(STEP_IMAGES_CSV)
-    rem = step_df[step_df['recipe_id'] == recipe_id]
-    for p in rem['file_path'].tolist():
+            st = os.stat(path)
+        except OSError:
+            return False
+        # copy2 keeps the source mtime, so ctime is what dates the copy
+        return max(st.st_mtime, st.st_ctime) >= cutoff
+
+    def _remove(self, path):
         try:
-            if os.path.exists(p):
-                os.remove(p)
-        except Exception:
+            os.remove(path)
+        except FileNotFoundError:
             pass
-    step_df = step_df[step_df['recipe_id'] != recipe_id]
-    step_df.to_csv(STEP_IMAGES_CSV, index=False)
-    return True, 'Deleted'
+        except OSError:
+            return False
+        return True
 
-# ---------------------- UTILITIES ----------------------
+    def collect(self):
+        # returns how many queued files were kept back (too young or failed)
+        with self._lock:
+            try:
+                with open(self.queue_path, 'r', encoding='utf-8') as f:
+                    queued = f.read().splitlines()
+            except FileNotFoundError:
+                return 0
+        refs = self.referenced()
+        cutoff = time.time() - ORPHAN_GRACE_SECONDS
+        kept = [p for p in dict.fromkeys(queued) if self._removable(p, refs)
+                and (self._young(p, cutoff) or not self._remove(p))]
+        with self._lock:
+            # keep those, plus anything queued while we were working
+            with open(self.queue_path, 'r', encoding='utf-8') as f:
+                later = f.read().splitlines()[len(queued):]
+            with open(self.queue_path, 'w', encoding='utf-8') as f:
+                f.write(''.join(p + '\n' for p in kept + later))
+        return len(kept)
+
+    def sweep_orphans(self):
+        refs = self.referenced()
+        cutoff = time.time() - ORPHAN_GRACE_SECONDS
+        for dirpath, dirnames, filenames in os.walk(self.folder):
+            dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                if name.startswith('.') or not self._removable(path, refs):
+                    continue
+                if os.path.exists(path) and not self._young(path, cutoff):
+                    self._remove(path)
+
+
+_media_gc = None
+
+
+def get_media_gc():
+    global _media_gc
+    if _media_gc is None:
+        _media_gc = MediaGarbageCollector()
+    return _media_gc
+
+
+class IngestCancelled(Exception):
+    pass
+
+
+def _check_cancel(cancel):
+    if cancel is not None and cancel.is_set():
+        raise IngestCancelled()
+
+
+def file_digest(path, chunk_size=1 << 20, cancel=None, progress=None):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            _check_cancel(cancel)
+            h.update(chunk)
+            if progress:
+                progress(len(chunk))
+    return h.hexdigest()
+
+
+def _copy_steps(infd, outfd, chunk_size):
+    # Yields the bytes copied per step. Uses the kernel's zero-copy paths
+    # (copy_file_range, then sendfile) and falls back to read/write when they
+    # are missing or fail. A method can fail midway, so both offsets are
+    # rewound to what was copied so far before the next one carries on. Some
+    # filesystems answer 0 instead of an error when they can't do a zero-copy
+    # call, so 0 before the first byte means "try the next method", not EOF.
+    zero_copy = []
+    if hasattr(os, 'copy_file_range'):
+        zero_copy.append(lambda: os.copy_file_range(infd, outfd, chunk_size))
+    if hasattr(os, 'sendfile') and sys.platform.startswith('linux'):
+        zero_copy.append(lambda: os.sendfile(outfd, infd, None, chunk_size))
+    copied = 0
+    for step in zero_copy:
+        try:
+            n = step()
+            if not n and not copied:
+                continue
+            while n:
+                copied += n
+                yield n
+                n = step()
+            return
+        except OSError:
+            os.lseek(infd, copied, os.SEEK_SET)
+            os.lseek(outfd, copied, os.SEEK_SET)
+    while True:
+        data = os.read(infd, chunk_size)
+        if not data:
+            return
+        view = memoryview(data)
+        while view:
+            view = view[os.write(outfd, view):]
+        yield len(data)
+
+
+def copy_media_file(src, dest, cancel=None, progress=None):
+    with open(src, 'rb', buffering=0) as fsrc, open(dest, 'wb', buffering=0) as fdst:
+        for n in _copy_steps(fsrc.fileno(), fdst.fileno(), MEDIA_COPY_CHUNK):
+            _check_cancel(cancel)
+            if progress:
+                progress(n)
+    shutil.copystat(src, dest)
 
-def next_id(csv_path):
-    if not os.path.exists(csv_path):
-        return 1
-    df = pd.read_csv(csv_path)
-    if df.empty:
-        return 1
-    return int(df['id'].max()) + 1
 
+def media_path_for(digest, ext):
+    # content-addressed layout: media/ab/cd/abcd....ext
+    return os.path.join(MEDIA_FOLDER, digest[:2], digest[2:4], digest + ext.lower())
 
-def store_media_file(src_path):
+
+def store_media_file(src_path, cancel=None, progress=None):
+    # Files are stored once per content: re-adding a file we already have is
+    # just a hash check. Rows referencing the same file share it and the media
+    # GC only removes it once the last reference is gone.
+    # progress(n) is called as the file is hashed and again as it is copied.
     if not src_path or not os.path.exists(src_path):
         return None
-    ext = os.path.splitext(src_path)[1]
-    new_name = f"{uuid.uuid4().hex}{ext}"
-    dest = os.path.join(MEDIA_FOLDER, new_name)
-    shutil.copy2(src_path, dest)
+    dest = media_path_for(file_digest(src_path, cancel=cancel, progress=progress), os.path.splitext(src_path)[1])
+    if not os.path.exists(dest):
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        tmp = f"{dest}.{uuid.uuid4().hex}.part"
+        try:
+            copy_media_file(src_path, tmp, cancel, progress)
+            # dedup trusts any file already at dest, so a short copy would stick
+            if os.path.getsize(tmp) != os.path.getsize(src_path):
+                raise OSError(f"Incomplete copy of {src_path}")
+            os.replace(tmp, dest)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+    else:
+        # refresh the mtime so the orphan sweep's grace period covers the new reference
+        os.utime(dest)
+        if progress:
+            progress(os.path.getsize(src_path))
     return dest
 
 
+_media_pool = None
+
+
+def get_media_pool():
+    # separate from the worker pool so long copies never hold up searches
+    global _media_pool
+    if _media_pool is None:
+        with _worker_pool_lock:
+            if _media_pool is None:
+                _media_pool = ThreadPoolExecutor(max_workers=MEDIA_COPY_WORKERS, thread_name_prefix="kitchen-media")
+    return _media_pool
+
+
+class MediaIngest:
+    # Copies a batch of files into MEDIA_FOLDER on the media pool. The Tk side
+    # polls done()/fraction(); results() maps each source to its stored path
+    # once every copy succeeded. Files stored by a failed or cancelled batch
+    # stay unreferenced and are reclaimed by the media GC's orphan sweep.
+    def __init__(self, sources):
+        self.sources = list(dict.fromkeys(s for s in sources if s))
+        self.cancel_event = threading.Event()
+        self._lock = threading.Lock()
+        self._done_bytes = 0
+        self.total_bytes = 0
+        for src in self.sources:
+            try:
+                self.total_bytes += 2 * os.path.getsize(src)  # hashed once, copied once
+            except OSError:
+                pass
+        self.futures = {src: get_media_pool().submit(store_media_file, src, self.cancel_event, self._progress)
+                        for src in self.sources}
+
+    def _progress(self, n):
+        with self._lock:
+            self._done_bytes += n
+
+    def fraction(self):
+        with self._lock:
+            done = self._done_bytes
+        return min(1.0, done / self.total_bytes) if self.total_bytes else 1.0
+
+    def cancel(self):
+        self.cancel_event.set()
+        for future in self.futures.values():
+            future.cancel()
+
+    def done(self):
+        return all(f.done() for f in self.futures.values())
+
+    def error(self):
+        if self.cancel_event.is_set():
+            return IngestCancelled()
+        for future in self.futures.values():
+            if future.cancelled():
+                return IngestCancelled()
+            if future.exception() is not None:
+                return future.exception()
+        return None
+
+    def results(self):
+        return {src: f.result() for src, f in self.futures.items()}
+
+
 def load_image(path, size=None):
     if not path or not os.path.exists(path):
         return None
@@ -811,24 +2702,448 @@ def load_image(path, size=None):
         except Exception:
             return None
 
+
+_DIGEST_NAME_RE = re.compile(r'[0-9a-f]{64}')
+
+
+class ThumbnailCache:
+    # Scaled previews: an in-memory LRU of PhotoImages in front of pre-scaled
+    # PNGs under THUMBNAIL_FOLDER, which is pruned back to disk_bytes by
+    # last use (a disk hit refreshes the PNG's mtime).
+    def __init__(self, folder=THUMBNAIL_FOLDER, capacity=THUMBNAIL_CACHE_SIZE, disk_bytes=THUMBNAIL_DISK_BYTES):
+        self.folder = folder
+        self.capacity = capacity
+        self.disk_bytes = disk_bytes
+        self._photos = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _key(self, path, size):
+        # Stored media is named by its SHA-256, so that name is the key: dedup
+        # hits refresh the file's mtime and must not invalidate its thumbnails.
+        # Any other file is keyed by path, byte size and mtime.
+        name = os.path.splitext(os.path.basename(path))[0]
+        if _DIGEST_NAME_RE.fullmatch(name):
+            return (name, tuple(size))
+        st = os.stat(path)
+        return (os.path.abspath(path), st.st_size, st.st_mtime_ns, tuple(size))
+
+    def _disk_path(self, key):
+        return os.path.join(self.folder, hashlib.sha1(repr(key).encode('utf-8')).hexdigest() + '.png')
+
+    def scaled_image(self, path, size):
+        # PIL image scaled to `size`, from the disk cache when possible.
+        # Doesn't touch Tk, so it is safe to call from worker threads.
+        disk_path = self._disk_path(self._key(path, size))
+        if os.path.exists(disk_path):
+            try:
+                img = Image.open(disk_path)
+                img.load()
+                os.utime(disk_path)
+                return img
+            except Exception:
+                pass
+        img = Image.open(path)
+        # JPEG: let the decoder scale down by 1/2..1/8 instead of decoding full size
+        img.draft('RGB', size)
+        if img.mode not in ('RGB', 'RGBA'):
+            img = img.convert('RGBA' if 'transparency' in img.info or img.mode in ('LA', 'PA') else 'RGB')
+        factor = min(img.width // size[0], img.height // size[1])
+        if factor > 1:
+            img = img.reduce(factor)
+        img = img.resize(size, Image.LANCZOS)
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            tmp = f"{disk_path}.{uuid.uuid4().hex}.tmp"
+            img.save(tmp, 'PNG')
+            os.replace(tmp, disk_path)
+        except OSError:
+            pass
+        with self._lock:
+            self._writes += 1
+            due = self._writes % 32 == 1
+        if due:
+            self.prune()
+        return img
+
+    def prune(self):
+        # drop the least recently used PNGs until the folder fits disk_bytes
+        try:
+            names = os.listdir(self.folder)
+        except OSError:
+            return
+        entries = []
+        for name in names:
+            try:
+                st = os.stat(os.path.join(self.folder, name))
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.disk_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.folder, name))
+            except OSError:
+                continue
+            total -= size
+
+    def photo(self, path, size):
+        # Tk PhotoImage for `path` at `size`; main thread only.
+        key = self._key(path, size)
+        with self._lock:
+            photo = self._photos.get(key)
+            if photo is not None:
+                self._photos.move_to_end(key)
+                return photo
+        return self._remember(key, ImageTk.PhotoImage(self.scaled_image(path, size)))
+
+    def install(self, path, size, img):
+        # adopt an image decoded by scaled_image() on a worker; main thread only
+        try:
+            key = self._key(path, size)
+        except OSError:
+            return
+        with self._lock:
+            if key in self._photos:
+                return
+        self._remember(key, ImageTk.PhotoImage(img))
+
+    def _remember(self, key, photo):
+        with self._lock:
+            self._photos[key] = photo
+            while len(self._photos) > self.capacity:
+                self._photos.popitem(last=False)
+        return photo
+
+
+_thumbnails = None
+
+
+def get_thumbnail_cache():
+    global _thumbnails
+    if _thumbnails is None:
+        _thumbnails = ThumbnailCache()
+    return _thumbnails
+
+
+def load_thumbnail(path, size):
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        return get_thumbnail_cache().photo(path, size)
+    except Exception:
+        return load_image(path, size=size)
+
+
+class AssetRegistry:
+    # Window chrome (icon, backgrounds) decoded once per process and shared by
+    # every window; holding the PhotoImages here also keeps Tk from dropping them.
+    # Unscaled images (the first paint of every window) are read by Tk itself
+    # when it can (PNG, GIF), so PIL is only loaded on the Tk thread for other
+    # formats or once a background has to be rescaled.
+    def __init__(self, max_scaled=8):
+        self.max_scaled = max_scaled
+        self._sources = {}
+        self._photos = OrderedDict()
+
+    def source(self, path):
+        if path not in self._sources:
+            img = None
+            if path and os.path.exists(path):
+                try:
+                    img = Image.open(path)
+                    img.load()
+                except Exception:
+                    img = None
+            self._sources[path] = img
+        return self._sources[path]
+
+    def photo(self, path, size=None):
+        key = (path, size)
+        photo = self._photos.get(key)
+        if photo is None:
+            photo = self._native(path) if size is None else None
+            img = self.source(path) if photo is None else None
+            if img is not None:
+                if size is not None and img.size != size:
+                    img = img.resize(size, Image.LANCZOS)
+                photo = ImageTk.PhotoImage(img)
+            elif photo is None:
+                photo = load_image(path)
+            if photo is None:
+                return None
+            self._photos[key] = photo
+            scaled = [k for k in self._photos if k[1] is not None]
+            if len(scaled) > self.max_scaled:
+                del self._photos[scaled[0]]
+        else:
+            self._photos.move_to_end(key)
+        return photo
+
+    def _native(self, path):
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            return tk.PhotoImage(file=path)
+        except tk.TclError:
+            return None
+
+    def apply_icon(self, window):
+        icon_img = self.photo(IMAGE_PATH_ICON)
+        if icon_img:
+            try:
+                window.iconphoto(False, icon_img)
+            except Exception:
+                pass
+
+    def attach_background(self, window, path, fallback_bg):
+        if self.photo(path) is None:
+            window.configure(bg=fallback_bg)
+            return None
+        return WindowBackground(self, window, path)
+
+
+class WindowBackground:
+    # Label filling its window with a background scaled to the window size.
+    # <Configure> events are coalesced and the image is only rescaled when the
+    # size actually changed.
+    def __init__(self, assets, window, path):
+        self.assets = assets
+        self.window = window
+        self.path = path
+        self._size = None
+        self._pending = None
+        self.photo = assets.photo(path)  # our own reference survives LRU eviction
+        self.label = tk.Label(window, image=self.photo)
+        self.label.place(relwidth=1, relheight=1)
+        window.bind("<Configure>", self._on_configure, add="+")
+
+    def _on_configure(self, event):
+        if event.widget is self.window and self._pending is None:
+            self._pending = self.window.after(BACKGROUND_RESIZE_MS, self._rescale)
+
+    def _rescale(self):
+        self._pending = None
+        size = (self.window.winfo_width(), self.window.winfo_height())
+        if size == self._size or min(size) < 2:
+            return
+        self._size = size
+        photo = self.assets.photo(self.path, size)
+        if photo:
+            self.photo = photo
+            self.label.config(image=photo)
+
+
+_assets = None
+
+
+def get_assets():
+    global _assets
+    if _assets is None:
+        _assets = AssetRegistry()
+    return _assets
+
+
+_shopping_plan = OrderedDict()
+
+
+def get_shopping_plan():
+    # {recipe_id: servings} picked for the shopping list, shared by every menu window
+    return _shopping_plan
+
+
+_similar_pool = None
+
+
+def get_similar_pool():
+    # one thread of its own: the first lookup builds the similarity index,
+    # which can take many seconds on a large catalogue and must not hold up
+    # searches, saves or deletes on the worker pool
+    global _similar_pool
+    if _similar_pool is None:
+        with _worker_pool_lock:
+            if _similar_pool is None:
+                _similar_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="kitchen-similar")
+    return _similar_pool
+
+
+_prefetch_pool = None
+
+
+def get_prefetch_pool():
+    # separate from the worker pool so speculative decodes never queue ahead
+    # of a search or delete the user is waiting for
+    global _prefetch_pool
+    if _prefetch_pool is None:
+        with _worker_pool_lock:
+            if _prefetch_pool is None:
+                _prefetch_pool = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="kitchen-prefetch")
+    return _prefetch_pool
+
+
+class NeighbourPrefetcher:
+    # Warms recipe rows and preview thumbnails for the list entries around the
+    # selection: decoding runs on the prefetch pool, PhotoImages are created on
+    # the Tk thread when it is idle. A new selection abandons older requests,
+    # including queued ones that haven't started yet.
+    def __init__(self, widget, size=PREVIEW_SIZE):
+        self.widget = widget
+        self.size = size
+        self._generation = 0
+
+    def prefetch(self, recipe_ids):
+        self._generation += 1
+        for rid in recipe_ids:
+            future = get_prefetch_pool().submit(self._decode, self._generation, rid)
+            self._wait(self._generation, future)
+
+    def _decode(self, generation, recipe_id):
+        if generation != self._generation:
+            return None
+        load_recipe(recipe_id)
+        imgs = load_recipe_images(recipe_id)
+        if imgs.empty:
+            return None
+        path = imgs.iloc[0]['file_path']
+        if not isinstance(path, str) or not os.path.exists(path):
+            return None
+        return path, get_thumbnail_cache().scaled_image(path, self.size)
+
+    def _wait(self, generation, future):
+        if generation != self._generation or not self.widget.winfo_exists():
+            future.cancel()
+            return
+        if not future.done():
+            self.widget.after(30, self._wait, generation, future)
+            return
+        try:
+            result = future.result()
+        except Exception:
+            return
+        if result:
+            path, img = result
+            self.widget.after_idle(get_thumbnail_cache().install, path, self.size, img)
+
+
+class VirtualListbox(tk.Frame):
+    # Listbox over a large backing list that only materializes the visible
+    # rows. The inner tk.Listbox always holds at most `height` rows; scrolling
+    # and filtering just rewrite that window. Mirrors the bits of the Listbox
+    # API the app uses (curselection, get, size) and fires <<ListboxSelect>>.
+    def __init__(self, master, height=25, **listbox_options):
+        super().__init__(master)
+        self.items = []
+        self.offset = 0
+        self.selected = None
+        self.height = height
+        self.listbox = tk.Listbox(self, height=height, exportselection=False, activestyle="none", **listbox_options)
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.listbox.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+        self.listbox.bind("<<ListboxSelect>>", self._on_select)
+        self.listbox.bind("<Button-1>", lambda e: self.listbox.focus_set(), add="+")
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.listbox.bind(seq, self._on_wheel)
+        self.listbox.bind("<Up>", lambda e: self._move_selection(-1))
+        self.listbox.bind("<Down>", lambda e: self._move_selection(1))
+        self.listbox.bind("<Prior>", lambda e: self._move_selection(-self.height))
+        self.listbox.bind("<Next>", lambda e: self._move_selection(self.height))
+        self.listbox.bind("<Home>", lambda e: self._move_selection(-len(self.items)))
+        self.listbox.bind("<End>", lambda e: self._move_selection(len(self.items)))
+
+    def set_items(self, items):
+        self.items = list(items)
+        self.offset = 0
+        self.selected = None
+        self._render()
+
+    def size(self):
+        return len(self.items)
+
+    def get(self, index):
+        return self.items[index]
+
+    def curselection(self):
+        return () if self.selected is None else (self.selected,)
+
+    def select(self, index):
+        self.selected = index
+        self.see(index)
+        self._render()
+        self.event_generate("<<ListboxSelect>>")
+
+    def see(self, index):
+        if index < self.offset:
+            self.scroll_to(index)
+        elif index >= self.offset + self.height:
+            self.scroll_to(index - self.height + 1)
+
+    def scroll_to(self, offset):
+        offset = max(0, min(int(offset), len(self.items) - self.height))
+        if offset != self.offset:
+            self.offset = offset
+            self._render()
+
+    def _render(self):
+        visible = self.items[self.offset:self.offset + self.height]
+        self.listbox.delete(0, tk.END)
+        if visible:
+            self.listbox.insert(tk.END, *visible)
+        if self.selected is not None and self.offset <= self.selected < self.offset + len(visible):
+            self.listbox.selection_set(self.selected - self.offset)
+            self.listbox.activate(self.selected - self.offset)
+        total = len(self.items)
+        if total <= self.height:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self.offset / total, (self.offset + self.height) / total)
+
+    def _on_select(self, event):
+        sel = self.listbox.curselection()
+        if sel:
+            self.selected = self.offset + sel[0]
+            self.event_generate("<<ListboxSelect>>")
+
+    def _move_selection(self, delta):
+        if self.items:
+            current = self.offset - 1 if self.selected is None and delta > 0 else (self.selected or 0)
+            self.selected = max(0, min(current + delta, len(self.items) - 1))
+            self.see(self.selected)
+            self._render()
+            self.event_generate("<<ListboxSelect>>")
+        return "break"
+
+    def _on_wheel(self, event):
+        if getattr(event, "num", None) == 4:
+            step = -3
+        elif getattr(event, "num", None) == 5:
+            step = 3
+        else:
+            step = -3 if event.delta > 0 else 3
+        self.scroll_to(self.offset + step)
+        return "break"
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(float(amount) * len(self.items))
+        elif action == "scroll":
+            step = self.height if unit == "pages" else 1
+            self.scroll_to(self.offset + int(amount) * step)
+
 # ---------------------- GUI ----------------------
 class SimpleKitchenApp:
     def __init__(self, root):
         ensure_csv_files()
+        get_media_gc().start()
+        # let the home window paint first, then load pandas/PIL and the recipes behind it
+        root.after(100, lambda: get_worker_pool().submit(warm_up))
         self.root = root
         root.title("The Simple Kitchen")
-        icon_img = load_image(IMAGE_PATH_ICON)
-        if icon_img:
-            try:
-                root.iconphoto(False, icon_img)
-            except Exception:
-                pass
-        self.main_bg_img = load_image(IMAGE_PATH_MAIN_BG)
-        if self.main_bg_img:
-            bg_label = tk.Label(root, image=self.main_bg_img)
-            bg_label.place(relwidth=1, relheight=1)
-        else:
-            root.configure(bg="#FDFBD4")
+        assets = get_assets()
+        assets.apply_icon(root)
+        self.background = assets.attach_background(root, IMAGE_PATH_MAIN_BG, "#FDFBD4")
         open_btn = tk.Button(root, text="OPEN THE KITCHEN", bg="#B59D86", fg="#FDFBD4",
                              font=("Georgia", 20, "bold"), padx=170, pady=25,
                              command=self.open_categories, borderwidth=0, activebackground="#A08973")
@@ -842,18 +3157,9 @@ class CategoryWindow:
         self.win = tk.Toplevel(parent)
         self.win.title("The Simple Kitchen")
         self.win.geometry("1366x768")
-        icon_img = load_image(IMAGE_PATH_ICON)
-        if icon_img:
-            try:
-                self.win.iconphoto(False, icon_img)
-            except Exception:
-                pass
-        self.cat_bg_img = load_image(IMAGE_PATH_CAT_BG)
-        if self.cat_bg_img:
-            bg_label = tk.Label(self.win, image=self.cat_bg_img)
-            bg_label.place(relwidth=1, relheight=1)
-        else:
-            self.win.configure(bg="#FFF7EE")
+        assets = get_assets()
+        assets.apply_icon(self.win)
+        self.background = assets.attach_background(self.win, IMAGE_PATH_CAT_BG, "#FFF7EE")
         categories = ["VEGETARIAN", "EGG-ETARIAN", "NON-VEGETARIAN"]
         for i, cat in enumerate(categories):
             lbl = tk.Label(self.win, text=cat, font=("Georgia", 64, "bold"), cursor="hand2",bg="#FDFBD4",fg="#B59D86",activebackground="#FDFBD4",activeforeground="#FFFFFF")
@@ -869,12 +3175,7 @@ class MenuWindow:
         self.win = tk.Toplevel(parent)
         self.win.title("The Simple Kitchen")
         self.win.geometry("1366x768")
-        icon_img = load_image(IMAGE_PATH_ICON)
-        if icon_img:
-            try:
-                self.win.iconphoto(False, icon_img)
-            except Exception:
-                pass
+        get_assets().apply_icon(self.win)
         left = tk.Frame(self.win, width=350)
         left.pack(side="left", fill="y", padx=10, pady=10)
         header = tk.Label(left, text=f"{self.category} RECIPES", font=("Georgia", 18, "bold"))
@@ -884,10 +3185,18 @@ class MenuWindow:
         self.search_var = tk.StringVar()
         search_entry = tk.Entry(search_frame, textvariable=self.search_var, font=("Georgia", 12))
         search_entry.pack(side="left", fill="x", expand=True)
-        search_entry.bind("<KeyRelease>", lambda e: self.populate_list())
+        search_entry.bind("<KeyRelease>", lambda e: self.schedule_search())
         search_btn = tk.Button(search_frame, text="Search", command=self.populate_list)
         search_btn.pack(side="right", padx=4)
-        self.listbox = tk.Listbox(left, font=("Georgia", 12), width=40, height=25)
+        pantry_frame = tk.Frame(left)
+        pantry_frame.pack(pady=(0, 5), fill="x")
+        tk.Label(pantry_frame, text="I have:", font=("Georgia", 11)).pack(side="left")
+        self.pantry_var = tk.StringVar()
+        pantry_entry = tk.Entry(pantry_frame, textvariable=self.pantry_var, font=("Georgia", 11))
+        pantry_entry.pack(side="left", fill="x", expand=True, padx=4)
+        pantry_entry.bind("<Return>", lambda e: self.match_pantry())
+        tk.Button(pantry_frame, text="What can I cook?", command=self.match_pantry).pack(side="left")
+        self.listbox = VirtualListbox(left, height=25, font=("Georgia", 12), width=40)
         self.listbox.pack(pady=5)
         self.listbox.bind("<<ListboxSelect>>", lambda e: self.view_selected())
         btn_frame = tk.Frame(left)
@@ -900,10 +3209,24 @@ class MenuWindow:
         del_btn.grid(row=0, column=2, padx=5)
         back_btn = tk.Button(btn_frame, text="Back", command=self.win.destroy)
         back_btn.grid(row=0, column=3, padx=5)
+        plan_btn = tk.Button(btn_frame, text="Add to List", command=self.add_to_shopping_list)
+        plan_btn.grid(row=1, column=0, columnspan=2, padx=5, pady=(6, 0), sticky="ew")
+        self.shopping_btn = tk.Button(btn_frame, text="Shopping List", command=self.open_shopping_list)
+        self.shopping_btn.grid(row=1, column=2, columnspan=2, padx=5, pady=(6, 0), sticky="ew")
         right = tk.Frame(self.win)
         right.pack(side="right", expand=True, fill="both", padx=10, pady=10)
         self.detail_title = tk.Label(right, text="Select a recipe to view details", font=("Georgia", 16, "bold"))
         self.detail_title.pack(anchor="nw")
+        servings_frame = tk.Frame(right)
+        servings_frame.pack(anchor="nw")
+        tk.Label(servings_frame, text="Servings:", font=("Georgia", 12)).pack(side="left")
+        self.servings_var = tk.StringVar(value="")
+        self.servings_box = tk.Spinbox(servings_frame, from_=1, to=100, width=4, font=("Georgia", 12),
+                                       textvariable=self.servings_var, command=self.rescale, state="disabled")
+        self.servings_box.pack(side="left", padx=4)
+        self.servings_box.bind("<Return>", lambda e: self.rescale())
+        self.servings_unit = tk.Label(servings_frame, text="", font=("Georgia", 12))
+        self.servings_unit.pack(side="left")
         media_frame = tk.Frame(right)
         media_frame.pack(fill="x", pady=5)
         self.recipe_image_label = tk.Label(media_frame)
@@ -914,41 +3237,102 @@ class MenuWindow:
         self.video_label = tk.Label(right, text="", fg="blue", cursor="hand2", font=("Georgia", 12, "underline"))
         self.video_label.pack(anchor="w")
         self.video_label.bind("<Button-1>", lambda e: self.open_video())
+        self.similar_frame = tk.Frame(right)
+        self.similar_frame.pack(anchor="w", pady=(4, 0))
         self.current_recipe = None
         self.current_recipe_image = None
+        self.step_photos = []
+        self.current_parsed = None
         self.video_file = None
         self.df = pd.DataFrame()
+        self.list_ids = []
+        self._search_after = None
+        self._search_seq = 0
+        self.prefetcher = NeighbourPrefetcher(self.win)
         self.populate_list()
 
+    def schedule_search(self):
+        # debounce keystrokes: only the last one within the window runs a query
+        if self._search_after is not None:
+            self.win.after_cancel(self._search_after)
+        self._search_after = self.win.after(SEARCH_DEBOUNCE_MS, self.populate_list)
+
     def populate_list(self):
+        if self._search_after is not None:
+            self.win.after_cancel(self._search_after)
+            self._search_after = None
         term = self.search_var.get().strip()
-        self.df = load_recipes_df(category=self.category, search_term=term if term else None)
-        self.listbox.delete(0, tk.END)
-        for _, row in self.df.iterrows():
-            self.listbox.insert(tk.END, f"{row['name']}")
+        self._search_seq += 1
+        future = get_worker_pool().submit(load_recipes_df, self.category, term if term else None, LIST_COLUMNS)
+        self._poll_search(self._search_seq, future)
+
+    def match_pantry(self):
+        # comma separated pantry items; an empty box goes back to the normal list
+        items = [i for i in self.pantry_var.get().split(',') if i.strip()]
+        if not items:
+            self.populate_list()
+            return
+        self._search_seq += 1
+        future = get_worker_pool().submit(match_pantry, items, 2, self.category)
+        self._poll_search(self._search_seq, future, self._pantry_label)
+
+    @staticmethod
+    def _pantry_label(row):
+        if not row['missing']:
+            return f"{row['name']}  ✓"
+        return f"{row['name']}  (missing: {', '.join(row['missing_items'])})"
+
+    def _poll_search(self, seq, future, label=None):
+        if seq != self._search_seq or not self.win.winfo_exists():
+            # a newer query was issued (or the window closed); drop this one
+            future.cancel()
+            return
+        if not future.done():
+            self.win.after(15, self._poll_search, seq, future, label)
+            return
+        try:
+            df = future.result()
+        except Exception as e:
+            print("Error in populate_list:", e)
+            return
+        # the listbox shows names; list_ids holds the matching primary keys and
+        # self.df is indexed by id, so selections never go back through names
+        self.list_ids = df['id'].astype(int).tolist()
+        self.df = df.set_axis(self.list_ids, axis=0)
+        if label is None:
+            self.listbox.set_items(df['name'].astype(str).tolist())
+        else:
+            self.listbox.set_items([label(row) for _, row in df.iterrows()])
 
     def view_selected(self):
+        idx = self.listbox.curselection()
+        if idx:
+            self.show_recipe(self.list_ids[idx[0]], idx[0])
+
+    def show_recipe(self, recipe_id, position=None):
+        # position: the recipe's row in the list, for neighbour prefetching
         try:
-            idx = self.listbox.curselection()
-            if not idx:
+            row = load_recipe(recipe_id)
+            if row is None:
                 return
-            name = self.listbox.get(idx[0])
-            row = self.df[self.df['name'] == name].iloc[0]
             self.current_recipe = int(row['id'])
             title = row['name']
-            ingredients = row['ingredients']
-            steps = row['steps']
             video_path = row['video_path'] if 'video_path' in row and pd.notna(row['video_path']) else None
             self.detail_title.config(text=title)
-            text = f"Ingredients:\n{ingredients}\n\nSteps:\n{steps}"
-            self.detail_text.configure(state="normal")
-            self.detail_text.delete(1.0, tk.END)
-            self.detail_text.insert(tk.END, text)
-            self.detail_text.configure(state="disabled")
+            self.current_parsed = load_parsed_recipe(self.current_recipe)
+            if self.current_parsed.servings:
+                self.servings_box.config(state="normal")
+                self.servings_var.set(f"{self.current_parsed.servings:g}")
+                self.servings_unit.config(text=self.current_parsed.yield_unit)
+            else:
+                self.servings_var.set("")
+                self.servings_box.config(state="disabled")
+                self.servings_unit.config(text="(not stated)")
+            self.render_details(self.current_parsed)
             imgs = load_recipe_images(self.current_recipe)
             if not imgs.empty:
                 first = imgs.iloc[0]['file_path']
-                img = load_image(first, size=(300,200))
+                img = load_thumbnail(first, PREVIEW_SIZE)
                 if img:
                     self.current_recipe_image = img
                     self.recipe_image_label.config(image=img)
@@ -962,9 +3346,88 @@ class MenuWindow:
             else:
                 self.video_label.config(text="")
                 self.video_file = None
+            self.show_similar([])
+            rid = self.current_recipe
+            call_in_background(self.win, lambda result, error: self._on_similar(rid, result, error),
+                               load_similar_recipes, rid, pool=get_similar_pool())
+            if position is not None:
+                lo, hi = max(0, position - PREFETCH_RADIUS), position + PREFETCH_RADIUS + 1
+                self.prefetcher.prefetch([i for i in self.list_ids[lo:hi] if i != self.current_recipe])
         except Exception as e:
             print("Error in view_selected:", e)
 
+    def _on_similar(self, recipe_id, similar, error):
+        if error is not None:
+            print("Error loading similar recipes:", error)
+        elif recipe_id == self.current_recipe:
+            self.show_similar(similar)
+
+    def show_similar(self, similar):
+        # "Similar dishes" strip: one link per precomputed neighbour
+        for child in self.similar_frame.winfo_children():
+            child.destroy()
+        if not similar:
+            return
+        tk.Label(self.similar_frame, text="Similar dishes:", font=("Georgia", 11, "bold")).pack(side="left")
+        for rid, name in similar:
+            link = tk.Label(self.similar_frame, text=name, fg="blue", cursor="hand2", font=("Georgia", 11, "underline"))
+            link.pack(side="left", padx=4)
+            link.bind("<Button-1>", lambda e, r=rid: self.open_similar(r))
+
+    def open_similar(self, recipe_id):
+        # select it in the list when it is there (other categories just show it)
+        if recipe_id in self.list_ids:
+            self.listbox.select(self.list_ids.index(recipe_id))
+        else:
+            self.show_recipe(recipe_id)
+
+    def rescale(self):
+        # re-render the cached parse at the servings in the spinbox
+        parsed = self.current_parsed
+        if parsed is None or not parsed.servings:
+            return
+        try:
+            target = float(self.servings_var.get())
+        except ValueError:
+            return
+        if target > 0:
+            self.render_details(parsed, target)
+
+    def render_details(self, parsed, servings=None):
+        # ingredients grouped by section, then numbered steps with each step's
+        # images (step_images.step_index) shown inline beneath it
+        factor = servings / parsed.servings if servings and parsed.servings else 1
+        by_step = {}
+        steps_df = load_step_images(self.current_recipe)
+        for step_index, path in zip(steps_df['step_index'], steps_df['file_path']):
+            if pd.notna(step_index):
+                by_step.setdefault(int(step_index), []).append(path)
+        self.step_photos = []
+        text = self.detail_text
+        text.configure(state="normal")
+        text.delete(1.0, tk.END)
+        if parsed.servings:
+            text.insert(tk.END, f"Ingredients ({parsed.servings * factor:g} {parsed.yield_unit}):\n")
+        else:
+            text.insert(tk.END, "Ingredients:\n")
+        section = ''
+        for ingredient in parsed.ingredients:
+            if ingredient.section != section:
+                section = ingredient.section
+                text.insert(tk.END, f"\n{section}:\n")
+            text.insert(tk.END, ingredient.scaled_text(factor) + "\n")
+        text.insert(tk.END, "\nSteps:\n")
+        for number, step in enumerate(parsed.steps, start=1):
+            text.insert(tk.END, f"{number}. {step}\n")
+            photos = [load_thumbnail(path, STEP_THUMB_SIZE) for path in by_step.get(number, ())]
+            photos = [p for p in photos if p]
+            for photo in photos:
+                text.image_create(tk.END, image=photo, padx=4, pady=4)
+            if photos:
+                text.insert(tk.END, "\n")
+            self.step_photos.extend(photos)
+        text.configure(state="disabled")
+
     def open_video(self):
         if not getattr(self, 'video_file', None):
             return
@@ -986,30 +3449,134 @@ class MenuWindow:
     def open_add_form(self):
         AddRecipeWindow(self.win, self)
 
+    def add_to_shopping_list(self):
+        if self.current_recipe is None:
+            messagebox.showinfo("Select", "Please select a recipe to add.")
+            return
+        servings = None
+        if self.current_parsed is not None and self.current_parsed.servings:
+            try:
+                servings = float(self.servings_var.get())
+            except ValueError:
+                servings = self.current_parsed.servings
+        get_shopping_plan()[self.current_recipe] = servings
+        self.shopping_btn.config(text=f"Shopping List ({len(get_shopping_plan())})")
+
+    def open_shopping_list(self):
+        ShoppingListWindow(self.win)
+
     def delete_selected(self):
         idx = self.listbox.curselection()
         if not idx:
             messagebox.showinfo("Select", "Please select a recipe to delete.")
             return
-        name = self.listbox.get(idx[0])
-        row = self.df[self.df['name'] == name].iloc[0]
-        recipe_id = int(row['id'])
+        recipe_id = self.list_ids[idx[0]]
+        row = self.df.loc[recipe_id]
+        name = row['name']
         is_def = int(row['is_default']) if 'is_default' in row else 0
         if is_def == 1:
             messagebox.showwarning("Protected", "Default recipes cannot be deleted.")
             return
         if messagebox.askyesno("Confirm", f"Delete recipe '{name}' permanently?"):
-            ok, msg = delete_recipe_by_id(recipe_id)
-            if ok:
-                messagebox.showinfo("Deleted", msg)
-                self.populate_list()
-                self.detail_title.config(text="Select a recipe to view details")
-                self.detail_text.configure(state="normal")
-                self.detail_text.delete(1.0, tk.END)
-                self.detail_text.configure(state="disabled")
-                self.recipe_image_label.config(image="")
-            else:
-                messagebox.showerror("Error", msg)
+            call_in_background(self.win, lambda result, error: self._on_deleted(recipe_id, result, error),
+                               delete_recipe_by_id, recipe_id)
+
+    def _on_deleted(self, recipe_id, result, error):
+        ok, msg = result if error is None else (False, str(error))
+        if ok:
+            # the selection may have moved on while the delete ran; only a
+            # recipe that is still on screen takes the detail pane with it
+            get_shopping_plan().pop(recipe_id, None)
+            if self.current_recipe == recipe_id:
+                self.clear_details()
+            messagebox.showinfo("Deleted", msg)
+            self.populate_list()
+        else:
+            messagebox.showerror("Error", msg)
+
+    def clear_details(self):
+        self.current_recipe = None
+        self.current_parsed = None
+        self.detail_title.config(text="Select a recipe to view details")
+        self.servings_var.set("")
+        self.servings_box.config(state="disabled")
+        self.servings_unit.config(text="")
+        self.detail_text.configure(state="normal")
+        self.detail_text.delete(1.0, tk.END)
+        self.detail_text.configure(state="disabled")
+        self.step_photos = []
+        self.current_recipe_image = None
+        self.recipe_image_label.config(image="", text="")
+        self.video_label.config(text="")
+        self.video_file = None
+        self.show_similar([])
+
+class ShoppingListWindow:
+    # The recipes in the shopping plan and their consolidated ingredient list
+    def __init__(self, parent):
+        self.win = tk.Toplevel(parent)
+        self.win.title("Shopping List - The Simple Kitchen")
+        self.win.geometry("600x700")
+        get_assets().apply_icon(self.win)
+        tk.Label(self.win, text="Recipes:", font=("Georgia", 12)).pack(anchor="w", padx=10, pady=(10, 0))
+        self.plan_list = tk.Listbox(self.win, height=8, font=("Georgia", 11))
+        self.plan_list.pack(fill="x", padx=10)
+        btn_frame = tk.Frame(self.win)
+        btn_frame.pack(pady=6)
+        tk.Button(btn_frame, text="Remove", command=self.remove_selected).grid(row=0, column=0, padx=5)
+        tk.Button(btn_frame, text="Clear", command=self.clear).grid(row=0, column=1, padx=5)
+        tk.Button(btn_frame, text="Save List", command=self.save_list).grid(row=0, column=2, padx=5)
+        tk.Button(btn_frame, text="Close", command=self.win.destroy).grid(row=0, column=3, padx=5)
+        tk.Label(self.win, text="To buy:", font=("Georgia", 12)).pack(anchor="w", padx=10)
+        self.text = tk.Text(self.win, wrap="word", font=("Georgia", 11))
+        self.text.pack(expand=True, fill="both", padx=10, pady=(0, 10))
+        self.text.configure(state="disabled")
+        self.plan_ids = []
+        self.refresh()
+
+    def refresh(self):
+        plan = get_shopping_plan()
+        self.plan_ids = list(plan)
+        self.plan_list.delete(0, tk.END)
+        selection = {}
+        for rid in self.plan_ids:
+            row = load_recipe(rid)
+            if row is None:
+                continue
+            parsed = load_parsed_recipe(rid)
+            servings = plan[rid] if plan[rid] else parsed.servings
+            selection[rid] = servings if servings else float('nan')
+            label = f"{row['name']} ({servings:g} {parsed.yield_unit})" if servings else row['name']
+            self.plan_list.insert(tk.END, label)
+        self._show_text("Building list..." if selection else "Add recipes with \"Add to List\" in a menu.")
+        if selection:
+            call_in_background(self.win, self._on_built, build_shopping_list, selection)
+
+    def _on_built(self, df, error):
+        self._show_text(f"Could not build the list: {error}" if error else format_shopping_list(df))
+
+    def _show_text(self, content):
+        self.text.configure(state="normal")
+        self.text.delete(1.0, tk.END)
+        self.text.insert(tk.END, content)
+        self.text.configure(state="disabled")
+
+    def remove_selected(self):
+        idx = self.plan_list.curselection()
+        if idx:
+            get_shopping_plan().pop(self.plan_ids[idx[0]], None)
+            self.refresh()
+
+    def clear(self):
+        get_shopping_plan().clear()
+        self.refresh()
+
+    def save_list(self):
+        path = filedialog.asksaveasfilename(title="Save shopping list", defaultextension=".txt",
+                                            filetypes=[("Text files", "*.txt")])
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(self.text.get(1.0, tk.END))
 
 class AddRecipeWindow:
     def __init__(self, parent, menu_window: MenuWindow):
@@ -1024,7 +3591,7 @@ class AddRecipeWindow:
         self.cat_var = tk.StringVar(value=self.menu_window.category)
         cat_menu = ttk.Combobox(self.win, textvariable=self.cat_var, values=["VEGETARIAN","EGG-ETARIAN","NON-VEGETARIAN"], state="readonly")
         cat_menu.pack(fill="x", padx=10)
-        tk.Label(self.win, text="Ingredients (comma separated):", font=("Georgia", 12)).pack(anchor="w", padx=10, pady=(10,0))
+        tk.Label(self.win, text="Ingredients (one per line):", font=("Georgia", 12)).pack(anchor="w", padx=10, pady=(10,0))
         self.ing_text = tk.Text(self.win, height=4, font=("Georgia", 11))
         self.ing_text.pack(fill="x", padx=10)
         tk.Label(self.win, text="Steps (each step on a new line):", font=("Georgia", 12)).pack(anchor="w", padx=10, pady=(10,0))
@@ -1054,12 +3621,16 @@ class AddRecipeWindow:
         add_vid_btn.pack(side="left")
         self.vid_lbl = tk.Label(vid_frame, text="No video selected", font=("Georgia", 10))
         self.vid_lbl.pack(side="left", padx=8)
+        self.ingest = None
+        self.progress = ttk.Progressbar(self.win, mode="determinate", maximum=1.0)
+        self.progress_lbl = tk.Label(self.win, text="", font=("Georgia", 10))
         btn_frame = tk.Frame(self.win)
         btn_frame.pack(pady=12)
-        save_btn = tk.Button(btn_frame, text="Save", command=self.save_recipe)
-        save_btn.grid(row=0, column=0, padx=6)
-        cancel_btn = tk.Button(btn_frame, text="Cancel", command=self.win.destroy)
+        self.save_btn = tk.Button(btn_frame, text="Save", command=self.save_recipe)
+        self.save_btn.grid(row=0, column=0, padx=6)
+        cancel_btn = tk.Button(btn_frame, text="Cancel", command=self.cancel)
         cancel_btn.grid(row=0, column=1, padx=6)
+        self.win.protocol("WM_DELETE_WINDOW", self.close)
 
     def add_recipe_images(self):
         files = filedialog.askopenfilenames(title="Select Recipe Images", filetypes=[("Image files","*.png;*.jpg;*.jpeg;*.gif;*.bmp" )])
@@ -1072,7 +3643,7 @@ class AddRecipeWindow:
         if not steps_text:
             messagebox.showinfo("No steps", "Please enter steps first (each step on a new line) before adding images per step.")
             return
-        steps = [s.strip() for s in steps_text.splitlines() if s.strip()]
+        steps = parse_steps(steps_text)
         step_idx = simpledialog.askinteger("Step number", f"Enter step number (1..{len(steps)}) to attach images:")
         if not step_idx or step_idx < 1 or step_idx > len(steps):
             return
@@ -1089,7 +3660,22 @@ class AddRecipeWindow:
             self.video_file = file
             self.vid_lbl.config(text=os.path.basename(file))
 
+    def cancel(self):
+        # first press stops a running copy, the next one closes the form
+        if self.ingest is not None:
+            self.ingest.cancel()
+            self.progress_lbl.config(text="Cancelling...")
+            return
+        self.win.destroy()
+
+    def close(self):
+        if self.ingest is not None:
+            self.ingest.cancel()
+        self.win.destroy()
+
     def save_recipe(self):
+        if self.ingest is not None:
+            return
         name = self.name_entry.get().strip()
         category = self.cat_var.get().strip()
         ingredients = self.ing_text.get(1.0, tk.END).strip()
@@ -1097,10 +3683,7 @@ class AddRecipeWindow:
         if not name or not category or not ingredients or not steps:
             messagebox.showwarning("Missing fields", "Please fill in all fields before saving.")
             return
-        # prepare recipe entry
-        rid = next_id(RECIPES_CSV)
-        recipe = {
-            'id': rid,
+        self.pending = {
             'name': name,
             'category': category,
             'ingredients': ingredients,
@@ -1108,32 +3691,98 @@ class AddRecipeWindow:
             'video_path': '',
             'is_default': 0
         }
-        # save recipe
-        save_recipe(recipe)
-        # save images
-        for f in self.recipe_images:
-            dest = store_media_file(f)
-            if dest:
-                rid_img = next_id(RECIPE_IMAGES_CSV)
-                save_recipe_image({'id': rid_img, 'recipe_id': rid, 'file_path': dest, 'caption': ''})
-        for step_idx, files in self.step_images.items():
-            for f in files:
-                dest = store_media_file(f)
-                if dest:
-                    sid = next_id(STEP_IMAGES_CSV)
-                    save_step_image({'id': sid, 'recipe_id': rid, 'step_index': int(step_idx), 'file_path': dest})
+        # copy all media in parallel; rows are only written once every copy is in place
+        sources = list(self.recipe_images) + [f for files in self.step_images.values() for f in files]
         if self.video_file:
-            dest = store_media_file(self.video_file)
-            if dest:
-                df = pd.read_csv(RECIPES_CSV)
-                df.loc[df['id'] == rid, 'video_path'] = dest
-                df.to_csv(RECIPES_CSV, index=False)
+            sources.append(self.video_file)
+        self.ingest = MediaIngest(sources)
+        self.save_btn.config(state="disabled")
+        self.progress['value'] = 0
+        self.progress.pack(fill="x", padx=10, before=self.save_btn.master)
+        self.progress_lbl.pack(before=self.save_btn.master)
+        self.progress_lbl.config(text=f"Copying {len(self.ingest.sources)} file(s)...")
+        self._poll_ingest()
+
+    def _poll_ingest(self):
+        ingest = self.ingest
+        if ingest is None or not self.win.winfo_exists():
+            return
+        self.progress['value'] = ingest.fraction()
+        if not ingest.done():
+            self.win.after(50, self._poll_ingest)
+            return
+        error = ingest.error()
+        if error is not None:
+            self._reset_ingest()
+            if not isinstance(error, IngestCancelled):
+                messagebox.showerror("Error", f"Could not copy media files: {error}")
+            return
+        stored = ingest.results()
+        rid = next_id(RECIPES)
+        recipe = dict(self.pending, id=rid)
+        if self.video_file and stored.get(self.video_file):
+            recipe['video_path'] = stored[self.video_file]
+        images = [{'recipe_id': rid, 'file_path': stored[f], 'caption': ''}
+                  for f in self.recipe_images if stored.get(f)]
+        step_rows = [{'recipe_id': rid, 'step_index': int(step_idx), 'file_path': stored[f]}
+                     for step_idx, files in self.step_images.items() for f in files if stored.get(f)]
+        self.progress_lbl.config(text="Saving...")
+        call_in_background(self.win, self._on_saved, save_recipe_bundle, recipe, images, step_rows)
+
+    def _on_saved(self, result, error):
+        if error is not None:
+            self._reset_ingest()
+            messagebox.showerror("Error", f"Could not save recipe: {error}")
+            return
+        self.ingest = None
         messagebox.showinfo("Saved", "Recipe saved successfully.")
         self.menu_window.populate_list()
         self.win.destroy()
 
+    def _reset_ingest(self):
+        self.ingest = None
+        self.save_btn.config(state="normal")
+        self.progress.pack_forget()
+        self.progress_lbl.pack_forget()
+
 # ---------------------- RUN APP ----------------------
+def measure_startup():
+    # time from interpreter start of this module to the home window on screen
+    root = tk.Tk()
+    root.geometry("900x700")
+    SimpleKitchenApp(root)
+    root.update()
+    elapsed = (time.perf_counter() - _STARTED) * 1000
+    loaded = [name for name in ('pandas', 'PIL.Image') if name in sys.modules]
+    root.destroy()
+    print(f"home window after {elapsed:.0f} ms (target {STARTUP_TARGET_MS} ms); "
+          f"heavy modules loaded: {', '.join(loaded) or 'none'}")
+    return elapsed <= STARTUP_TARGET_MS
+
+
 if __name__ == "__main__":
+    if '--startup-time' in sys.argv[1:]:
+        sys.exit(0 if measure_startup() else 1)
+    if '--export-defaults' in sys.argv[1:]:
+        # --export-defaults out.json: editable copy of the bundled recipes
+        version, recipes = load_default_recipes()
+        with open(sys.argv[sys.argv.index('--export-defaults') + 1], 'w', encoding='utf-8') as f:
+            json.dump([{c: r[c] for c in TABLE_COLUMNS[RECIPES]} for r in recipes], f, ensure_ascii=False, indent=1)
+        sys.exit(0)
+    if '--build-defaults' in sys.argv[1:]:
+        # --build-defaults in.json: validate and rebuild DEFAULT_RECIPES_ASSET
+        with open(sys.argv[sys.argv.index('--build-defaults') + 1], 'r', encoding='utf-8') as f:
+            recipes = json.load(f)
+        try:
+            print(f"{DEFAULT_RECIPES_ASSET}: version {build_default_recipes(recipes)}")
+        except ValueError as e:
+            print(e)
+            sys.exit(1)
+        sys.exit(0)
+    if '--migrate-sqlite' in sys.argv[1:]:
+        ok, msg = migrate_csv_to_sqlite()
+        print(msg)
+        sys.exit(0 if ok else 1)
     ensure_csv_files()
     root = tk.Tk()
     root.geometry("900x700")
@@ -0,0 +1,35 @@
+import importlib.util
+import os
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _load_app():
+    # code.py shadows the stdlib `code` module, so it is loaded by path
+    spec = importlib.util.spec_from_file_location("simple_kitchen", os.path.join(ROOT, "code.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def kitchen():
+    return _load_app()
+
+
+@pytest.fixture(params=["csv", "sqlite"])
+def app(request, kitchen, tmp_path, monkeypatch):
+    # the data layer over a fresh, empty backend in tmp_path (also the working
+    # directory, so relative MEDIA_FOLDER and CSV paths land there too)
+    monkeypatch.chdir(tmp_path)
+    if request.param == "csv":
+        storage = kitchen.CsvStorage({t: str(tmp_path / p) for t, p in kitchen.CSV_PATHS.items()})
+    else:
+        storage = kitchen.SqliteStorage(str(tmp_path / kitchen.SQLITE_DB))
+    monkeypatch.setattr(kitchen, "_store", kitchen.RecipeStore(storage))
+    monkeypatch.setattr(kitchen, "_media_gc", kitchen.MediaGarbageCollector(str(tmp_path / kitchen.MEDIA_FOLDER)))
+    kitchen.ensure_csv_files()
+    yield kitchen
+    storage.close()
@@ -0,0 +1,137 @@
+import os
+
+import pytest
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / 'photo.jpg'
+    path.write_bytes(os.urandom(300_000))
+    return path
+
+
+def _flaky(real, fail_after):
+    # a zero-copy call that works a few times and then fails midway
+    calls = []
+
+    def step(*args):
+        calls.append(args)
+        if len(calls) > fail_after:
+            raise OSError("EXDEV")
+        return real(*args)
+    return step
+
+
+@pytest.mark.parametrize("fail_after", [0, 2])
+def test_copy_falls_back_when_zero_copy_fails(kitchen, monkeypatch, tmp_path, source, fail_after):
+    monkeypatch.setattr(kitchen, "MEDIA_COPY_CHUNK", 64 * 1024)
+    for name in ('copy_file_range', 'sendfile'):
+        if hasattr(os, name):
+            monkeypatch.setattr(os, name, _flaky(getattr(os, name), fail_after))
+    kitchen.copy_media_file(str(source), str(tmp_path / 'copy.jpg'))
+    assert (tmp_path / 'copy.jpg').read_bytes() == source.read_bytes()
+
+
+def test_copy_does_not_take_zero_at_start_for_eof(kitchen, monkeypatch, tmp_path, source):
+    for name in ('copy_file_range', 'sendfile'):
+        monkeypatch.setattr(os, name, lambda *args: 0, raising=False)
+    kitchen.copy_media_file(str(source), str(tmp_path / 'copy.jpg'))
+    assert (tmp_path / 'copy.jpg').read_bytes() == source.read_bytes()
+
+
+def test_short_copy_is_never_stored(kitchen, monkeypatch, tmp_path, source):
+    monkeypatch.chdir(tmp_path)
+
+    def short_copy(src, dest, cancel=None, progress=None):
+        with open(src, 'rb') as f, open(dest, 'wb') as out:
+            out.write(f.read(1000))
+    monkeypatch.setattr(kitchen, "copy_media_file", short_copy)
+    with pytest.raises(OSError):
+        kitchen.store_media_file(str(source))
+    monkeypatch.undo()
+    monkeypatch.chdir(tmp_path)
+    dest = kitchen.store_media_file(str(source))
+    assert open(dest, 'rb').read() == source.read_bytes()
+    assert not [f for _, _, files in os.walk(tmp_path / kitchen.MEDIA_FOLDER) for f in files if f.endswith('.part')]
+
+
+def _picture(kitchen, path, colour):
+    kitchen.Image.new('RGB', (320, 240), colour).save(path)
+    return str(path)
+
+
+def test_thumbnails_survive_dedup_touching_the_media_file(kitchen, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    src = _picture(kitchen, tmp_path / 'dish.png', 'orange')
+    stored = kitchen.store_media_file(src)
+    cache = kitchen.ThumbnailCache(folder=str(tmp_path / 'thumbs'))
+    key = cache._key(stored, (40, 30))
+    cache.scaled_image(stored, (40, 30))
+    os.utime(stored, (1, 1))
+    assert kitchen.store_media_file(src) == stored
+    assert cache._key(stored, (40, 30)) == key
+    assert len(os.listdir(tmp_path / 'thumbs')) == 1
+
+
+def test_thumbnail_disk_cache_is_pruned_oldest_first(kitchen, tmp_path):
+    cache = kitchen.ThumbnailCache(folder=str(tmp_path / 'thumbs'))
+    paths = [_picture(kitchen, tmp_path / f'{i}.png', (40 * i, 0, 0)) for i in range(5)]
+    for i, path in enumerate(paths):
+        cache.scaled_image(path, (40, 30))
+        disk_path = cache._disk_path(cache._key(path, (40, 30)))
+        os.utime(disk_path, (1000 + i, 1000 + i))
+    sizes = sorted(os.path.getsize(tmp_path / 'thumbs' / n) for n in os.listdir(tmp_path / 'thumbs'))
+    cache.disk_bytes = sum(sizes[-2:])
+    cache.prune()
+    kept = os.listdir(tmp_path / 'thumbs')
+    assert sum(os.path.getsize(tmp_path / 'thumbs' / n) for n in kept) <= cache.disk_bytes
+    assert os.path.basename(cache._disk_path(cache._key(paths[-1], (40, 30)))) in kept
+    assert os.path.basename(cache._disk_path(cache._key(paths[0], (40, 30)))) not in kept
+
+
+def _recipe_with_image(app, path):
+    rid = app.next_id(app.RECIPES)
+    app.save_recipe_bundle({'id': rid, 'name': f'Photo Dish {rid}', 'category': 'VEGETARIAN', 'ingredients': '1 cup rice',
+                            'steps': 'Cook.', 'video_path': '', 'is_default': 0},
+                           [{'recipe_id': rid, 'file_path': path, 'caption': ''}])
+    return rid
+
+
+def test_gc_keeps_a_freshly_deduplicated_file(app, tmp_path):
+    src = _picture(app, tmp_path / 'dish.png', 'green')
+    stored = app.store_media_file(src)
+    old = _recipe_with_image(app, stored)
+    os.utime(stored, (1, 1))
+    app.delete_recipe_by_id(old)
+    # a new recipe is ingesting the same photo: dedup hit, rows not committed yet
+    assert app.store_media_file(src) == stored
+    assert app.get_media_gc().collect() == 1
+    assert os.path.exists(stored)
+    _recipe_with_image(app, stored)
+    app.get_media_gc().collect()
+    assert os.path.exists(stored)
+
+
+def test_gc_removes_unreferenced_files_once_the_grace_period_is_over(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(app, "ORPHAN_GRACE_SECONDS", -1)
+    stored = app.store_media_file(_picture(app, tmp_path / 'dish.png', 'blue'))
+    first, second = _recipe_with_image(app, stored), _recipe_with_image(app, stored)
+    app.delete_recipe_by_id(first)
+    assert app.get_media_gc().collect() == 0
+    assert os.path.exists(stored), "still referenced by the other recipe"
+    app.delete_recipe_by_id(second)
+    app.get_media_gc().collect()
+    assert not os.path.exists(stored)
+    assert open(app.get_media_gc().queue_path).read() == ''
+
+
+def test_orphan_sweep_honours_the_grace_period(app, tmp_path, monkeypatch):
+    kept = app.store_media_file(_picture(app, tmp_path / 'kept.png', 'red'))
+    orphan = app.store_media_file(_picture(app, tmp_path / 'orphan.png', 'white'))
+    _recipe_with_image(app, kept)
+    app.get_media_gc().sweep_orphans()
+    assert os.path.exists(orphan)
+    monkeypatch.setattr(app, "ORPHAN_GRACE_SECONDS", -1)
+    outside = _picture(app, tmp_path / 'outside.png', 'black')
+    app.get_media_gc().sweep_orphans()
+    assert os.path.exists(kept) and not os.path.exists(orphan) and os.path.exists(outside)
@@ -0,0 +1,67 @@
+import pytest
+
+
+@pytest.mark.parametrize("line, quantity, quantity_max, unit, name, note", [
+    ('1 1/2 cups basmati rice', 1.5, None, 'cup', 'basmati rice', ''),
+    ('200g paneer, cubed', 200.0, None, 'g', 'paneer', 'cubed'),
+    ('½ tsp turmeric', 0.5, None, 'tsp', 'turmeric', ''),
+    ('2-3 green chillies, slit', 2.0, 3.0, None, 'green chillies', 'slit'),
+    ('2-3', 2.0, 3.0, None, '', ''),
+    ('3 slices of bread', 3.0, None, 'slice', 'bread', ''),
+    ('1 cup milk (warm, not hot)', 1.0, None, 'cup', 'milk', 'warm, not hot'),
+    ('Salt to taste', None, None, None, 'Salt to taste', ''),
+    ('1/0 cup sugar', None, None, None, '1/0 cup sugar', ''),
+])
+def test_parse_ingredient(kitchen, line, quantity, quantity_max, unit, name, note):
+    ingredient = kitchen.parse_ingredient(line)
+    assert (ingredient.quantity, ingredient.quantity_max, ingredient.unit) == (quantity, quantity_max, unit)
+    assert (ingredient.name, ingredient.note, ingredient.text) == (name, note, line)
+
+
+@pytest.mark.parametrize("line, factor, scaled", [
+    ('1 1/2 cups basmati rice', 2, '3 cups basmati rice'),
+    ('1 cup milk', 0.5, '1/2 cup milk'),
+    ('2-3 green chillies', 2, '4-6 green chillies'),
+    ('2-3', 2, '4-6'),
+    ('Salt to taste', 2, 'Salt to taste'),
+])
+def test_scaled_text(kitchen, line, factor, scaled):
+    assert kitchen.parse_ingredient(line).scaled_text(factor) == scaled
+
+
+def test_parse_recipe_reads_yield_sections_and_steps(kitchen):
+    parsed = kitchen.parse_recipe("4 servings:\nFOR PURI:\n1 cup semolina\nFOR FILLING:\n2 potatoes, boiled\nSalt",
+                                  "•Knead the dough.\n\n2) Fry the puris.")
+    assert (parsed.servings, parsed.yield_unit) == (4.0, 'servings')
+    assert parsed.sections() == ['FOR PURI', 'FOR FILLING']
+    assert [i.name for i in parsed.ingredients] == ['semolina', 'potatoes', 'Salt']
+    assert parsed.steps == ['Knead the dough.', 'Fry the puris.']
+
+
+@pytest.mark.parametrize("ingredients", ["1/0 servings:\n1 cup rice", "0/0 cups:", None, "", ":"])
+def test_parse_recipe_never_raises(kitchen, ingredients):
+    parsed = kitchen.parse_recipe(ingredients, None)
+    assert parsed.servings is None and parsed.steps == []
+
+
+def test_unparseable_quantities_do_not_break_catalogue_features(app):
+    rid = app.next_id(app.RECIPES)
+    app.save_recipe_bundle({'id': rid, 'name': 'Broken Fraction Cake', 'category': 'VEGETARIAN',
+                            'ingredients': '1/0 servings:\n1/0 cup sugar\n2 eggs', 'steps': 'Bake.',
+                            'video_path': '', 'is_default': 0})
+    assert app.load_parsed_recipe(rid).ingredients[-1].quantity == 2.0
+    assert len(app.build_shopping_list({rid: 2}))
+    assert rid in set(app.match_pantry(['eggs', 'sugar'])['id'])
+    app.load_similar_recipes(rid)
+
+
+@pytest.mark.parametrize("ingredients, names", [
+    ("rice, toor dal, turmeric, salt", ['rice', 'toor dal', 'turmeric', 'salt']),
+    ("2 servings:\n1 cup rice, 2 cups water, ½ tsp salt", ['rice', 'water', 'salt']),
+    ("rice (soaked, drained), dal", ['rice', 'dal']),
+    ("200g paneer, cubed", ['paneer']),
+    ("1 cup milk (warm, not hot)", ['milk']),
+    ("rice, washed\ndal", ['rice', 'dal']),
+])
+def test_single_line_comma_lists_are_split(kitchen, ingredients, names):
+    assert [i.name for i in kitchen.parse_recipe(ingredients, None).ingredients] == names
@@ -0,0 +1,92 @@
+import random
+
+import pytest
+
+
+def _reference_distance(a, b, transpositions):
+    # textbook DP table (Levenshtein, optionally with adjacent swaps)
+    rows = [list(range(len(b) + 1))]
+    for i, ca in enumerate(a, 1):
+        row = [i]
+        for j, cb in enumerate(b, 1):
+            cost = min(rows[-1][j] + 1, row[j - 1] + 1, rows[-1][j - 1] + (ca != cb))
+            if transpositions and i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cost = min(cost, rows[-2][j - 2] + 1)
+            row.append(cost)
+        rows.append(row)
+    return rows[-1][-1]
+
+
+def _typos(words, count, seed):
+    # random one- and two-edit misspellings of vocabulary words
+    rng = random.Random(seed)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    found = []
+    for _ in range(count):
+        word = rng.choice(words)
+        for _ in range(rng.randint(1, 2)):
+            i = rng.randrange(len(word))
+            edit = rng.choice('isdt')
+            if edit == 'i':
+                word = word[:i] + rng.choice(letters) + word[i:]
+            elif edit == 's':
+                word = word[:i] + rng.choice(letters) + word[i + 1:]
+            elif edit == 'd' and len(word) > 1:
+                word = word[:i] + word[i + 1:]
+            elif edit == 't' and i + 1 < len(word):
+                word = word[:i] + word[i + 1] + word[i] + word[i + 2:]
+        found.append(word)
+    return found
+
+
+@pytest.fixture(scope="module")
+def shipped_index(kitchen):
+    index = kitchen.SearchIndex()
+    for r in kitchen.load_default_recipes()[1]:
+        index.add(r['id'], r['name'], r['ingredients'], r['category'])
+    return index
+
+
+def test_edit_distances_match_reference(kitchen):
+    rng = random.Random(1)
+    for _ in range(3000):
+        a = ''.join(rng.choice('abcd') for _ in range(rng.randint(0, 8)))
+        b = ''.join(rng.choice('abcd') for _ in range(rng.randint(0, 8)))
+        assert kitchen.levenshtein(a, b) == _reference_distance(a, b, False)
+        assert kitchen.osa_distance(a, b) == _reference_distance(a, b, True)
+        limit = rng.randint(0, 3)
+        bounded = kitchen.levenshtein(a, b, limit)
+        assert bounded == kitchen.levenshtein(a, b) if kitchen.levenshtein(a, b) <= limit else bounded > limit
+
+
+def test_bk_tree_matches_brute_force(kitchen, shipped_index):
+    words = [t for t in shipped_index._vocab if t.isalpha()]
+    tree = kitchen.BKTree()
+    for word in words:
+        tree.add(word)
+    for term in _typos(words, 300, seed=2) + ['ca', 'ac', 'abc']:
+        for radius in (1, 2):
+            expected = sorted((kitchen.levenshtein(term, w), w) for w in words
+                              if kitchen.levenshtein(term, w) <= radius)
+            assert tree.query(term, radius) == expected, term
+
+
+def test_fuzzy_tokens_match_brute_force(kitchen, shipped_index):
+    words = [t for t in shipped_index._vocab if t.isalpha()]
+    for term in _typos(words, 300, seed=3):
+        radius = kitchen.fuzzy_radius(term)
+        expected = sorted((kitchen.osa_distance(term, w), w) for w in words
+                          if radius and (kitchen.levenshtein(term, w) <= radius or w in kitchen._swaps(term)))
+        assert shipped_index.fuzzy_tokens(term) == expected, term
+
+
+@pytest.mark.parametrize("typo, word", [('cahew', 'cashew'), ('cahsew', 'cashew'), ('paner', 'paneer'),
+                                        ('biriyani', 'biryani'), ('manchurain', 'manchurian')])
+def test_fuzzy_tokens_find_common_typos(shipped_index, typo, word):
+    assert word in [tok for _, tok in shipped_index.fuzzy_tokens(typo)]
+
+
+def test_fuzzy_hits_rank_after_exact_ones(shipped_index):
+    names = {rid: doc[0] for rid, doc in shipped_index._docs.items()}
+    ranked = [names[rid] for rid in shipped_index.search('paner butter')]
+    assert ranked[0] == 'paneer butter masala'
@@ -0,0 +1,204 @@
+# Data-layer conformance: every Storage backend must pass these (see the
+# `app` fixture in conftest.py, parametrized over csv and sqlite).
+import threading
+
+import pytest
+
+
+def test_default_recipes_asset_is_valid(kitchen):
+    assert kitchen.validate_default_recipes(kitchen.load_default_recipes()[1]) == []
+
+
+def test_default_asset_version_is_read_without_decoding(kitchen, tmp_path, monkeypatch):
+    version, recipes = kitchen.load_default_recipes()
+    assert kitchen.default_recipes_version() == version
+    path = str(tmp_path / 'defaults.json.gz')
+    kitchen.build_default_recipes(recipes[:3], path)
+    monkeypatch.setattr(kitchen, "load_default_recipes", None)
+    assert kitchen.default_recipes_version(path) == 1
+
+
+def test_up_to_date_store_skips_loading_the_defaults(app, monkeypatch):
+    monkeypatch.setattr(app, "load_default_recipes", None)
+    app.ensure_csv_files()
+
+
+def test_defaults_are_seeded_once(app):
+    version, defaults = app.load_default_recipes()
+    df = app.load_recipes_df()
+    assert len(df) == len(defaults)
+    assert app.get_store().storage.defaults_version() == version
+    app.ensure_csv_files()
+    assert len(app.load_recipes_df()) == len(defaults)
+    assert df['name'].tolist() == sorted(df['name'].tolist())
+
+
+def test_category_filter(app):
+    veg = app.load_recipes_df(category='VEGETARIAN')
+    assert len(veg) and set(veg['category']) == {'VEGETARIAN'}
+
+
+@pytest.mark.parametrize("term", ['paneer', 'neer', 'ch', 'paneer butter'])
+def test_search_matches_every_word(app, term):
+    words = term.split()
+    wanted = {r['id'] for r in app.load_default_recipes()[1]
+              if all(w in (r['name'] + '\n' + r['ingredients']).lower() for w in words)}
+    assert set(app.load_recipes_df(search_term=term)['id']) == wanted
+
+
+@pytest.mark.parametrize("typo, term", [('paner', 'paneer'), ('biriyani', 'biryani')])
+def test_search_tolerates_typos(app, typo, term):
+    wanted = set(app.load_recipes_df(search_term=term)['id'])
+    assert wanted and wanted <= set(app.load_recipes_df(search_term=typo)['id'])
+
+
+@pytest.mark.parametrize("query", ['egg curry', 'paneer butter masala', 'chicken biryani'])
+def test_search_ranks_exact_name_then_prefix_first(app, query):
+    names = [n.lower() for n in app.load_recipes_df(search_term=query)['name']]
+    assert names[0] == query
+    prefixed = [n.startswith(query) for n in names]
+    assert prefixed == sorted(prefixed, reverse=True)
+
+
+@pytest.mark.parametrize("query", ['paneer', 'biryani', 'egg curry'])
+def test_search_ranks_name_matches_before_ingredient_matches(app, query):
+    names = [n.lower() for n in app.load_recipes_df(search_term=query)['name']]
+    in_name = [all(w in n for w in query.split()) for n in names]
+    assert any(in_name) and in_name == sorted(in_name, reverse=True)
+
+
+def test_recipe_lifecycle(app, tmp_path):
+    defaults = app.load_default_recipes()[1]
+    rid = app.next_id(app.RECIPES)
+    assert rid > max(r['id'] for r in defaults)
+    assert app.next_id(app.RECIPES) > rid
+    recipe = {'id': rid, 'name': 'Conformance Curry', 'category': 'VEGETARIAN',
+              'ingredients': '2 servings:\n1 cup peas', 'steps': '•Cook.\n•Serve.', 'video_path': '', 'is_default': 0}
+    images = [{'recipe_id': rid, 'file_path': str(tmp_path / 'a.png'), 'caption': ''},
+              {'recipe_id': rid, 'file_path': str(tmp_path / 'b.png'), 'caption': ''}]
+    steps = [{'recipe_id': rid, 'step_index': 2, 'file_path': str(tmp_path / 'c.png')}]
+    app.save_recipe_bundle(recipe, images, steps)
+    assert len({r['id'] for r in images}) == 2
+    assert app.load_recipes_df(search_term='conformance')['id'].tolist() == [rid]
+    assert len(app.load_recipe_images(rid)) == 2 and len(app.load_step_images(rid)) == 1
+
+    storage = app.get_store().storage
+    app.update_recipe_video(rid, str(tmp_path / 'v.mp4'))
+    fresh = app.RecipeStore(storage).table(app.RECIPES)
+    assert fresh.loc[fresh['id'] == rid, 'video_path'].tolist() == [str(tmp_path / 'v.mp4')]
+    app.update_row(app.RECIPE_IMAGES, images[0]['id'], {'caption': 'plated'})
+    app.update_row(app.RECIPE_IMAGES, images[0]['id'], {'caption': 'served'})
+    assert app.load_recipe_images(rid)['caption'].tolist()[0] == 'served'
+    fresh = app.RecipeStore(storage).table(app.RECIPE_IMAGES, ['id', 'caption'])
+    assert fresh.loc[fresh['id'] == images[0]['id'], 'caption'].tolist() == ['served']
+
+    assert not app.delete_recipe_by_id(defaults[0]['id'])[0]
+    assert app.delete_recipe_by_id(rid)[0]
+    assert app.load_recipe_images(rid).empty and app.load_step_images(rid).empty
+    fresh = app.RecipeStore(storage)
+    assert rid not in set(fresh.table(app.RECIPES)['id'])
+    assert fresh.table(app.RECIPE_IMAGES).empty and fresh.table(app.STEP_IMAGES).empty
+    assert app.load_recipes_df(search_term='conformance').empty
+
+
+def _blocks_reads(app, build):
+    # True if the store lock is held while `build` (patched to pause) runs
+    building, release = threading.Event(), threading.Event()
+    worker = threading.Thread(target=build, args=(building, release))
+    worker.start()
+    assert building.wait(5)
+    reader = threading.Thread(target=app.load_recipe, args=(app.load_default_recipes()[1][0]['id'],))
+    reader.start()
+    reader.join(1)
+    blocked = reader.is_alive()
+    release.set()
+    worker.join(5)
+    reader.join(5)
+    return blocked
+
+
+def test_search_index_builds_off_the_store_lock(app, monkeypatch):
+    store = app.get_store()
+    store._index = None
+    from_df = app.SearchIndex.from_df.__func__
+
+    def build(building, release):
+        def paused(cls, df):
+            building.set()
+            release.wait(5)
+            return from_df(cls, df)
+        monkeypatch.setattr(app.SearchIndex, "from_df", classmethod(paused))
+        store.search_index()
+    assert not _blocks_reads(app, build)
+    assert store._index_source is store.table(app.RECIPES)
+    assert len(store.search_index()) == len(store.table(app.RECIPES))
+
+
+def test_ingredient_table_builds_off_the_store_lock(app, monkeypatch):
+    store = app.get_store()
+    store._ingredients = None
+    frame = app.ingredient_frame
+
+    def build(building, release):
+        def paused(parsed):
+            building.set()
+            release.wait(5)
+            return frame(parsed)
+        monkeypatch.setattr(app, "ingredient_frame", paused)
+        app.build_shopping_list({app.load_default_recipes()[1][0]['id']: 2})
+    assert not _blocks_reads(app, build)
+    assert store._ingredients[0] is store.table(app.RECIPES)
+    assert set(store.ingredient_table()['recipe_id']) <= set(store.table(app.RECIPES)['id'])
+
+
+def _csv_storage(kitchen, folder):
+    return kitchen.CsvStorage({t: str(folder / p) for t, p in kitchen.CSV_PATHS.items()})
+
+
+def test_csv_startup_waits_for_another_instances_transaction(kitchen, tmp_path):
+    import threading
+    first = _csv_storage(kitchen, tmp_path)
+    first.ensure()
+    row = kitchen.pd.DataFrame([{'id': 1, 'name': 'Live Curry', 'category': 'VEGETARIAN', 'ingredients': '',
+                                 'steps': '', 'video_path': '', 'is_default': 0}])
+    started = threading.Event()
+    with first.transaction():
+        first.append(kitchen.RECIPES, row, first.signature(kitchen.RECIPES))
+        second = _csv_storage(kitchen, tmp_path)
+        starting = threading.Thread(target=lambda: (started.set(), second.ensure()))
+        starting.start()
+        started.wait()
+        starting.join(0.3)
+        assert starting.is_alive(), "recover() must not run while another instance is mid-transaction"
+    starting.join(5)
+    assert not starting.is_alive()
+    assert second.load(kitchen.RECIPES)['name'].tolist() == ['Live Curry']
+
+
+def test_csv_recover_rolls_back_a_crashed_transaction(kitchen, tmp_path):
+    import json
+    storage = _csv_storage(kitchen, tmp_path)
+    storage.ensure()
+    path = storage.paths[kitchen.RECIPES]
+    size = (tmp_path / kitchen.CSV_PATHS[kitchen.RECIPES]).stat().st_size
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('7,Half Written,VEGETARIAN,,,,0\n')
+    with open(path + '.txn', 'w', encoding='utf-8') as f:
+        f.write('staged')
+    with open(storage.journal_path, 'w', encoding='utf-8') as f:
+        json.dump({'state': 'pending', 'replace': [[path + '.txn', path]], 'appends': [[path, size]]}, f)
+    _csv_storage(kitchen, tmp_path).ensure()
+    assert storage.load(kitchen.RECIPES).empty
+    assert not (tmp_path / (kitchen.CSV_PATHS[kitchen.RECIPES] + '.txn')).exists()
+
+
+def test_csv_projection_without_columnar_cache(kitchen, tmp_path, monkeypatch):
+    monkeypatch.setattr(kitchen, "COLUMNAR_CACHE", False)
+    storage = _csv_storage(kitchen, tmp_path)
+    storage.ensure()
+    parsed = []
+    read_csv = kitchen.pd.read_csv
+    monkeypatch.setattr(kitchen.pd, "read_csv", lambda *a, **kw: parsed.append(kw.get('usecols')) or read_csv(*a, **kw))
+    assert storage.load(kitchen.RECIPES, ['id', 'name']).columns.tolist() == ['id', 'name']
+    assert parsed == [['id', 'name']]
+    assert not (tmp_path / (kitchen.CSV_PATHS[kitchen.RECIPES] + '.feather')).exists()